@@ -10,7 +10,8 @@ import threading
 from queue import Queue as ThreadQueue
 
 from .object_detector import ObjectDetector, DetectedObject
-from ..event_system import EventProducer, EventType, CameraEvent
+from ..event_system import EventProducer, EventType, CameraEvent, PayloadRing
+from ..inference_executor import get_inference_executor, PRIORITY_PERCEPTION
 from ..config import Config
 
 class CameraProcessor:
@@ -32,8 +33,13 @@ class CameraProcessor:
             confidence_threshold=config.DETECTION_CONFIDENCE
         )
         
+        self.inference = get_inference_executor(config)
+        self.inference.register_model("object_detector", self.object_detector.detect_objects,
+                                      priority=PRIORITY_PERCEPTION, max_queue=2)
+        
         # Event system
         self.event_producer = EventProducer(config, "camera_processor")
+        self.frame_ring: Optional[PayloadRing] = None  # Created on the first frame, sized to it
         
         # Camera capture
         self.cap: Optional[cv2.VideoCapture] = None
@@ -98,6 +104,10 @@ class CameraProcessor:
         # Disconnect from event system
         await self.event_producer.disconnect()
         
+        if self.frame_ring:
+            self.frame_ring.close()
+            self.frame_ring = None
+        
         self.logger.info("Camera processor stopped")
     
     def _initialize_camera(self) -> bool:
@@ -210,7 +220,7 @@ class CameraProcessor:
             self.current_frame = frame.copy()
             
             # Detect objects
-            detected_objects = self.object_detector.detect_objects(frame)
+            detected_objects = await self.inference.submit("object_detector", frame)
             
             # Get object changes
             changes = self.object_detector.get_object_changes(detected_objects)
@@ -235,14 +245,22 @@ class CameraProcessor:
     async def _send_frame_event(self, frame: np.ndarray, objects: List[DetectedObject]):
         """Send camera frame event"""
         try:
-            # Encode frame as JPEG for transmission
-            _, buffer = cv2.imencode('.jpg', frame)
-            frame_data = buffer.tobytes()
+            # Raw frame goes to shared memory; it is only JPEG-encoded if inference uses it
+            if self.frame_ring is None:
+                self.frame_ring = PayloadRing.create(
+                    f"{self.config.PAYLOAD_RING_PREFIX}_camera",
+                    self.config.FRAME_RING_SLOTS,
+                    max(frame.nbytes, self.camera_width * self.camera_height * 3)
+                )
+            frame_ref = self.frame_ring.put(frame)
+            if frame_ref:
+                frame_ref['width'] = frame.shape[1]
+                frame_ref['height'] = frame.shape[0]
             
             # Create event
             event = CameraEvent(
                 event_type=EventType.CAMERA_FRAME,
-                frame_data=frame_data,
+                frame_ref=frame_ref,
                 detections=[obj.to_dict() for obj in objects]
             )
             
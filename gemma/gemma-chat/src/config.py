@@ -8,7 +8,19 @@ from typing import Optional
 class Config:
     # Event System
     EVENT_SOCKET_PATH: str = "/tmp/gemma_events.sock"
-    EVENT_BUFFER_SIZE: int = 4096
+    EVENT_MAX_FRAME_SIZE: int = 16 * 1024 * 1024  # Largest framed event accepted on the socket
+    EVENT_COALESCE_TYPES: str = "camera_frame"  # Comma-separated event types where only the latest pending event is kept
+    EVENT_METRICS_INTERVAL: float = 60.0  # Seconds between event bus metrics log lines (0 disables)
+    
+    # Binary payloads (frames and audio live in shared memory, events carry a reference)
+    PAYLOAD_RING_PREFIX: str = "gemma"
+    FRAME_RING_SLOTS: int = 8
+    AUDIO_RING_SLOTS: int = 4
+    AUDIO_RING_SLOT_BYTES: int = 16000 * 4 * 30  # 30 s of float32 mono audio
+    IMAGE_JPEG_QUALITY: int = 85  # Used when a frame is encoded for inference
+    
+    # Model inference (VAD, detection, embeddings, distillation run on this shared pool)
+    INFERENCE_WORKERS: int = 2
     
     # Camera Processing
     CAMERA_DEVICE: int = 0
@@ -32,14 +44,21 @@ class Config:
     MAX_NEW_TOKENS: int = 100
     TEMPERATURE: float = 0.7
     RESPONSE_TARGET_MS: int = 400
+    STREAM_RESPONSES: bool = True  # Stream tokens and speak each quoted sentence as soon as it closes
     
     # Memory System
     IMMEDIATE_MEMORY_SIZE: int = 100
+    MEMORY_RERANK_MODEL: str = ""  # SentenceTransformer model to re-rank immediate memory matches (empty disables)
     MILVUS_HOST: str = "localhost"
     MILVUS_PORT: int = 19530
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = "password"
+    LONG_TERM_WRITE_BATCH_SIZE: int = 32  # Facts embedded and stored per batch
+    LONG_TERM_WRITE_INTERVAL: float = 0.5  # Max seconds a queued fact waits for its batch to fill
+    MILVUS_FLUSH_INTERVAL: float = 10.0  # Seconds between Milvus flushes (also flushed on shutdown)
+    MEMORY_CONTEXT_BUDGET_MS: float = 150.0  # Max wait for memory retrieval before inference (slower stages are skipped)
+    LONG_TERM_SEARCH_CACHE_TTL: float = 30.0  # Seconds a long-term search result is reused for a near-identical query
     
     # TTS
     TTS_ENGINE: str = "piper"  # Options: "piper", "kokoro", "espeak"
@@ -60,12 +79,12 @@ class Config:
         for field_name, field_value in config.__dict__.items():
             env_value = os.getenv(f"GEMMA_{field_name}")
             if env_value is not None:
-                if isinstance(field_value, int):
+                if isinstance(field_value, bool):  # Checked before int, bool is an int subclass
+                    setattr(config, field_name, env_value.lower() in ("true", "1", "yes"))
+                elif isinstance(field_value, int):
                     setattr(config, field_name, int(env_value))
                 elif isinstance(field_value, float):
                     setattr(config, field_name, float(env_value))
-                elif isinstance(field_value, bool):
-                    setattr(config, field_name, env_value.lower() in ("true", "1", "yes"))
                 elif isinstance(field_value, list):
                     setattr(config, field_name, env_value.split(","))
                 else:
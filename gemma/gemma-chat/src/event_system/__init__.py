@@ -4,5 +4,6 @@ from .event_manager import EventManager
 from .event_types import EventType, GemmaEvent, TTSEvent, CameraEvent, AudioEvent, TextEvent
 from .event_producer import EventProducer
 from .event_consumer import EventConsumer
+from .payload_ring import PayloadRing, resolve_payload, detach_payload_rings
 
-__all__ = ["EventManager", "EventType", "GemmaEvent", "TTSEvent", "CameraEvent", "AudioEvent", "TextEvent", "EventProducer", "EventConsumer"]
\ No newline at end of file
+__all__ = ["EventManager", "EventType", "GemmaEvent", "TTSEvent", "CameraEvent", "AudioEvent", "TextEvent", "EventProducer", "EventConsumer", "PayloadRing", "resolve_payload", "detach_payload_rings"]
\ No newline at end of file
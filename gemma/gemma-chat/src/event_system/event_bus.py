@@ -0,0 +1,101 @@
+"""Priority event bus with coalescing and queue metrics"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .event_types import GemmaEvent, EventType
+
+class PriorityEventBus:
+    """Heap-ordered event queue with condition-based wakeups
+    
+    Events are dispatched highest priority first and FIFO within a priority.
+    For event types listed in ``coalesce_types`` only the latest pending
+    event is kept: publishing a new one replaces the one still waiting (for
+    example, only the newest camera frame matters).  Replaced entries are
+    invalidated in place and skipped when they reach the top of the heap.
+    """
+    
+    def __init__(self, coalesce_types: Iterable[EventType] = ()):
+        self.coalesce_types = set(coalesce_types)
+        self._heap: List[list] = []  # [-priority, seq, event, enqueued_at, valid]
+        self._seq = itertools.count()
+        self._pending_by_type: Dict[EventType, list] = {}
+        self._size = 0
+        self._condition = asyncio.Condition()
+        
+        # Metrics
+        self.published = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.per_type: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    async def put(self, event: GemmaEvent):
+        """Add an event and wake one waiting consumer"""
+        async with self._condition:
+            if event.event_type in self.coalesce_types:
+                stale = self._pending_by_type.get(event.event_type)
+                if stale is not None and stale[4]:
+                    stale[4] = False
+                    self._size -= 1
+                    self.coalesced += 1
+            
+            entry = [-event.priority, next(self._seq), event, time.perf_counter(), True]
+            heapq.heappush(self._heap, entry)
+            if event.event_type in self.coalesce_types:
+                self._pending_by_type[event.event_type] = entry
+            
+            self._size += 1
+            self.published += 1
+            self.max_depth = max(self.max_depth, self._size)
+            key = event.event_type.value
+            self.per_type[key] = self.per_type.get(key, 0) + 1
+            self._condition.notify()
+    
+    async def get(self) -> GemmaEvent:
+        """Wait for and remove the highest priority event"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._size > 0)
+            while True:
+                entry = heapq.heappop(self._heap)
+                if entry[4]:
+                    break
+            
+            event = entry[2]
+            if self._pending_by_type.get(event.event_type) is entry:
+                del self._pending_by_type[event.event_type]
+            self._size -= 1
+            
+            wait_ms = (time.perf_counter() - entry[3]) * 1000
+            self.dispatched += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            return event
+    
+    async def get_with_timeout(self, timeout: float) -> Optional[GemmaEvent]:
+        """Like get(), but return None if nothing arrives within timeout seconds"""
+        try:
+            return await asyncio.wait_for(self.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, throughput and queueing latency"""
+        return {
+            'depth': self._size,
+            'max_depth': self.max_depth,
+            'published': self.published,
+            'dispatched': self.dispatched,
+            'coalesced': self.coalesced,
+            'avg_wait_ms': self.total_wait_ms / self.dispatched if self.dispatched else 0.0,
+            'max_wait_ms': self.max_wait_ms,
+            'per_type': dict(self.per_type),
+        }
@@ -1,12 +1,13 @@
 """Event consumer for receiving events from the event manager"""
 
 import asyncio
-import socket
+import json
 import logging
 from typing import Optional, Callable, Dict, List
 from asyncio import Queue
 
 from .event_types import GemmaEvent, EventType
+from .framing import read_frame, write_frame
 from ..config import Config
 
 class EventConsumer:
@@ -17,7 +18,8 @@ class EventConsumer:
         self.consumer_name = consumer_name
         self.logger = logging.getLogger(f"{__name__}.{consumer_name}")
         self.socket_path = config.EVENT_SOCKET_PATH
-        self.client_socket: Optional[socket.socket] = None
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
         self.connected = False
         self.running = False
         
@@ -28,9 +30,11 @@ class EventConsumer:
     async def connect(self) -> bool:
         """Connect to the event manager"""
         try:
-            self.client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            self.client_socket.setblocking(False)
-            await asyncio.get_event_loop().sock_connect(self.client_socket, self.socket_path)
+            self.reader, self.writer = await asyncio.open_unix_connection(
+                self.socket_path, limit=self.config.EVENT_MAX_FRAME_SIZE
+            )
+            # Ask the event manager to broadcast events to this connection
+            await write_frame(self.writer, json.dumps({'subscribe': True}).encode('utf-8'))
             self.connected = True
             self.logger.info(f"Connected to event manager")
             return True
@@ -42,12 +46,13 @@ class EventConsumer:
     async def disconnect(self):
         """Disconnect from the event manager"""
         self.running = False
-        if self.client_socket:
+        if self.writer:
             try:
-                self.client_socket.close()
+                self.writer.close()
             except:
                 pass
-            self.client_socket = None
+            self.writer = None
+            self.reader = None
             self.connected = False
             self.logger.info("Disconnected from event manager")
     
@@ -77,15 +82,12 @@ class EventConsumer:
         """Receive events from the event manager"""
         while self.running and self.connected:
             try:
-                data = await asyncio.get_event_loop().sock_recv(
-                    self.client_socket, self.config.EVENT_BUFFER_SIZE
-                )
-                if not data:
+                payload = await read_frame(self.reader, self.config.EVENT_MAX_FRAME_SIZE)
+                if payload is None:
                     break
                 
                 try:
-                    event_json = data.decode('utf-8')
-                    event = GemmaEvent.from_json(event_json)
+                    event = GemmaEvent.from_json(payload.decode('utf-8'))
                     await self.event_queue.put(event)
                 except Exception as e:
                     self.logger.error(f"Error parsing event: {e}")
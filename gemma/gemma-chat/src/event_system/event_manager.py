@@ -1,16 +1,15 @@
 """Event manager for handling Unix domain socket communication"""
 
 import asyncio
-import socket
 import os
+import json
 import logging
-from typing import Dict, List, Callable, Optional, Any
+from typing import Dict, List, Callable, Optional, Set
 from asyncio import Queue
-import json
-import time
-from dataclasses import asdict
 
 from .event_types import GemmaEvent, EventType
+from .event_bus import PriorityEventBus
+from .framing import FrameError, read_frame, write_frame
 from ..config import Config
 
 class EventManager:
@@ -20,15 +19,22 @@ class EventManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.socket_path = config.EVENT_SOCKET_PATH
-        self.server_socket: Optional[socket.socket] = None
-        self.clients: Dict[str, socket.socket] = {}
-        self.event_queue: Queue = Queue()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.clients: Dict[str, asyncio.StreamWriter] = {}
+        self.subscribers: Set[str] = set()  # Clients that asked to receive broadcasts
         self.handlers: Dict[EventType, List[Callable]] = {}
         self.running = False
+        self._client_counter = 0
+        self._tasks: List[asyncio.Task] = []
+        self._client_tasks: Set[asyncio.Task] = set()
         
-        # Priority queue for events (higher priority processed first)
-        self.priority_queue: List[GemmaEvent] = []
+        # Priority event bus (higher priority processed first, latest-only for coalesced types)
+        coalesce_types = [EventType(name.strip()) for name in config.EVENT_COALESCE_TYPES.split(",") if name.strip()]
+        self.event_bus = PriorityEventBus(coalesce_types)
         
+        # Copy of dispatched events for get_next_event(); bounded so it cannot grow without a reader
+        self.event_queue: Queue = Queue(maxsize=1000)
+    
     async def start(self):
         """Start the event manager server"""
         self.logger.info(f"Starting event manager on {self.socket_path}")
@@ -37,19 +43,17 @@ class EventManager:
         if os.path.exists(self.socket_path):
             os.unlink(self.socket_path)
         
-        # Create Unix domain socket
-        self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.server_socket.bind(self.socket_path)
-        self.server_socket.listen(5)
-        self.server_socket.setblocking(False)
+        # Create Unix domain socket server
+        self.server = await asyncio.start_unix_server(
+            self._handle_client, path=self.socket_path, limit=self.config.EVENT_MAX_FRAME_SIZE
+        )
         
         self.running = True
         
         # Start event processing loop
-        asyncio.create_task(self._process_events())
-        
-        # Start accepting connections
-        asyncio.create_task(self._accept_connections())
+        self._tasks.append(asyncio.create_task(self._process_events()))
+        if self.config.EVENT_METRICS_INTERVAL > 0:
+            self._tasks.append(asyncio.create_task(self._log_metrics()))
         
         self.logger.info("Event manager started successfully")
     
@@ -58,99 +62,96 @@ class EventManager:
         self.logger.info("Stopping event manager")
         self.running = False
         
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        
         # Close all client connections
-        for client_id, client_socket in self.clients.items():
+        for client_id, writer in list(self.clients.items()):
             try:
-                client_socket.close()
+                writer.close()
             except Exception as e:
                 self.logger.warning(f"Error closing client {client_id}: {e}")
+        for task in list(self._client_tasks):
+            task.cancel()
+        await asyncio.gather(*self._client_tasks, return_exceptions=True)
+        self.clients.clear()
+        self.subscribers.clear()
         
         # Close server socket
-        if self.server_socket:
-            self.server_socket.close()
-            
+        if self.server:
+            self.server.close()
+            self.server = None
+        
         # Remove socket file
         if os.path.exists(self.socket_path):
             os.unlink(self.socket_path)
         
-        self.logger.info("Event manager stopped")
-    
-    async def _accept_connections(self):
-        """Accept new client connections"""
-        while self.running:
-            try:
-                client_socket, _ = await asyncio.get_event_loop().sock_accept(self.server_socket)
-                client_id = f"client_{len(self.clients)}"
-                self.clients[client_id] = client_socket
-                
-                self.logger.debug(f"New client connected: {client_id}")
-                
-                # Start handling client messages
-                asyncio.create_task(self._handle_client(client_id, client_socket))
-                
-            except Exception as e:
-                if self.running:
-                    self.logger.error(f"Error accepting connection: {e}")
-                await asyncio.sleep(0.1)
+        self.logger.info(f"Event manager stopped ({self._format_metrics()})")
     
-    async def _handle_client(self, client_id: str, client_socket: socket.socket):
-        """Handle messages from a specific client"""
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle framed messages from a specific client"""
+        client_id = f"client_{self._client_counter}"
+        self._client_counter += 1
+        self.clients[client_id] = writer
+        task = asyncio.current_task()
+        self._client_tasks.add(task)
+        self.logger.debug(f"New client connected: {client_id}")
+        
         try:
             while self.running:
-                data = await asyncio.get_event_loop().sock_recv(client_socket, self.config.EVENT_BUFFER_SIZE)
-                if not data:
+                payload = await read_frame(reader, self.config.EVENT_MAX_FRAME_SIZE)
+                if payload is None:
                     break
                 
                 try:
-                    event_json = data.decode('utf-8')
-                    event = GemmaEvent.from_json(event_json)
+                    message = json.loads(payload)
+                    if message.get('subscribe'):
+                        # Consumers subscribe; producers never read, so they get no broadcasts
+                        self.subscribers.add(client_id)
+                        self.logger.debug(f"Client {client_id} subscribed")
+                        continue
+                    event = GemmaEvent.from_dict(message)
                     await self._add_event(event)
                 except Exception as e:
                     self.logger.error(f"Error processing event from {client_id}: {e}")
-                    
+        
+        except asyncio.CancelledError:
+            pass  # Shutting down
+        except FrameError as e:
+            self.logger.error(f"Protocol error from {client_id}, disconnecting: {e}")
         except Exception as e:
             self.logger.error(f"Error handling client {client_id}: {e}")
         finally:
             # Clean up client connection
-            if client_id in self.clients:
-                del self.clients[client_id]
+            self.clients.pop(client_id, None)
+            self.subscribers.discard(client_id)
+            self._client_tasks.discard(task)
             try:
-                client_socket.close()
-            except:
+                writer.close()
+            except Exception:
                 pass
             self.logger.debug(f"Client {client_id} disconnected")
     
     async def _add_event(self, event: GemmaEvent):
-        """Add event to priority queue"""
-        # Insert event based on priority (higher priority first)
-        inserted = False
-        for i, existing_event in enumerate(self.priority_queue):
-            if event.priority > existing_event.priority:
-                self.priority_queue.insert(i, event)
-                inserted = True
-                break
-        
-        if not inserted:
-            self.priority_queue.append(event)
-        
-        # Also add to regular queue for backwards compatibility
-        await self.event_queue.put(event)
+        """Add event to the priority bus"""
+        await self.event_bus.put(event)
     
     async def _process_events(self):
-        """Process events from the queue"""
+        """Process events from the bus (sleeps until an event is published)"""
         while self.running:
             try:
-                # Process priority queue first
-                if self.priority_queue:
-                    event = self.priority_queue.pop(0)
-                    await self._handle_event(event)
-                else:
-                    # Wait for new events
-                    await asyncio.sleep(0.01)
-                    
+                event = await self.event_bus.get()
+                await self._handle_event(event)
+                
+                if self.event_queue.full():
+                    self.event_queue.get_nowait()
+                self.event_queue.put_nowait(event)
+            
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"Error processing events: {e}")
-                await asyncio.sleep(0.1)
     
     async def _handle_event(self, event: GemmaEvent):
         """Handle a specific event by calling registered handlers"""
@@ -169,23 +170,44 @@ class EventManager:
     
     async def _broadcast_event(self, event: GemmaEvent):
         """Broadcast event to all connected clients"""
-        if not self.clients:
+        if not self.subscribers:
             return
         
-        event_json = event.to_json().encode('utf-8')
+        payload = event.to_json().encode('utf-8')
         
-        # Send to all clients
+        # Send to all subscribed clients
         disconnected_clients = []
-        for client_id, client_socket in self.clients.items():
+        for client_id in list(self.subscribers):
+            writer = self.clients[client_id]
             try:
-                await asyncio.get_event_loop().sock_sendall(client_socket, event_json)
+                await write_frame(writer, payload)
             except Exception as e:
                 self.logger.warning(f"Error sending to client {client_id}: {e}")
                 disconnected_clients.append(client_id)
         
         # Remove disconnected clients
         for client_id in disconnected_clients:
-            del self.clients[client_id]
+            self.subscribers.discard(client_id)
+            writer = self.clients.pop(client_id, None)
+            if writer:
+                writer.close()
+    
+    async def _log_metrics(self):
+        """Periodically log event bus metrics"""
+        while self.running:
+            await asyncio.sleep(self.config.EVENT_METRICS_INTERVAL)
+            self.logger.info(f"Event bus: {self._format_metrics()}")
+    
+    def _format_metrics(self) -> str:
+        m = self.event_bus.get_metrics()
+        return (f"depth {m['depth']} (max {m['max_depth']}), {m['dispatched']}/{m['published']} dispatched, "
+                f"{m['coalesced']} coalesced, wait avg {m['avg_wait_ms']:.1f}ms max {m['max_wait_ms']:.1f}ms")
+    
+    def get_metrics(self) -> Dict:
+        """Event bus queue depth and latency metrics"""
+        metrics = self.event_bus.get_metrics()
+        metrics['clients'] = len(self.clients)
+        return metrics
     
     def register_handler(self, event_type: EventType, handler: Callable):
         """Register an event handler"""
@@ -211,8 +233,8 @@ class EventManager:
         self.logger.debug(f"Published event: {event.event_type}")
     
     async def get_next_event(self) -> Optional[GemmaEvent]:
-        """Get the next event from the queue"""
+        """Get the next dispatched event"""
         try:
             return await asyncio.wait_for(self.event_queue.get(), timeout=1.0)
         except asyncio.TimeoutError:
-            return None
\ No newline at end of file
+            return None
@@ -1,11 +1,11 @@
 """Event producer for sending events to the event manager"""
 
 import asyncio
-import socket
 import logging
 from typing import Optional
 
 from .event_types import GemmaEvent
+from .framing import write_frame
 from ..config import Config
 
 class EventProducer:
@@ -16,15 +16,14 @@ class EventProducer:
         self.producer_name = producer_name
         self.logger = logging.getLogger(f"{__name__}.{producer_name}")
         self.socket_path = config.EVENT_SOCKET_PATH
-        self.client_socket: Optional[socket.socket] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
         self.connected = False
+        self._send_lock = asyncio.Lock()  # Keep concurrent senders from interleaving frames
     
     async def connect(self) -> bool:
         """Connect to the event manager"""
         try:
-            self.client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            self.client_socket.setblocking(False)
-            await asyncio.get_event_loop().sock_connect(self.client_socket, self.socket_path)
+            _, self.writer = await asyncio.open_unix_connection(self.socket_path)
             self.connected = True
             self.logger.info(f"Connected to event manager")
             return True
@@ -35,12 +34,12 @@ class EventProducer:
     
     async def disconnect(self):
         """Disconnect from the event manager"""
-        if self.client_socket:
+        if self.writer:
             try:
-                self.client_socket.close()
+                self.writer.close()
             except:
                 pass
-            self.client_socket = None
+            self.writer = None
             self.connected = False
             self.logger.info("Disconnected from event manager")
     
@@ -57,9 +56,10 @@ class EventProducer:
             # Set event source
             event.source = self.producer_name
             
-            # Send event
-            event_json = event.to_json().encode('utf-8')
-            await asyncio.get_event_loop().sock_sendall(self.client_socket, event_json)
+            # Send event as one length-prefixed frame
+            payload = event.to_json().encode('utf-8')
+            async with self._send_lock:
+                await write_frame(self.writer, payload)
             
             self.logger.debug(f"Sent event: {event.event_type}")
             return True
@@ -1,7 +1,7 @@
 """Event types and data structures for Gemma"""
 
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, List
 import json
 import time
@@ -49,35 +49,45 @@ class GemmaEvent:
     
     def to_json(self) -> str:
         """Serialize event to JSON string"""
-        data = asdict(self)
-        data['event_type'] = self.event_type.value
-        return json.dumps(data)
+        # Built directly rather than with asdict(), which deep-copies the data dict
+        return json.dumps({
+            'event_type': self.event_type.value,
+            'timestamp': self.timestamp,
+            'data': self.data,
+            'priority': self.priority,
+            'source': self.source
+        })
     
     @classmethod
     def from_json(cls, json_str: str) -> "GemmaEvent":
         """Deserialize event from JSON string"""
-        data = json.loads(json_str)
+        return cls.from_dict(json.loads(json_str))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GemmaEvent":
+        """Build an event from a decoded JSON object"""
+        data = dict(data)
         data['event_type'] = EventType(data['event_type'])
         return cls(**data)
 
 @dataclass
 class CameraEvent(GemmaEvent):
-    """Camera-specific event"""
-    def __init__(self, event_type: EventType, frame_data: Optional[bytes] = None, 
+    """Camera-specific event (the frame itself stays in a PayloadRing)"""
+    def __init__(self, event_type: EventType, frame_ref: Optional[Dict[str, Any]] = None,
                  detections: Optional[List[Dict]] = None, **kwargs):
         data = {
-            'frame_data': frame_data,
+            'frame_ref': frame_ref,
             'detections': detections or []
         }
         super().__init__(event_type, time.time(), data, **kwargs)
 
 @dataclass
 class AudioEvent(GemmaEvent):
-    """Audio-specific event"""
-    def __init__(self, event_type: EventType, audio_data: Optional[bytes] = None,
+    """Audio-specific event (the samples themselves stay in a PayloadRing)"""
+    def __init__(self, event_type: EventType, audio_ref: Optional[Dict[str, Any]] = None,
                  wake_word: Optional[str] = None, confidence: float = 0.0, **kwargs):
         data = {
-            'audio_data': audio_data,
+            'audio_ref': audio_ref,
             'wake_word': wake_word,
             'confidence': confidence
         }
@@ -0,0 +1,38 @@
+"""Length-prefixed framing for the event socket protocol
+
+Each message on the Unix socket is a 4-byte big-endian payload length
+followed by the payload, so a reader always gets exactly one event per
+frame no matter how the stream was split or merged in transit.
+"""
+
+import asyncio
+import struct
+from typing import Optional
+
+FRAME_HEADER = struct.Struct(">I")
+
+class FrameError(Exception):
+    """Raised when a frame header is invalid"""
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length"""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int) -> Optional[bytes]:
+    """Read one frame payload, or None if the peer closed the connection"""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > max_size:
+        raise FrameError(f"Frame of {length} bytes exceeds limit of {max_size}")
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+async def write_frame(writer: asyncio.StreamWriter, payload: bytes):
+    """Write one frame and wait for the transport buffer to drain"""
+    writer.write(encode_frame(payload))
+    await writer.drain()
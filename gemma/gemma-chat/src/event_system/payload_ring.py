@@ -0,0 +1,155 @@
+"""Shared-memory rings for camera frame and audio payloads
+
+Frames and audio are too large to push through the JSON event socket, so
+producers write them into a fixed-slot ring in shared memory and the event
+only carries a small reference (ring name, sequence number, shape, dtype).
+Consumers copy a payload out only when they actually use it.
+
+Memory layout: a 16-byte ring header (slot count, slot size) followed by the
+slots, each a 16-byte header (sequence number, payload size) and the payload.
+Each ring has a single writer.  The writer clears a slot's sequence number
+before overwriting it and a reader checks it before and after copying, so a
+payload overwritten while being read is reported as gone instead of torn.
+"""
+
+import itertools
+import logging
+import os
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+RING_HEADER = struct.Struct("<QQ")  # slots, slot_size
+SLOT_HEADER = struct.Struct("<QQ")  # seq, nbytes
+
+logger = logging.getLogger(__name__)
+
+# Rings created in this process, so in-process consumers reuse the writer's mapping
+_owned: Dict[str, "PayloadRing"] = {}
+# Rings opened by name from another process
+_attached: Dict[str, "PayloadRing"] = {}
+
+class PayloadRing:
+    """Fixed-size ring of binary payloads in named shared memory"""
+    
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.name = shm.name
+        self.owner = owner
+        self.slots, self.slot_size = RING_HEADER.unpack_from(shm.buf, 0)
+        self._seq = itertools.count(1)
+        self.written = 0
+        self.rejected = 0
+    
+    @classmethod
+    def create(cls, name: str, slots: int, slot_size: int) -> "PayloadRing":
+        """Create a ring, replacing a stale one left behind by a crashed process"""
+        size = RING_HEADER.size + slots * (SLOT_HEADER.size + slot_size)
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        
+        RING_HEADER.pack_into(shm.buf, 0, slots, slot_size)
+        for slot in range(slots):
+            SLOT_HEADER.pack_into(shm.buf, cls._slot_offset(slot, slot_size), 0, 0)
+        
+        ring = cls(shm, owner=True)
+        _owned[name] = ring
+        return ring
+    
+    @classmethod
+    def attach(cls, name: str) -> "PayloadRing":
+        """Open an existing ring created by another component"""
+        # Only the creator may unlink the segment; keep the resource tracker from doing it at our exit
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                # Tracked under the POSIX name, which has a leading slash
+                resource_tracker.unregister("/" + shm.name, "shared_memory")
+        return cls(shm, owner=False)
+    
+    @staticmethod
+    def _slot_offset(slot: int, slot_size: int) -> int:
+        return RING_HEADER.size + slot * (SLOT_HEADER.size + slot_size)
+    
+    def put(self, array: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Copy an array into the next slot and return its reference, or None if it does not fit"""
+        array = np.ascontiguousarray(array)
+        if array.nbytes > self.slot_size:
+            self.rejected += 1
+            logger.warning(f"Payload of {array.nbytes} bytes does not fit ring {self.name} "
+                           f"(slot size {self.slot_size})")
+            return None
+        
+        seq = next(self._seq)
+        offset = self._slot_offset(seq % self.slots, self.slot_size)
+        start = offset + SLOT_HEADER.size
+        SLOT_HEADER.pack_into(self.shm.buf, offset, 0, 0)  # Invalidate while writing
+        self.shm.buf[start:start + array.nbytes] = array.reshape(-1).view(np.uint8)
+        SLOT_HEADER.pack_into(self.shm.buf, offset, seq, array.nbytes)
+        self.written += 1
+        
+        return {
+            'ring': self.name,
+            'seq': seq,
+            'shape': list(array.shape),
+            'dtype': array.dtype.str,
+        }
+    
+    def get(self, ref: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Copy a payload out of the ring, or None if it has been overwritten"""
+        seq = ref['seq']
+        offset = self._slot_offset(seq % self.slots, self.slot_size)
+        slot_seq, nbytes = SLOT_HEADER.unpack_from(self.shm.buf, offset)
+        if slot_seq != seq:
+            return None
+        
+        start = offset + SLOT_HEADER.size
+        data = bytes(self.shm.buf[start:start + nbytes])
+        if SLOT_HEADER.unpack_from(self.shm.buf, offset)[0] != seq:
+            return None  # Overwritten while copying
+        
+        return np.frombuffer(data, dtype=np.dtype(ref['dtype'])).reshape(ref['shape'])
+    
+    def close(self):
+        """Release the mapping (and remove the segment if this process created it)"""
+        registry = _owned if self.owner else _attached
+        if registry.get(self.name) is self:
+            del registry[self.name]
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            logger.warning(f"Error closing payload ring {self.name}: {e}")
+
+def resolve_payload(ref: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+    """Load the payload an event refers to, or None if it is no longer available"""
+    if not ref:
+        return None
+    
+    name = ref['ring']
+    ring = _owned.get(name) or _attached.get(name)
+    if ring is None:
+        try:
+            ring = PayloadRing.attach(name)
+        except FileNotFoundError:
+            logger.debug(f"Payload ring {name} does not exist")
+            return None
+        _attached[name] = ring
+    
+    return ring.get(ref)
+
+def detach_payload_rings():
+    """Close rings opened by resolve_payload()"""
+    for ring in list(_attached.values()):
+        ring.close()
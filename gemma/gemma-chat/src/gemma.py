@@ -14,6 +14,7 @@ from .camera_processor import CameraProcessor
 from .sound_processor import SoundProcessor
 from .text_processor import TextProcessor
 from .main_loop import MainLoop
+from .inference_executor import get_inference_executor
 
 class GemmaApplication:
     """Main Gemma application coordinator"""
@@ -113,6 +114,7 @@ class GemmaApplication:
             await self.camera_processor.stop()
             await self.queue_manager.stop()
             await self.event_manager.stop()
+            await asyncio.to_thread(get_inference_executor().shutdown)
             
             self.logger.info("Gemma application stopped")
             
@@ -185,7 +187,8 @@ class GemmaApplication:
                 'sound_processor': self.sound_processor.running if hasattr(self.sound_processor, 'running') else False,
                 'text_processor': self.text_processor.running if hasattr(self.text_processor, 'running') else False,
                 'main_loop': self.main_loop.running if hasattr(self.main_loop, 'running') else False
-            }
+            },
+            'inference': get_inference_executor().get_metrics()
         }
 
 async def main():
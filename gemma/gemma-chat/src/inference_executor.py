@@ -0,0 +1,233 @@
+"""Shared executor that runs blocking model inference off the event loop"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import Config
+
+# Model priorities (lower runs first)
+PRIORITY_REALTIME = 0    # VAD, wake word
+PRIORITY_PERCEPTION = 1  # Object detection
+PRIORITY_BACKGROUND = 2  # Embeddings, fact distillation
+
+class InferenceQueueFull(Exception):
+    """Raised when a model already has max_queue requests waiting"""
+
+@dataclass
+class _Request:
+    item: Any
+    future: asyncio.Future
+    loop: asyncio.AbstractEventLoop
+    enqueued_at: float
+
+@dataclass
+class _ModelQueue:
+    name: str
+    fn: Optional[Callable[[Any], Any]]
+    batch_fn: Optional[Callable[[List[Any]], List[Any]]]
+    priority: int
+    max_queue: int
+    max_batch_size: int
+    pending: deque = field(default_factory=deque)
+    
+    # Metrics
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    failed: int = 0
+    batches: int = 0
+    queue_ms: deque = field(default_factory=lambda: deque(maxlen=100))
+    run_ms: deque = field(default_factory=lambda: deque(maxlen=100))
+
+class InferenceExecutor:
+    """Priority thread pool for model inference
+    
+    Each registered model has its own bounded FIFO queue.  Idle workers take
+    the next request from the highest priority model that has one waiting.
+    Background models may occupy at most ``workers - 1`` threads, so a long
+    distillation or embedding batch never holds up VAD or object detection.
+    Models registered with a ``batch_fn`` get all their waiting requests (up
+    to ``max_batch_size``) in a single call.
+    """
+    
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self.logger = logging.getLogger(__name__)
+        self.models: Dict[str, _ModelQueue] = {}
+        self._condition = threading.Condition()
+        self._background_running = 0
+        self._stopping = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"inference-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def register_model(self, name: str, fn: Optional[Callable[[Any], Any]] = None,
+                       priority: int = PRIORITY_BACKGROUND, max_queue: int = 8,
+                       batch_fn: Optional[Callable[[List[Any]], List[Any]]] = None,
+                       max_batch_size: int = 8):
+        """Register (or replace) the callable serving a model
+        
+        fn takes one request item; batch_fn takes a list of items and returns
+        one result per item.
+        """
+        if fn is None and batch_fn is None:
+            raise ValueError("register_model needs fn or batch_fn")
+        
+        with self._condition:
+            model = self.models.get(name)
+            if model is None:
+                self.models[name] = _ModelQueue(name, fn, batch_fn, priority, max_queue, max_batch_size)
+            else:
+                model.fn, model.batch_fn = fn, batch_fn
+                model.priority, model.max_queue, model.max_batch_size = priority, max_queue, max_batch_size
+    
+    async def submit(self, name: str, item: Any) -> Any:
+        """Run a request on a worker thread and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError("Inference executor is shut down")
+            model = self.models[name]
+            if len(model.pending) >= model.max_queue:
+                model.rejected += 1
+                raise InferenceQueueFull(f"{name} has {model.max_queue} requests waiting")
+            model.pending.append(_Request(item, future, loop, time.perf_counter()))
+            model.submitted += 1
+            self._condition.notify()
+        
+        return await future
+    
+    def _next_model(self) -> Optional[_ModelQueue]:
+        """Highest priority model with a request waiting (oldest first within a priority)"""
+        background_allowed = self.workers == 1 or self._background_running < self.workers - 1
+        best = None
+        for model in self.models.values():
+            if not model.pending:
+                continue
+            if model.priority >= PRIORITY_BACKGROUND and not background_allowed:
+                continue
+            if (best is None or model.priority < best.priority or
+                    (model.priority == best.priority and
+                     model.pending[0].enqueued_at < best.pending[0].enqueued_at)):
+                best = model
+        return best
+    
+    def _worker(self):
+        while True:
+            with self._condition:
+                while True:
+                    model = self._next_model()
+                    if model is not None:
+                        break
+                    if self._stopping and not any(m.pending for m in self.models.values()):
+                        return
+                    self._condition.wait()
+                
+                limit = model.max_batch_size if model.batch_fn else 1
+                batch = []
+                while model.pending and len(batch) < limit:
+                    request = model.pending.popleft()
+                    if not request.future.cancelled():
+                        batch.append(request)
+                background = model.priority >= PRIORITY_BACKGROUND
+                if background:
+                    self._background_running += 1
+            
+            try:
+                if batch:
+                    self._run_batch(model, batch)
+            finally:
+                with self._condition:
+                    if background:
+                        self._background_running -= 1
+                    self._condition.notify_all()
+    
+    def _run_batch(self, model: _ModelQueue, batch: List[_Request]):
+        start = time.perf_counter()
+        for request in batch:
+            model.queue_ms.append((start - request.enqueued_at) * 1000)
+        
+        try:
+            if model.batch_fn:
+                results = list(model.batch_fn([request.item for request in batch]))
+                if len(results) != len(batch):
+                    # Results can't be matched to requests, so fail the whole batch rather than hang some
+                    raise RuntimeError(f"{model.name} batch_fn returned {len(results)} results for {len(batch)} requests")
+            else:
+                results = [model.fn(batch[0].item)]
+        except Exception as e:
+            model.failed += len(batch)
+            for request in batch:
+                _deliver(request, _set_exception, e)
+            return
+        finally:
+            model.run_ms.append((time.perf_counter() - start) * 1000)
+            model.batches += 1
+        
+        model.completed += len(batch)
+        for request, result in zip(batch, results):
+            _deliver(request, _set_result, result)
+    
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-model queue depth, throughput and queue/run times"""
+        metrics = {}
+        for name, model in list(self.models.items()):
+            queue_ms = list(model.queue_ms)
+            run_ms = list(model.run_ms)
+            metrics[name] = {
+                'queued': len(model.pending),
+                'submitted': model.submitted,
+                'completed': model.completed,
+                'rejected': model.rejected,
+                'failed': model.failed,
+                'batches': model.batches,
+                'avg_batch_size': model.completed / model.batches if model.batches else 0,
+                'avg_queue_ms': sum(queue_ms) / len(queue_ms) if queue_ms else 0,
+                'max_queue_ms': max(queue_ms, default=0),
+                'avg_run_ms': sum(run_ms) / len(run_ms) if run_ms else 0
+            }
+        return metrics
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Finish queued requests and stop the worker threads"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+def _deliver(request: _Request, setter: Callable, value: Any):
+    try:
+        request.loop.call_soon_threadsafe(setter, request.future, value)
+    except RuntimeError:
+        pass  # The requesting event loop has closed
+
+def _set_result(future: asyncio.Future, result: Any):
+    if not future.done():
+        future.set_result(result)
+
+def _set_exception(future: asyncio.Future, error: Exception):
+    if not future.done():
+        future.set_exception(error)
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_inference_executor(config: Optional[Config] = None) -> InferenceExecutor:
+    """Shared executor, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = config or Config.from_env()
+            _executor = InferenceExecutor(config.INFERENCE_WORKERS)
+        return _executor
@@ -5,10 +5,11 @@ import logging
 import time
 from typing import Dict, Any, Optional, List
 import numpy as np
+import cv2
 
 from .model_interface import ModelInterface
 from .response_processor import ResponseProcessor
-from ..event_system import EventConsumer, EventManager, EventType, GemmaEvent
+from ..event_system import EventConsumer, EventManager, EventType, GemmaEvent, resolve_payload, detach_payload_rings
 from ..memory_system import MemoryManager
 from ..config import Config
 
@@ -29,7 +30,8 @@ class MainLoop:
         self.running = False
         self.processing_active = False
         
-        # Current multimodal input
+        # Current multimodal input (image and audio are payload ring references,
+        # only loaded and encoded when inference runs)
         self.current_text = None
         self.current_image = None
         self.current_audio = None
@@ -97,6 +99,7 @@ class MainLoop:
         await self.response_processor.disconnect()
         await self.memory_manager.stop()
         await self.model_interface.cleanup()
+        detach_payload_rings()
         
         self.logger.info("Main loop stopped")
     
@@ -157,12 +160,12 @@ class MainLoop:
                 self.current_context['text_timestamp'] = event.timestamp
                 
             elif event.event_type == EventType.CAMERA_FRAME:
-                self.current_image = event.data.get('frame_data')
+                self.current_image = event.data.get('frame_ref')
                 self.current_context['camera_timestamp'] = event.timestamp
                 self.current_context['detections'] = event.data.get('detections', [])
                 
             elif event.event_type == EventType.SPEECH_DETECTED:
-                self.current_audio = event.data.get('audio_data')
+                self.current_audio = event.data.get('audio_ref')
                 self.current_context['audio_timestamp'] = event.timestamp
                 self.current_context['speech_confidence'] = event.data.get('confidence', 0)
                 
@@ -215,16 +218,22 @@ class MainLoop:
                 memory_context = await self.memory_manager.get_memory_context(self.current_text, context)
                 context.update(memory_context)
             
-            # Generate response
+            # Load payloads from shared memory (the frame is only JPEG-encoded here)
+            image_data = await asyncio.to_thread(self._load_image, self.current_image)
+            audio_data = await asyncio.to_thread(self._load_audio, self.current_audio)
+            
+            # Generate response, speaking quoted sentences as they stream in
+            speech_stream = self.response_processor.start_speech_stream(start_time)
             response = await self.model_interface.process_multimodal_input(
                 text_input=self.current_text,
-                image_data=self.current_image,
-                audio_data=self.current_audio,
-                context=context
+                image_data=image_data,
+                audio_data=audio_data,
+                context=context,
+                on_text=speech_stream.feed
             )
             
             # Process response
-            await self.response_processor.process_response(response, context)
+            await self.response_processor.process_response(response, context, speech_stream)
             
             # Process conversation for memory
             if self.current_text:
@@ -241,7 +250,15 @@ class MainLoop:
             if len(self.response_times) > 100:
                 self.response_times.pop(0)
             
-            self.logger.info(f"Inference completed in {inference_time:.2f}s")
+            timings = []
+            if 'memory_timings' in context:
+                timings.append(f"memory {context['memory_timings']['total_ms']:.0f}ms")
+            if speech_stream.received_text and self.model_interface.last_time_to_first_token is not None:
+                timings.append(f"first token {self.model_interface.last_time_to_first_token * 1000:.0f}ms")
+            if speech_stream.time_to_first_speech is not None:
+                timings.append(f"first spoken sentence {speech_stream.time_to_first_speech * 1000:.0f}ms")
+            self.logger.info(f"Inference completed in {inference_time:.2f}s"
+                             + (f" ({', '.join(timings)})" if timings else ""))
             
             # Reset state
             self._reset_current_state()
@@ -250,6 +267,26 @@ class MainLoop:
             self.logger.error(f"Error in inference: {e}")
             self._reset_current_state()
     
+    def _load_image(self, frame_ref: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        """Read a referenced camera frame and encode it as JPEG"""
+        frame = resolve_payload(frame_ref)
+        if frame is None:
+            if frame_ref:
+                self.logger.debug(f"Frame {frame_ref['seq']} no longer in ring, skipping image")
+            return None
+        
+        ok, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.config.IMAGE_JPEG_QUALITY])
+        return buffer.tobytes() if ok else None
+    
+    def _load_audio(self, audio_ref: Optional[Dict[str, Any]]) -> Optional[bytes]:
+        """Read referenced audio samples as raw bytes"""
+        audio = resolve_payload(audio_ref)
+        if audio is None:
+            if audio_ref:
+                self.logger.debug(f"Audio {audio_ref['seq']} no longer in ring, skipping audio")
+            return None
+        return audio.tobytes()
+    
     def _reset_current_state(self):
         """Reset current multimodal state after processing"""
         self.current_text = None
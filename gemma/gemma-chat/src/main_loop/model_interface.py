@@ -2,7 +2,7 @@
 
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 import time
 import base64
 import io
@@ -25,6 +25,7 @@ class ModelInterface:
         self.max_history = getattr(config, 'MAX_HISTORY', 10)
         self.max_new_tokens = getattr(config, 'MAX_NEW_TOKENS', 100)
         self.temperature = getattr(config, 'TEMPERATURE', 0.7)
+        self.stream_responses = getattr(config, 'STREAM_RESPONSES', True)
         
         # HTTP session for API calls
         self.session = None
@@ -37,6 +38,9 @@ class ModelInterface:
         self.inference_count = 0
         self.total_inference_time = 0
         self.last_inference_time = 0
+        self.streamed_count = 0
+        self.total_time_to_first_token = 0
+        self.last_time_to_first_token = None
         
         # API health status
         self.api_healthy = False
@@ -86,8 +90,12 @@ Current capabilities:
                                      text_input: Optional[str] = None,
                                      image_data: Optional[bytes] = None,
                                      audio_data: Optional[bytes] = None,
-                                     context: Optional[Dict[str, Any]] = None) -> str:
-        """Process multimodal input and generate response"""
+                                     context: Optional[Dict[str, Any]] = None,
+                                     on_text: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
+        """Process multimodal input and generate response
+        
+        When streaming, on_text is awaited with each text delta as it arrives.
+        """
         start_time = time.time()
         
         try:
@@ -95,7 +103,7 @@ Current capabilities:
             input_data = self._prepare_input(text_input, image_data, audio_data, context)
             
             # Generate response
-            response = await self._generate_response(input_data)
+            response = await self._generate_response(input_data, on_text)
             
             # Update conversation history
             self._update_conversation_history(input_data, response)
@@ -146,7 +154,8 @@ Current capabilities:
         # In a real implementation, this would use vision capabilities
         return f"Image of size {image.size[0]}x{image.size[1]}"
     
-    async def _generate_response(self, input_data: Dict[str, Any]) -> str:
+    async def _generate_response(self, input_data: Dict[str, Any],
+                                 on_text: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
         """Generate response from input data using OpenAI API"""
         await self._ensure_session()
         
@@ -163,9 +172,12 @@ Current capabilities:
                 "messages": messages,
                 "max_new_tokens": self.max_new_tokens,
                 "temperature": self.temperature,
-                "stream": False
+                "stream": self.stream_responses
             }
             
+            if self.stream_responses:
+                return await self._stream_response(payload, on_text)
+            
             # Make API request
             async with self.session.post(
                 f"{self.api_url}/v1/chat/completions",
@@ -192,6 +204,60 @@ Current capabilities:
             self.logger.error(f"Error calling API: {e}")
             return "I apologize, but I encountered an error processing your request."
     
+    async def _stream_response(self, payload: Dict[str, Any],
+                               on_text: Optional[Callable[[str], Awaitable[None]]]) -> str:
+        """Read a streamed completion (server-sent events), passing each delta to on_text"""
+        request_time = time.time()
+        parts: List[str] = []
+        
+        try:
+            async with self.session.post(
+                f"{self.api_url}/v1/chat/completions",
+                json=payload,
+                timeout=30
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    self.logger.error(f"API request failed: {response.status} - {error_text}")
+                    return "I apologize, but I'm having trouble connecting to the model right now."
+                
+                async for raw_line in response.content:
+                    line = raw_line.decode('utf-8').strip()
+                    if not line.startswith('data:'):
+                        continue
+                    data = line[len('data:'):].strip()
+                    if data == '[DONE]':
+                        break
+                    
+                    choices = json.loads(data).get('choices') or []
+                    delta = choices[0].get('delta', {}).get('content') if choices else None
+                    if not delta:
+                        continue
+                    
+                    if not parts:
+                        self._record_first_token(time.time() - request_time)
+                    parts.append(delta)
+                    if on_text:
+                        await on_text(delta)
+        
+        except Exception as e:
+            if not parts:
+                raise
+            # Sentences may already have been spoken, so keep what arrived
+            self.logger.error(f"Response stream interrupted after {len(parts)} chunks: {e}")
+        
+        if not parts:
+            self.logger.warning("No content in streamed API response")
+            return "I apologize, but I didn't receive a proper response."
+        return ''.join(parts).strip()
+    
+    def _record_first_token(self, elapsed: float):
+        """Track time to first token of a streamed response"""
+        self.streamed_count += 1
+        self.total_time_to_first_token += elapsed
+        self.last_time_to_first_token = elapsed
+        self.logger.debug(f"First token after {elapsed * 1000:.0f}ms")
+    
     def _mock_response(self, input_data: Dict[str, Any]) -> str:
         """Mock response for testing"""
         text = input_data.get('text', '')
@@ -357,6 +423,10 @@ Current capabilities:
             'total_inference_time': self.total_inference_time,
             'avg_inference_time': avg_inference_time,
             'last_inference_time': self.last_inference_time,
+            'stream_responses': self.stream_responses,
+            'avg_time_to_first_token': (self.total_time_to_first_token / self.streamed_count
+                                        if self.streamed_count > 0 else 0),
+            'last_time_to_first_token': self.last_time_to_first_token,
             'conversation_length': len(self.conversation_history),
             'max_history': self.max_history,
             'max_new_tokens': self.max_new_tokens,
@@ -8,6 +8,42 @@ import time
 from ..event_system import EventProducer, EventType, TTSEvent
 from ..config import Config
 
+class SpeechStream:
+    """Queues quoted sentences for TTS as soon as they close in a streamed response"""
+    
+    def __init__(self, processor: "ResponseProcessor", started_at: Optional[float] = None):
+        self.processor = processor
+        self.started_at = started_at or time.time()
+        self.in_quote = False
+        self.buffer: List[str] = []
+        self.sentences: List[str] = []
+        self.received_text = False
+        self.time_to_first_speech: Optional[float] = None  # Seconds from started_at
+    
+    async def feed(self, text: str):
+        """Consume a text delta, queueing any quoted sentence it completes"""
+        self.received_text = True
+        for i, segment in enumerate(text.split('"')):
+            if i > 0:
+                # A quote character precedes every segment after the first
+                if self.in_quote:
+                    await self._close_quote()
+                self.in_quote = not self.in_quote
+            if self.in_quote:
+                self.buffer.append(segment)
+    
+    async def _close_quote(self):
+        sentence = ''.join(self.buffer).strip()
+        self.buffer = []
+        if not sentence:
+            return
+        
+        self.sentences.append(sentence)
+        await self.processor._process_tts_sentences([sentence])
+        if self.time_to_first_speech is None:
+            self.time_to_first_speech = time.time() - self.started_at
+            self.processor._record_first_speech(self.time_to_first_speech)
+
 class ResponseProcessor:
     """Processes model responses and handles TTS, actions, and memory"""
     
@@ -28,6 +64,9 @@ class ResponseProcessor:
         self.total_sentences = 0
         self.total_actions = 0
         self.total_memory_items = 0
+        self.streamed_responses = 0
+        self.total_time_to_first_speech = 0
+        self.last_time_to_first_speech = None
         
         # Response history
         self.response_history: List[Dict[str, Any]] = []
@@ -41,8 +80,16 @@ class ResponseProcessor:
         """Disconnect from event system"""
         await self.event_producer.disconnect()
     
-    async def process_response(self, response: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Process a model response and extract components"""
+    def start_speech_stream(self, started_at: Optional[float] = None) -> SpeechStream:
+        """Create a stream that speaks quoted sentences while the response is generated"""
+        return SpeechStream(self, started_at)
+    
+    async def process_response(self, response: str, context: Optional[Dict[str, Any]] = None,
+                               speech_stream: Optional[SpeechStream] = None) -> Dict[str, Any]:
+        """Process a model response and extract components
+        
+        Sentences already queued by speech_stream are not queued again.
+        """
         start_time = time.time()
         
         try:
@@ -50,7 +97,8 @@ class ResponseProcessor:
             components = self._parse_response(response)
             
             # Process each component type
-            await self._process_tts_sentences(components['sentences'])
+            if speech_stream is None or not speech_stream.received_text:
+                await self._process_tts_sentences(components['sentences'])
             await self._process_actions(components['actions'])
             await self._process_memory_items(components['memory_items'])
             
@@ -178,6 +226,13 @@ class ResponseProcessor:
         self.total_actions += len(components['actions'])
         self.total_memory_items += len(components['memory_items'])
     
+    def _record_first_speech(self, elapsed: float):
+        """Track time from inference start to the first sentence queued for TTS"""
+        self.streamed_responses += 1
+        self.total_time_to_first_speech += elapsed
+        self.last_time_to_first_speech = elapsed
+        self.logger.debug(f"First sentence queued for TTS after {elapsed * 1000:.0f}ms")
+    
     def _add_to_history(self, result: Dict[str, Any]):
         """Add processing result to history"""
         self.response_history.append(result)
@@ -243,6 +298,9 @@ class ResponseProcessor:
                                          if self.processed_responses > 0 else 0),
             'avg_actions_per_response': (self.total_actions / self.processed_responses 
                                        if self.processed_responses > 0 else 0),
+            'avg_time_to_first_speech': (self.total_time_to_first_speech / self.streamed_responses
+                                         if self.streamed_responses > 0 else 0),
+            'last_time_to_first_speech': self.last_time_to_first_speech,
             'response_history_size': len(self.response_history)
         }
     
@@ -7,6 +7,8 @@ from typing import List, Dict, Any, Optional, Set
 import re
 from dataclasses import dataclass
 
+from ..inference_executor import get_inference_executor, PRIORITY_BACKGROUND
+
 try:
     from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
     TRANSFORMERS_AVAILABLE = True
@@ -86,6 +88,11 @@ class FactDistiller:
         # Initialize model
         self._initialize_model()
         
+        # Generation runs on the shared inference executor, behind VAD and detection
+        self.inference = get_inference_executor()
+        self.inference.register_model("fact_distiller", batch_fn=self._generate_batch,
+                                      priority=PRIORITY_BACKGROUND, max_queue=16, max_batch_size=8)
+        
         # Statistics
         self.distilled_facts = 0
         self.processing_times = []
@@ -221,18 +228,10 @@ class FactDistiller:
             # Create a prompt for fact extraction
             prompt = self._create_fact_extraction_prompt(text, context)
             
-            # Generate fact extraction
-            result = self.distillation_pipeline(
-                prompt,
-                max_length=len(prompt.split()) + 50,
-                num_return_sequences=1,
-                temperature=0.3,
-                do_sample=True
-            )
+            # Generate fact extraction (batched with other pending prompts)
+            generated_text = await self.inference.submit("fact_distiller", prompt)
             
-            if result and len(result) > 0:
-                generated_text = result[0]['generated_text']
-                
+            if generated_text:
                 # Parse extracted facts
                 facts = self._parse_generated_facts(generated_text, source)
                 return facts
@@ -242,6 +241,17 @@ class FactDistiller:
         
         return []
     
+    def _generate_batch(self, prompts: List[str]) -> List[Optional[str]]:
+        """Run the distillation pipeline on several prompts in one call (inference thread)"""
+        results = self.distillation_pipeline(
+            prompts,
+            max_new_tokens=50,
+            num_return_sequences=1,
+            temperature=0.3,
+            do_sample=True
+        )
+        return [result[0]['generated_text'] if result else None for result in results]
+    
     def _create_fact_extraction_prompt(self, text: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Create prompt for AI fact extraction"""
         prompt = f"""Extract important facts from this text:
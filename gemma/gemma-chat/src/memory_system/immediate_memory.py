@@ -3,30 +3,58 @@
 import logging
 import asyncio
 import time
+import itertools
 from typing import List, Dict, Any, Optional, Set
-from collections import defaultdict
+from collections import defaultdict, deque
 import heapq
 from dataclasses import asdict
+import numpy as np
 
 from .fact_distiller import Fact, FactDistiller
+from .fact_index import BM25Index, MinHashIndex, tokenize, shingles, jaccard
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
 
 class ImmediateMemory:
     """Manages immediate memory with fact storage and retrieval"""
     
-    def __init__(self, max_facts: int = 100, relevance_threshold: float = 0.3):
+    def __init__(self, max_facts: int = 100, relevance_threshold: float = 0.3,
+                 rerank_model: Optional[str] = None, rerank_candidates: int = 20):
         self.max_facts = max_facts
         self.relevance_threshold = relevance_threshold
         self.logger = logging.getLogger(__name__)
         
-        # Fact storage
+        # Fact storage (ids are stable, list positions change when facts are archived)
         self.facts: List[Fact] = []
+        self.fact_ids: List[int] = []
+        self.facts_by_id: Dict[int, Fact] = {}
         self.facts_by_category: Dict[str, List[Fact]] = defaultdict(list)
         self.facts_by_source: Dict[str, List[Fact]] = defaultdict(list)
-        
-        # Fact index for quick lookup
-        self.fact_index: Dict[str, Set[int]] = defaultdict(set)  # keyword -> fact indices
-        
-        # Access tracking for importance scoring
+        self._next_fact_id = itertools.count()
+        
+        # Keyword index (BM25 over posting lists) and near-duplicate index
+        self.fact_index = BM25Index()
+        self.duplicate_index = MinHashIndex()
+        
+        # Optional embedding re-ranker for the best keyword matches
+        self.rerank_candidates = rerank_candidates
+        self.rerank_model = None
+        self.fact_embeddings: Dict[int, np.ndarray] = {}
+        if rerank_model:
+            if EMBEDDINGS_AVAILABLE:
+                try:
+                    self.rerank_model = SentenceTransformer(rerank_model)
+                    self.logger.info(f"Loaded re-ranking model: {rerank_model}")
+                except Exception as e:
+                    self.logger.error(f"Failed to load re-ranking model: {e}")
+            else:
+                self.logger.warning("SentenceTransformers not available, re-ranking disabled")
+        
+        # Access tracking for importance scoring (keyed by fact id)
         self.fact_access_count: Dict[int, int] = defaultdict(int)
         self.last_access_time: Dict[int, float] = {}
         
@@ -35,6 +63,7 @@ class ImmediateMemory:
         self.total_facts_archived = 0
         self.retrieval_count = 0
         self.archival_decisions = 0
+        self.retrieval_times: deque = deque(maxlen=100)  # ms
         
         # Archival history
         self.archived_facts: List[Fact] = []
@@ -49,8 +78,10 @@ class ImmediateMemory:
                 return False
             
             # Add to main storage
-            fact_index = len(self.facts)
+            fact_id = next(self._next_fact_id)
             self.facts.append(fact)
+            self.fact_ids.append(fact_id)
+            self.facts_by_id[fact_id] = fact
             
             # Add to category index
             self.facts_by_category[fact.category].append(fact)
@@ -58,12 +89,12 @@ class ImmediateMemory:
             # Add to source index
             self.facts_by_source[fact.source].append(fact)
             
-            # Update keyword index
-            self._update_fact_index(fact, fact_index)
+            # Update keyword and duplicate indexes
+            self._update_fact_index(fact, fact_id)
             
             # Initialize access tracking
-            self.fact_access_count[fact_index] = 0
-            self.last_access_time[fact_index] = time.time()
+            self.fact_access_count[fact_id] = 0
+            self.last_access_time[fact_id] = time.time()
             
             self.total_facts_added += 1
             
@@ -90,30 +121,42 @@ class ImmediateMemory:
                                     query: str, 
                                     context: Optional[Dict[str, Any]] = None,
                                     max_facts: int = 10) -> List[Fact]:
-        """Retrieve facts relevant to a query"""
+        """Retrieve facts relevant to a query
+        
+        Only facts sharing at least one keyword with the query are scored,
+        found through the posting lists of the query's keywords.
+        """
         try:
+            start_time = time.perf_counter()
             self.retrieval_count += 1
             
-            # Calculate relevance scores for all facts
-            scored_facts = []
-            query_lower = query.lower()
+            # BM25 keyword scores, normalized to 0..1 against the best match
+            keyword_scores = self.fact_index.search(tokenize(query))
+            best = max(keyword_scores.values(), default=0.0)
             
-            for i, fact in enumerate(self.facts):
-                relevance_score = self._calculate_relevance(fact, query_lower, context, i)
+            scored_facts = []
+            for fact_id, keyword_score in keyword_scores.items():
+                fact = self.facts_by_id[fact_id]
+                relevance_score = self._calculate_relevance(fact, keyword_score / best, context, fact_id)
                 
                 if relevance_score >= self.relevance_threshold:
-                    scored_facts.append((relevance_score, i, fact))
+                    scored_facts.append((relevance_score, fact_id, fact))
             
-            # Sort by relevance score (descending)
-            scored_facts.sort(key=lambda x: x[0], reverse=True)
+            # Highest relevance first
+            if self.rerank_model and scored_facts:
+                top_facts = heapq.nlargest(max(max_facts, self.rerank_candidates), scored_facts, key=lambda x: x[0])
+                top_facts = await asyncio.to_thread(self._rerank, query, top_facts)
+            else:
+                top_facts = heapq.nlargest(max_facts, scored_facts, key=lambda x: x[0])
             
             # Update access tracking
             relevant_facts = []
-            for score, fact_index, fact in scored_facts[:max_facts]:
-                self.fact_access_count[fact_index] += 1
-                self.last_access_time[fact_index] = time.time()
+            for score, fact_id, fact in top_facts[:max_facts]:
+                self.fact_access_count[fact_id] += 1
+                self.last_access_time[fact_id] = time.time()
                 relevant_facts.append(fact)
             
+            self.retrieval_times.append((time.perf_counter() - start_time) * 1000)
             self.logger.debug(f"Retrieved {len(relevant_facts)} relevant facts for query: {query[:30]}...")
             return relevant_facts
             
@@ -123,27 +166,11 @@ class ImmediateMemory:
     
     def _calculate_relevance(self, 
                            fact: Fact, 
-                           query_lower: str,
+                           keyword_score: float,
                            context: Optional[Dict[str, Any]],
-                           fact_index: int) -> float:
-        """Calculate relevance score for a fact"""
-        score = 0.0
-        fact_content_lower = fact.content.lower()
-        
-        # Keyword matching
-        query_words = set(query_lower.split())
-        fact_words = set(fact_content_lower.split())
-        
-        # Exact word matches
-        word_matches = len(query_words.intersection(fact_words))
-        if word_matches > 0:
-            score += word_matches * 0.3
-        
-        # Partial word matches
-        for query_word in query_words:
-            for fact_word in fact_words:
-                if query_word in fact_word or fact_word in query_word:
-                    score += 0.1
+                           fact_id: int) -> float:
+        """Calculate relevance score for a fact from its normalized keyword score"""
+        score = keyword_score * 0.6
         
         # Boost based on fact importance
         score += fact.importance * 0.2
@@ -159,7 +186,7 @@ class ImmediateMemory:
             score += 0.1
         
         # Boost frequently accessed facts
-        access_boost = min(self.fact_access_count[fact_index] * 0.05, 0.2)
+        access_boost = min(self.fact_access_count[fact_id] * 0.05, 0.2)
         score += access_boost
         
         # Context-based boosting
@@ -179,43 +206,42 @@ class ImmediateMemory:
         return score
     
     def _is_duplicate(self, new_fact: Fact) -> bool:
-        """Check if a fact is a duplicate"""
+        """Check if a fact is a duplicate of a stored one"""
         new_content_lower = new_fact.content.lower()
+        new_words = shingles(new_fact.content)
         
-        for existing_fact in self.facts:
-            existing_content_lower = existing_fact.content.lower()
+        # Only facts sharing a MinHash band can be similar enough to compare
+        for fact_id in self.duplicate_index.candidates(new_words):
+            existing_fact = self.facts_by_id[fact_id]
             
             # Exact match
-            if new_content_lower == existing_content_lower:
+            if new_content_lower == existing_fact.content.lower():
                 return True
             
-            # High similarity (simple check)
-            if self._similarity_score(new_content_lower, existing_content_lower) > 0.8:
+            # High word overlap
+            if jaccard(new_words, shingles(existing_fact.content)) > 0.8:
                 return True
         
         return False
     
-    def _similarity_score(self, text1: str, text2: str) -> float:
-        """Calculate simple similarity score between two texts"""
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
+    def _update_fact_index(self, fact: Fact, fact_id: int):
+        """Add a fact to the keyword and duplicate indexes"""
+        self.fact_index.add(fact_id, tokenize(fact.content))
+        self.duplicate_index.add(fact_id, shingles(fact.content))
     
-    def _update_fact_index(self, fact: Fact, fact_index: int):
-        """Update keyword index for fast fact lookup"""
-        words = fact.content.lower().split()
-        for word in words:
-            # Remove punctuation
-            word = ''.join(c for c in word if c.isalnum())
-            if len(word) > 2:  # Only index words longer than 2 characters
-                self.fact_index[word].add(fact_index)
+    def _rerank(self, query: str, scored_facts: List[tuple]) -> List[tuple]:
+        """Blend embedding similarity into the scores of the best keyword matches"""
+        missing = [(fact_id, fact) for _, fact_id, fact in scored_facts if fact_id not in self.fact_embeddings]
+        if missing:
+            embeddings = self.rerank_model.encode([fact.content for _, fact in missing], normalize_embeddings=True)
+            for (fact_id, _), embedding in zip(missing, embeddings):
+                self.fact_embeddings[fact_id] = embedding
+        
+        query_embedding = self.rerank_model.encode([query], normalize_embeddings=True)[0]
+        reranked = [(score + 0.5 * float(np.dot(query_embedding, self.fact_embeddings[fact_id])), fact_id, fact)
+                    for score, fact_id, fact in scored_facts]
+        reranked.sort(key=lambda x: x[0], reverse=True)
+        return reranked
     
     async def _archive_old_facts(self):
         """Archive old facts to make room for new ones"""
@@ -223,8 +249,8 @@ class ImmediateMemory:
             # Calculate archival scores for all facts
             archival_candidates = []
             
-            for i, fact in enumerate(self.facts):
-                archival_score = self._calculate_archival_score(fact, i)
+            for i, (fact_id, fact) in enumerate(zip(self.fact_ids, self.facts)):
+                archival_score = self._calculate_archival_score(fact, fact_id)
                 archival_candidates.append((archival_score, i, fact))
             
             # Sort by archival score (ascending - lower scores get archived first)
@@ -253,7 +279,7 @@ class ImmediateMemory:
         except Exception as e:
             self.logger.error(f"Error archiving facts: {e}")
     
-    def _calculate_archival_score(self, fact: Fact, fact_index: int) -> float:
+    def _calculate_archival_score(self, fact: Fact, fact_id: int) -> float:
         """Calculate score for archival decision (lower = more likely to archive)"""
         score = 0.0
         
@@ -265,11 +291,11 @@ class ImmediateMemory:
         score += fact.importance * 100
         
         # Access frequency factor
-        score += self.fact_access_count[fact_index] * 10
+        score += self.fact_access_count[fact_id] * 10
         
         # Recent access factor
-        if fact_index in self.last_access_time:
-            hours_since_access = (time.time() - self.last_access_time[fact_index]) / 3600
+        if fact_id in self.last_access_time:
+            hours_since_access = (time.time() - self.last_access_time[fact_id]) / 3600
             score -= hours_since_access * 0.05
         
         # Category factor (some categories more important)
@@ -288,19 +314,26 @@ class ImmediateMemory:
         return score
     
     def _remove_facts_by_indices(self, indices_to_remove: Set[int]):
-        """Remove facts by their indices and update all data structures"""
-        # Create mapping of old indices to new indices
-        index_mapping = {}
+        """Remove facts by their list positions and update all data structures"""
         new_facts = []
-        
-        for old_index, fact in enumerate(self.facts):
-            if old_index not in indices_to_remove:
-                new_index = len(new_facts)
-                index_mapping[old_index] = new_index
+        new_fact_ids = []
+        
+        for index, (fact_id, fact) in enumerate(zip(self.fact_ids, self.facts)):
+            if index in indices_to_remove:
+                # Drop from the indexes in place; remaining facts keep their ids
+                self.fact_index.remove(fact_id)
+                self.duplicate_index.remove(fact_id)
+                self.facts_by_id.pop(fact_id, None)
+                self.fact_embeddings.pop(fact_id, None)
+                self.fact_access_count.pop(fact_id, None)
+                self.last_access_time.pop(fact_id, None)
+            else:
                 new_facts.append(fact)
+                new_fact_ids.append(fact_id)
         
         # Update main facts list
         self.facts = new_facts
+        self.fact_ids = new_fact_ids
         
         # Rebuild category and source indices
         self.facts_by_category = defaultdict(list)
@@ -309,24 +342,6 @@ class ImmediateMemory:
         for fact in self.facts:
             self.facts_by_category[fact.category].append(fact)
             self.facts_by_source[fact.source].append(fact)
-        
-        # Rebuild keyword index
-        self.fact_index = defaultdict(set)
-        for new_index, fact in enumerate(self.facts):
-            self._update_fact_index(fact, new_index)
-        
-        # Update access tracking with new indices
-        new_access_count = defaultdict(int)
-        new_last_access = {}
-        
-        for old_index, new_index in index_mapping.items():
-            if old_index in self.fact_access_count:
-                new_access_count[new_index] = self.fact_access_count[old_index]
-            if old_index in self.last_access_time:
-                new_last_access[new_index] = self.last_access_time[old_index]
-        
-        self.fact_access_count = new_access_count
-        self.last_access_time = new_last_access
     
     def get_facts_by_category(self, category: str) -> List[Fact]:
         """Get all facts from a specific category"""
@@ -348,9 +363,13 @@ class ImmediateMemory:
     def clear_memory(self):
         """Clear all facts from memory"""
         self.facts = []
+        self.fact_ids = []
+        self.facts_by_id = {}
         self.facts_by_category = defaultdict(list)
         self.facts_by_source = defaultdict(list)
-        self.fact_index = defaultdict(set)
+        self.fact_index.clear()
+        self.duplicate_index.clear()
+        self.fact_embeddings = {}
         self.fact_access_count = defaultdict(int)
         self.last_access_time = {}
         self.logger.info("Cleared immediate memory")
@@ -371,7 +390,11 @@ class ImmediateMemory:
             'retrieval_count': self.retrieval_count,
             'archival_decisions': self.archival_decisions,
             'memory_utilization': len(self.facts) / self.max_facts,
-            'keyword_index_size': len(self.fact_index)
+            'keyword_index_size': len(self.fact_index),
+            'avg_retrieval_ms': (sum(self.retrieval_times) / len(self.retrieval_times)
+                                 if self.retrieval_times else 0),
+            'max_retrieval_ms': max(self.retrieval_times, default=0),
+            'reranking_enabled': self.rerank_model is not None
         }
     
     def export_facts(self) -> List[Dict[str, Any]]:
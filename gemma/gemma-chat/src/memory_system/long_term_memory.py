@@ -8,6 +8,7 @@ import json
 import numpy as np
 
 from .fact_distiller import Fact
+from ..inference_executor import get_inference_executor, PRIORITY_BACKGROUND, PRIORITY_PERCEPTION
 
 try:
     from pymilvus import connections, Collection, CollectionSchema, FieldSchema, DataType, utility
@@ -39,7 +40,13 @@ class LongTermMemory:
                  neo4j_uri: str = "bolt://localhost:7687",
                  neo4j_user: str = "neo4j",
                  neo4j_password: str = "password",
-                 embedding_model: str = "all-MiniLM-L6-v2"):
+                 embedding_model: str = "all-MiniLM-L6-v2",
+                 write_batch_size: int = 32,
+                 write_interval: float = 0.5,
+                 milvus_flush_interval: float = 10.0,
+                 search_cache_ttl: float = 30.0,
+                 search_cache_size: int = 64,
+                 search_cache_similarity: float = 0.98):
         
         self.milvus_host = milvus_host
         self.milvus_port = milvus_port
@@ -48,6 +55,21 @@ class LongTermMemory:
         self.neo4j_password = neo4j_password
         self.embedding_model_name = embedding_model
         
+        # Write-behind buffer: facts are embedded and stored in batches on a worker thread
+        self.write_batch_size = write_batch_size
+        self.write_interval = write_interval
+        self.milvus_flush_interval = milvus_flush_interval
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._last_milvus_flush = time.time()
+        self._milvus_dirty = False
+        
+        # Recent search results keyed by normalized query embedding; cleared whenever new facts are stored
+        self.search_cache_ttl = search_cache_ttl
+        self.search_cache_size = search_cache_size
+        self.search_cache_similarity = search_cache_similarity
+        self._search_cache: List[Tuple[np.ndarray, float, int, float, List[Fact]]] = []
+        
         self.logger = logging.getLogger(__name__)
         
         # Database connections
@@ -65,11 +87,23 @@ class LongTermMemory:
         self.embedding_times = []
         self.storage_times = []
         self.retrieval_times = []
+        self.batches_written = 0
+        self.failed_writes = 0
+        self.search_cache_hits = 0
+        self.search_cache_misses = 0
         
         # Initialize components
         self._initialize_embeddings()
         self._initialize_milvus()
         self._initialize_neo4j()
+        
+        # Embeddings run on the shared inference executor; queued requests are encoded together
+        self.inference = get_inference_executor()
+        self.inference.register_model("embedding", batch_fn=self._encode_batches,
+                                      priority=PRIORITY_BACKGROUND, max_queue=64, max_batch_size=16)
+        # Query embeddings are on the response path, so they do not wait behind archive batches
+        self.inference.register_model("query_embedding", batch_fn=self._encode_batches,
+                                      priority=PRIORITY_PERCEPTION, max_queue=8, max_batch_size=8)
     
     def _initialize_embeddings(self):
         """Initialize embedding model"""
@@ -192,48 +226,110 @@ class LongTermMemory:
         except Exception as e:
             self.logger.error(f"Error creating Neo4j schema: {e}")
     
+    def _fact_id(self, fact: Fact) -> str:
+        """Generate unique fact ID"""
+        return f"{fact.source}_{int(fact.timestamp)}_{hash(fact.content) % 10000}"
+    
+    def _ensure_writer(self):
+        """Start the batch writer task on first use"""
+        if self._writer_task is None or self._writer_task.done():
+            self._write_queue = self._write_queue or asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._writer_loop())
+    
     async def store_fact(self, fact: Fact) -> bool:
-        """Store a fact in long-term memory"""
+        """Queue a fact for long-term storage (written in the next batch)"""
+        try:
+            self._ensure_writer()
+            self._write_queue.put_nowait(fact)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error queueing fact: {e}")
+            return False
+    
+    async def _writer_loop(self):
+        """Collect queued facts into batches and write them off the event loop"""
+        while True:
+            fact = await self._write_queue.get()
+            batch = [fact]
+            
+            # Gather more facts until the batch is full or the write interval has passed
+            deadline = time.time() + self.write_interval
+            while len(batch) < self.write_batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                self.failed_writes += len(batch)
+                self.logger.error(f"Error writing batch of {len(batch)} facts: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    async def _write_batch(self, facts: List[Fact]):
+        """Embed and store a batch of facts without blocking the event loop"""
         start_time = time.time()
+        fact_ids = [self._fact_id(fact) for fact in facts]
+        
+        embeddings = await self.inference.submit("embedding", [fact.content for fact in facts])
         
+        # Database writes are I/O, run on the default thread pool
+        vector_success = await asyncio.to_thread(self._store_in_milvus, facts, fact_ids, embeddings)
+        graph_success = await asyncio.to_thread(self._store_in_neo4j, facts, fact_ids)
+        
+        if vector_success or graph_success:  # Success if at least one storage method works
+            self._search_cache.clear()
+            self.stored_facts += len(facts)
+            self.batches_written += 1
+            self.storage_times.append(time.time() - start_time)
+            if len(self.storage_times) > 100:
+                self.storage_times.pop(0)
+            self.logger.debug(f"Stored {len(facts)} facts in long-term memory")
+        else:
+            self.failed_writes += len(facts)
+    
+    async def flush(self):
+        """Wait until every queued fact has been written"""
+        if self._write_queue is not None and self._writer_task and not self._writer_task.done():
+            await self._write_queue.join()
+        if self._milvus_dirty:
+            await asyncio.to_thread(self._flush_milvus)
+    
+    async def _generate_embedding(self, text: str, model: str = "embedding") -> Optional[np.ndarray]:
+        """Generate embedding for text on the inference executor"""
         try:
-            # Generate unique fact ID
-            fact_id = f"{fact.source}_{int(fact.timestamp)}_{hash(fact.content) % 10000}"
-            
-            # Generate embedding
-            embedding = await self._generate_embedding(fact.content)
-            if embedding is None:
-                return False
-            
-            # Store in vector database
-            vector_success = await self._store_in_milvus(fact, fact_id, embedding)
-            
-            # Store in graph database
-            graph_success = await self._store_in_neo4j(fact, fact_id)
-            
-            if vector_success or graph_success:  # Success if at least one storage method works
-                self.stored_facts += 1
-                storage_time = time.time() - start_time
-                self.storage_times.append(storage_time)
-                
-                if len(self.storage_times) > 100:
-                    self.storage_times.pop(0)
-                
-                self.logger.debug(f"Stored fact in long-term memory: {fact.content[:50]}...")
-                return True
-            
+            return (await self.inference.submit(model, [text]))[0]
         except Exception as e:
-            self.logger.error(f"Error storing fact: {e}")
+            self.logger.error(f"Error generating embedding: {e}")
+            return None
+    
+    def _encode_batches(self, batches: List[List[str]]) -> List[np.ndarray]:
+        """Encode several embedding requests in one call and split the results (inference thread)"""
+        texts = [text for batch in batches for text in batch]
+        embeddings = self._generate_embeddings(texts)
+        if embeddings is None:
+            raise RuntimeError("Embedding generation failed")
         
-        return False
+        results = []
+        offset = 0
+        for batch in batches:
+            results.append(embeddings[offset:offset + len(batch)])
+            offset += len(batch)
+        return results
     
-    async def _generate_embedding(self, text: str) -> Optional[np.ndarray]:
-        """Generate embedding for text"""
+    def _generate_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Generate embeddings for a list of texts in one encode call"""
         start_time = time.time()
         
         try:
             if self.embedding_model:
-                embedding = self.embedding_model.encode([text])[0]
+                embeddings = self.embedding_model.encode(texts)
                 
                 embedding_time = time.time() - start_time
                 self.embedding_times.append(embedding_time)
@@ -241,37 +337,40 @@ class LongTermMemory:
                 if len(self.embedding_times) > 100:
                     self.embedding_times.pop(0)
                 
-                return embedding
+                return embeddings
             else:
-                # Mock embedding
-                return np.random.random(self.embedding_dim).astype(np.float32)
+                # Mock embeddings
+                return np.random.random((len(texts), self.embedding_dim)).astype(np.float32)
                 
         except Exception as e:
-            self.logger.error(f"Error generating embedding: {e}")
+            self.logger.error(f"Error generating embeddings: {e}")
             return None
     
-    async def _store_in_milvus(self, fact: Fact, fact_id: str, embedding: np.ndarray) -> bool:
-        """Store fact in Milvus vector database"""
+    def _store_in_milvus(self, facts: List[Fact], fact_ids: List[str], embeddings: np.ndarray) -> bool:
+        """Insert a batch of facts into Milvus (flushed periodically, not per insert)"""
         try:
             if not self.milvus_collection:
                 return False
             
-            # Prepare data
+            # Prepare column data
             data = [
-                [fact_id],
-                [fact.content],
-                [embedding.tolist()],
-                [fact.category],
-                [fact.importance],
-                [fact.confidence],
-                [fact.timestamp],
-                [fact.source],
-                [json.dumps({"related_facts": fact.related_facts})]
+                fact_ids,
+                [fact.content for fact in facts],
+                [embedding.tolist() for embedding in embeddings],
+                [fact.category for fact in facts],
+                [fact.importance for fact in facts],
+                [fact.confidence for fact in facts],
+                [fact.timestamp for fact in facts],
+                [fact.source for fact in facts],
+                [json.dumps({"related_facts": fact.related_facts}) for fact in facts]
             ]
             
             # Insert data
             mr = self.milvus_collection.insert(data)
-            self.milvus_collection.flush()
+            self._milvus_dirty = True
+            
+            if time.time() - self._last_milvus_flush >= self.milvus_flush_interval:
+                self._flush_milvus()
             
             return len(mr.primary_keys) > 0
             
@@ -279,53 +378,48 @@ class LongTermMemory:
             self.logger.error(f"Error storing in Milvus: {e}")
             return False
     
-    async def _store_in_neo4j(self, fact: Fact, fact_id: str) -> bool:
-        """Store fact in Neo4j graph database"""
+    def _flush_milvus(self):
+        """Seal inserted rows to storage"""
+        try:
+            if self.milvus_collection:
+                self.milvus_collection.flush()
+            self._milvus_dirty = False
+            self._last_milvus_flush = time.time()
+        except Exception as e:
+            self.logger.error(f"Error flushing Milvus: {e}")
+    
+    def _store_in_neo4j(self, facts: List[Fact], fact_ids: List[str]) -> bool:
+        """Store a batch of facts in Neo4j with a single UNWIND query"""
         try:
             if not self.neo4j_driver:
                 return False
             
+            rows = [{
+                "fact_id": fact_id,
+                "content": fact.content,
+                "category": fact.category,
+                "importance": fact.importance,
+                "confidence": fact.confidence,
+                "timestamp": fact.timestamp,
+                "source": fact.source
+            } for fact, fact_id in zip(facts, fact_ids)]
+            
             with self.neo4j_driver.session() as session:
-                # Create fact node
-                session.run("""
-                    MERGE (f:Fact {id: $fact_id})
-                    SET f.content = $content,
-                        f.category = $category,
-                        f.importance = $importance,
-                        f.confidence = $confidence,
-                        f.timestamp = $timestamp,
-                        f.source = $source
-                """, {
-                    "fact_id": fact_id,
-                    "content": fact.content,
-                    "category": fact.category,
-                    "importance": fact.importance,
-                    "confidence": fact.confidence,
-                    "timestamp": fact.timestamp,
-                    "source": fact.source
-                })
-                
-                # Create category node and relationship
+                # Create fact nodes with their category and source relationships
                 session.run("""
-                    MERGE (c:Category {name: $category})
-                    WITH c
-                    MATCH (f:Fact {id: $fact_id})
+                    UNWIND $facts AS row
+                    MERGE (f:Fact {id: row.fact_id})
+                    SET f.content = row.content,
+                        f.category = row.category,
+                        f.importance = row.importance,
+                        f.confidence = row.confidence,
+                        f.timestamp = row.timestamp,
+                        f.source = row.source
+                    MERGE (c:Category {name: row.category})
                     MERGE (f)-[:BELONGS_TO]->(c)
-                """, {
-                    "category": fact.category,
-                    "fact_id": fact_id
-                })
-                
-                # Create source node and relationship
-                session.run("""
-                    MERGE (s:Source {name: $source})
-                    WITH s
-                    MATCH (f:Fact {id: $fact_id})
+                    MERGE (s:Source {name: row.source})
                     MERGE (f)-[:ORIGINATED_FROM]->(s)
-                """, {
-                    "source": fact.source,
-                    "fact_id": fact_id
-                })
+                """, {"facts": rows})
             
             return True
             
@@ -342,12 +436,19 @@ class LongTermMemory:
         
         try:
             # Generate query embedding
-            query_embedding = await self._generate_embedding(query)
+            query_embedding = await self._generate_embedding(query, model="query_embedding")
             if query_embedding is None:
                 return []
             
-            # Search in Milvus
-            facts = await self._search_milvus(query_embedding, max_results, similarity_threshold)
+            cached = self._lookup_search_cache(query_embedding, max_results, similarity_threshold)
+            if cached is not None:
+                self.search_cache_hits += 1
+                return cached
+            self.search_cache_misses += 1
+            
+            # Search in Milvus (blocking client call, run on the default thread pool)
+            facts = await asyncio.to_thread(self._search_milvus, query_embedding, max_results, similarity_threshold)
+            self._store_search_cache(query_embedding, max_results, similarity_threshold, facts)
             
             # Update statistics
             self.retrieved_facts += len(facts)
@@ -365,7 +466,29 @@ class LongTermMemory:
             self.logger.error(f"Error searching facts: {e}")
             return []
     
-    async def _search_milvus(self, 
+    def _lookup_search_cache(self, query_embedding: np.ndarray, max_results: int,
+                             similarity_threshold: float) -> Optional[List[Fact]]:
+        """Cached result of a search with a near-identical query embedding, if still fresh"""
+        now = time.time()
+        self._search_cache = [entry for entry in self._search_cache if entry[1] > now]
+        
+        query = _normalize(query_embedding)
+        for embedding, _, cached_max, cached_threshold, facts in self._search_cache:
+            if (cached_max == max_results and cached_threshold == similarity_threshold and
+                    float(np.dot(embedding, query)) >= self.search_cache_similarity):
+                return list(facts)
+        return None
+    
+    def _store_search_cache(self, query_embedding: np.ndarray, max_results: int,
+                            similarity_threshold: float, facts: List[Fact]):
+        if self.search_cache_ttl <= 0:
+            return
+        self._search_cache.append((_normalize(query_embedding), time.time() + self.search_cache_ttl,
+                                   max_results, similarity_threshold, list(facts)))
+        if len(self._search_cache) > self.search_cache_size:
+            self._search_cache.pop(0)
+    
+    def _search_milvus(self, 
                            query_embedding: np.ndarray,
                            max_results: int,
                            similarity_threshold: float) -> List[Fact]:
@@ -457,14 +580,14 @@ class LongTermMemory:
             return []
     
     async def archive_facts(self, facts: List[Fact]) -> int:
-        """Archive multiple facts to long-term storage"""
+        """Queue multiple facts for long-term storage"""
         archived_count = 0
         
         for fact in facts:
             if await self.store_fact(fact):
                 archived_count += 1
         
-        self.logger.info(f"Archived {archived_count} facts to long-term memory")
+        self.logger.info(f"Queued {archived_count} facts for long-term memory")
         return archived_count
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -485,11 +608,26 @@ class LongTermMemory:
             'avg_embedding_time': avg_embedding_time,
             'avg_storage_time': avg_storage_time,
             'avg_retrieval_time': avg_retrieval_time,
+            'pending_writes': self._write_queue.qsize() if self._write_queue else 0,
+            'batches_written': self.batches_written,
+            'failed_writes': self.failed_writes,
+            'search_cache_hits': self.search_cache_hits,
+            'search_cache_misses': self.search_cache_misses,
+            'search_cache_size': len(self._search_cache),
             'embedding_dimension': self.embedding_dim
         }
     
     async def close(self):
-        """Close database connections"""
+        """Write pending facts, then close database connections"""
+        try:
+            await self.flush()
+        except Exception as e:
+            self.logger.error(f"Error flushing pending facts: {e}")
+        
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        
         try:
             if self.neo4j_driver:
                 self.neo4j_driver.close()
@@ -500,4 +638,9 @@ class LongTermMemory:
             self.logger.info("Closed long-term memory connections")
             
         except Exception as e:
-            self.logger.error(f"Error closing connections: {e}")
\ No newline at end of file
+            self.logger.error(f"Error closing connections: {e}")
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(embedding)
+    return embedding / norm if norm else embedding
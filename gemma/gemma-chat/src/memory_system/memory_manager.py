@@ -3,7 +3,8 @@
 import asyncio
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from collections import deque
+from typing import Dict, Any, List, Optional, Set
 
 from .fact_distiller import FactDistiller, Fact
 from .immediate_memory import ImmediateMemory
@@ -25,14 +26,19 @@ class MemoryManager:
         )
         self.immediate_memory = ImmediateMemory(
             max_facts=config.IMMEDIATE_MEMORY_SIZE,
-            relevance_threshold=0.3
+            relevance_threshold=0.3,
+            rerank_model=config.MEMORY_RERANK_MODEL or None
         )
         self.long_term_memory = LongTermMemory(
             milvus_host=config.MILVUS_HOST,
             milvus_port=config.MILVUS_PORT,
             neo4j_uri=config.NEO4J_URI,
             neo4j_user=config.NEO4J_USER,
-            neo4j_password=config.NEO4J_PASSWORD
+            neo4j_password=config.NEO4J_PASSWORD,
+            write_batch_size=config.LONG_TERM_WRITE_BATCH_SIZE,
+            write_interval=config.LONG_TERM_WRITE_INTERVAL,
+            milvus_flush_interval=config.MILVUS_FLUSH_INTERVAL,
+            search_cache_ttl=config.LONG_TERM_SEARCH_CACHE_TTL
         )
         
         # Event system
@@ -57,6 +63,11 @@ class MemoryManager:
         self.conversations_processed = 0
         self.facts_injected = 0
         self.processing_times = []
+        self.context_times = deque(maxlen=100)
+        self.context_timeouts = 0
+        
+        # Long-term searches that missed the context budget keep running to warm the search cache
+        self._late_searches: Set[asyncio.Task] = set()
         
         # Register event handlers
         self._register_event_handlers()
@@ -225,21 +236,54 @@ class MemoryManager:
     
     async def get_memory_context(self, 
                                query: str,
-                               context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Get memory context for model inference"""
+                               context: Optional[Dict[str, Any]] = None,
+                               budget_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Get memory context for model inference
+        
+        Immediate and long-term retrieval run concurrently.  Whatever has not
+        finished within budget_ms (MEMORY_CONTEXT_BUDGET_MS by default) is left
+        out of the context; a late long-term search still completes in the
+        background so its result is cached for the next query.
+        """
+        start_time = time.perf_counter()
+        budget_ms = self.config.MEMORY_CONTEXT_BUDGET_MS if budget_ms is None else budget_ms
+        timings: Dict[str, float] = {}
+        
         try:
-            # Get relevant facts from immediate memory
-            relevant_facts = await self.inject_relevant_facts(query, context)
+            immediate_task = asyncio.create_task(
+                self._timed(timings, 'immediate_ms', self.inject_relevant_facts(query, context)))
+            long_term_task = asyncio.create_task(
+                self._timed(timings, 'long_term_ms', self.long_term_memory.search_facts(query, max_results=5)))
             
-            # Search long-term memory for additional relevant facts
-            long_term_facts = await self.long_term_memory.search_facts(query, max_results=5)
-            
-            # Get recent facts
+            # Recent and important facts are in-memory scans, done while the retrievals run
             recent_facts = self.immediate_memory.get_recent_facts(hours=1.0)
-            
-            # Get important facts
             important_facts = self.immediate_memory.get_important_facts(min_importance=0.8)
             
+            remaining = budget_ms / 1000 - (time.perf_counter() - start_time)
+            done, _ = await asyncio.wait([immediate_task, long_term_task], timeout=max(0.0, remaining))
+            
+            timed_out = []
+            if immediate_task in done:
+                relevant_facts = immediate_task.result()
+            else:
+                immediate_task.cancel()
+                relevant_facts = []
+                timed_out.append('immediate')
+            if long_term_task in done:
+                long_term_facts = long_term_task.result()
+            else:
+                self._late_searches.add(long_term_task)
+                long_term_task.add_done_callback(self._late_searches.discard)
+                long_term_facts = []
+                timed_out.append('long_term')
+            
+            total_ms = (time.perf_counter() - start_time) * 1000
+            timings['total_ms'] = total_ms
+            self.context_times.append(total_ms)
+            if timed_out:
+                self.context_timeouts += 1
+                self.logger.debug(f"Memory context budget of {budget_ms:.0f}ms exceeded by: {', '.join(timed_out)}")
+            
             # Format facts for injection
             memory_context = {
                 'relevant_facts': [fact.content for fact in relevant_facts],
@@ -247,7 +291,9 @@ class MemoryManager:
                 'recent_facts': [fact.content for fact in recent_facts[-5:]],  # Last 5 recent facts
                 'important_facts': [fact.content for fact in important_facts[-3:]],  # Top 3 important facts
                 'fact_count': len(self.immediate_memory.facts),
-                'memory_utilization': len(self.immediate_memory.facts) / self.immediate_memory.max_facts
+                'memory_utilization': len(self.immediate_memory.facts) / self.immediate_memory.max_facts,
+                'memory_timings': dict(timings),
+                'memory_timed_out': timed_out
             }
             
             return memory_context
@@ -256,6 +302,15 @@ class MemoryManager:
             self.logger.error(f"Error getting memory context: {e}")
             return {}
     
+    @staticmethod
+    async def _timed(timings: Dict[str, float], name: str, coro):
+        """Await a retrieval stage, recording its duration in milliseconds"""
+        stage_start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            timings[name] = (time.perf_counter() - stage_start) * 1000
+    
     def format_facts_for_prompt(self, facts: List[Fact]) -> str:
         """Format facts for inclusion in model prompt"""
         if not facts:
@@ -325,6 +380,9 @@ class MemoryManager:
             'conversations_processed': self.conversations_processed,
             'facts_injected': self.facts_injected,
             'avg_processing_time': avg_processing_time,
+            'avg_context_ms': sum(self.context_times) / len(self.context_times) if self.context_times else 0,
+            'max_context_ms': max(self.context_times, default=0),
+            'context_timeouts': self.context_timeouts,
             'conversation_buffer_size': len(self.conversation_buffer),
             'immediate_memory': self.immediate_memory.get_statistics(),
             'long_term_memory': self.long_term_memory.get_statistics(),
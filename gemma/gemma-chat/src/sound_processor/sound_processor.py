@@ -11,7 +11,8 @@ from queue import Queue as ThreadQueue
 
 from .vad_detector import VADDetector
 from .wake_word_detector import WakeWordDetector
-from ..event_system import EventProducer, EventType, AudioEvent
+from ..event_system import EventProducer, EventType, AudioEvent, PayloadRing
+from ..inference_executor import get_inference_executor, PRIORITY_REALTIME
 from ..config import Config
 
 class SoundProcessor:
@@ -37,8 +38,16 @@ class SoundProcessor:
             sample_rate=self.sample_rate
         )
         
+        # Models run on the shared inference executor, ahead of background work
+        self.inference = get_inference_executor(config)
+        self.inference.register_model("vad", self.vad_detector.process_audio,
+                                      priority=PRIORITY_REALTIME, max_queue=4)
+        self.inference.register_model("wake_word", self.wake_word_detector.process_audio,
+                                      priority=PRIORITY_REALTIME, max_queue=4)
+        
         # Event system
         self.event_producer = EventProducer(config, "sound_processor")
+        self.audio_ring: Optional[PayloadRing] = None  # Speech segments, referenced by events
         
         # PyAudio
         self.audio = None
@@ -75,6 +84,12 @@ class SoundProcessor:
             self.logger.error("Failed to initialize audio")
             return False
         
+        self.audio_ring = PayloadRing.create(
+            f"{self.config.PAYLOAD_RING_PREFIX}_audio",
+            self.config.AUDIO_RING_SLOTS,
+            self.config.AUDIO_RING_SLOT_BYTES
+        )
+        
         self.running = True
         self.processing_active = True
         
@@ -113,6 +128,10 @@ class SoundProcessor:
         # Disconnect from event system
         await self.event_producer.disconnect()
         
+        if self.audio_ring:
+            self.audio_ring.close()
+            self.audio_ring = None
+        
         self.logger.info("Sound processor stopped")
     
     def _initialize_audio(self) -> bool:
@@ -208,7 +227,7 @@ class SoundProcessor:
         
         try:
             # VAD processing
-            is_speech, vad_confidence = self.vad_detector.process_audio(audio_chunk)
+            is_speech, vad_confidence = await self.inference.submit("vad", audio_chunk)
             vad_event = self.vad_detector.update_speech_state(is_speech, vad_confidence)
             
             # Update VAD buffer
@@ -221,7 +240,7 @@ class SoundProcessor:
             
             if is_speech:
                 wake_word_detected, wake_word_text, wake_word_confidence = \
-                    self.wake_word_detector.process_audio(audio_chunk)
+                    await self.inference.submit("wake_word", audio_chunk)
             
             # Send events
             await self._send_audio_events(
@@ -255,7 +274,7 @@ class SoundProcessor:
             # Uncomment if you want to send raw audio data
             # audio_event = AudioEvent(
             #     event_type=EventType.AUDIO_FRAME,
-            #     audio_data=audio_chunk.tobytes(),
+            #     audio_ref=self.audio_ring.put(audio_chunk),
             #     confidence=vad_confidence
             # )
             # await self.event_producer.send_event(audio_event)
@@ -276,7 +295,7 @@ class SoundProcessor:
                 if speech_audio is not None:
                     speech_event = AudioEvent(
                         event_type=EventType.SPEECH_DETECTED,
-                        audio_data=speech_audio.tobytes(),
+                        audio_ref=self.audio_ring.put(speech_audio),
                         confidence=vad_confidence
                     )
                     await self.event_producer.send_event(speech_event)
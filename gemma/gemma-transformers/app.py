@@ -13,6 +13,7 @@ from PIL import Image
 import uvicorn
 
 from model_handler import ModelHandler
+from batch_scheduler import BatchScheduler
 
 
 class Message(BaseModel):
@@ -48,16 +49,28 @@ class ModelInfo(BaseModel):
 
 
 model_handler: Optional[ModelHandler] = None
+# Shares the model between concurrent requests when BATCH_SCHEDULER=1; off by default until checked on gemma3n
+scheduler: Optional[BatchScheduler] = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global model_handler
+    global model_handler, scheduler
     model_handler = ModelHandler()
+    if os.getenv("BATCH_SCHEDULER", "0") != "0":
+        scheduler = BatchScheduler.from_env(model_handler)
+        scheduler.start()
     yield
+    if scheduler is not None:
+        scheduler.stop()
     del model_handler
 
 
+def get_backend() -> Union[BatchScheduler, ModelHandler]:
+    """Scheduler when batching is enabled, otherwise the model handler itself."""
+    return scheduler if scheduler is not None else model_handler
+
+
 app = FastAPI(title="Gemma3n API Server", lifespan=lifespan)
 
 
@@ -98,7 +111,7 @@ async def generate_stream_response(
     """Generate streaming response in OpenAI format."""
     
     # Stream the generated tokens
-    async for token in model_handler.generate_stream(prompt, image, generation_params):
+    async for token in get_backend().generate_stream(prompt, image, generation_params):
         chunk = {
             "id": request_id,
             "object": "chat.completion.chunk",
@@ -154,7 +167,7 @@ async def chat_completions(request: ChatCompletionRequest):
         )
     else:
         # Non-streaming response
-        response_text = await model_handler.generate(prompt, image, generation_params)
+        response_text = await get_backend().generate(prompt, image, generation_params)
         
         response = ChatCompletionResponse(
             id=request_id,
@@ -198,7 +211,8 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "model_loaded": model_handler is not None
+        "model_loaded": model_handler is not None,
+        "scheduler": scheduler.get_stats() if scheduler is not None else None
     }
 
 
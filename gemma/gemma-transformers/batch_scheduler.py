@@ -0,0 +1,416 @@
+"""
+Batching scheduler that lets concurrent requests share one loaded model.
+
+Requests are queued and grouped into cohorts by prompt length (text prompts
+in the same length bucket are left-padded into one batch; image prompts run
+as cohorts of one). A scheduler thread admits a new cohort at every
+iteration while fewer than BATCH_MAX_COHORTS are active and interleaves
+decode steps across the active cohorts, so a request that arrives while a
+long generation is running starts streaming after one prefill instead of
+waiting for the running batch to finish. Finished and cancelled sequences
+are dropped from their cohort's KV cache at the next step.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional
+
+import torch
+from PIL import Image
+from transformers import DynamicCache
+
+from model_handler import ModelHandler
+
+
+@dataclass
+class _Request:
+    prompt: str
+    image: Optional[Image.Image]
+    max_new_tokens: int
+    temperature: float
+    top_p: float
+    loop: asyncio.AbstractEventLoop
+    output: asyncio.Queue
+    bucket: tuple = ()
+    inputs: Optional[Dict[str, torch.Tensor]] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    started_at: Optional[float] = None
+    first_token_at: Optional[float] = None
+    generated: List[int] = field(default_factory=list)
+    emitted_text: str = ""
+    cancelled: bool = False
+    finished: bool = False
+
+
+@dataclass
+class _Cohort:
+    requests: List[_Request]
+    cache: Any
+    attention_mask: torch.Tensor
+    positions: torch.Tensor    # Position id of each row's next token
+    next_tokens: torch.Tensor
+    cache_len: int
+
+
+class BatchScheduler:
+    def __init__(
+        self,
+        handler: ModelHandler,
+        max_batch_size: int = 8,
+        max_cohorts: int = 2,
+        bucket_width: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        self.handler = handler
+        self.model = handler.model
+        self.tokenizer = handler.tokenizer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_cohorts = max(1, max_cohorts)
+        self.bucket_width = max(1, bucket_width)
+        self.max_wait = max_wait_ms / 1000
+        
+        self.pad_token_id = self.tokenizer.pad_token_id
+        if self.pad_token_id is None:
+            self.pad_token_id = self.tokenizer.eos_token_id
+        eos = self.model.generation_config.eos_token_id
+        self.eos_token_ids = set(eos if isinstance(eos, list) else [eos] if eos is not None else [])
+        if self.tokenizer.eos_token_id is not None:
+            self.eos_token_ids.add(self.tokenizer.eos_token_id)
+        
+        self._waiting: Deque[_Request] = deque()
+        self._cohorts: List[_Cohort] = []
+        self._next_cohort = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        
+        # Statistics
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.tokens_generated = 0
+        self.cohorts_formed = 0
+        self.cohort_rows = 0
+        self.decode_steps = 0
+        self.queue_times: Deque[float] = deque(maxlen=200)
+        self.first_token_times: Deque[float] = deque(maxlen=200)
+    
+    @classmethod
+    def from_env(cls, handler: ModelHandler) -> "BatchScheduler":
+        return cls(
+            handler,
+            max_batch_size=int(os.getenv("BATCH_MAX_SIZE", "8")),
+            max_cohorts=int(os.getenv("BATCH_MAX_COHORTS", "2")),
+            bucket_width=int(os.getenv("BATCH_BUCKET_WIDTH", "64")),
+            max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
+        )
+    
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+        self._thread.start()
+        print(f"Batch scheduler started (batch size {self.max_batch_size}, {self.max_cohorts} cohorts, "
+              f"bucket width {self.bucket_width} tokens)")
+    
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        image: Optional[Image.Image] = None,
+        generation_params: Optional[Dict] = None
+    ) -> AsyncGenerator[str, None]:
+        """Queue a request and yield its text as tokens are generated.
+        
+        Closing the generator (e.g. the client disconnected) cancels the request.
+        """
+        request = await self._submit(prompt, image, generation_params or {})
+        try:
+            while True:
+                item = await request.output.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            request.cancelled = True
+    
+    async def generate(
+        self,
+        prompt: str,
+        image: Optional[Image.Image] = None,
+        generation_params: Optional[Dict] = None
+    ) -> str:
+        """Queue a request and return the complete response."""
+        parts = []
+        async for text in self.generate_stream(prompt, image, generation_params):
+            parts.append(text)
+        return "".join(parts)
+    
+    async def _submit(self, prompt: str, image: Optional[Image.Image], generation_params: Dict) -> _Request:
+        if not self._running:
+            raise RuntimeError("Batch scheduler is not running")
+        
+        def param(name, default):
+            value = generation_params.get(name)
+            return default if value is None else value
+        
+        request = _Request(
+            prompt=prompt,
+            image=image,
+            max_new_tokens=param("max_new_tokens", 100),
+            temperature=param("temperature", 0.7),
+            top_p=param("top_p", 1.0),
+            loop=asyncio.get_running_loop(),
+            output=asyncio.Queue()
+        )
+        # Tokenizing (and image preprocessing) stays off the event loop
+        request.inputs = await asyncio.to_thread(self.handler.prepare_input, prompt, image)
+        input_len = request.inputs["input_ids"].shape[-1]
+        # Image prompts are never padded together; text prompts share a batch within a length bucket
+        request.bucket = ("image", id(request)) if image is not None else ("text", input_len // self.bucket_width)
+        
+        with self._condition:
+            self._waiting.append(request)
+            self._condition.notify()
+        return request
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._waiting and not self._cohorts:
+                    self._condition.wait()
+                if not self._running:
+                    break
+                batch = self._take_batch() if len(self._cohorts) < self.max_cohorts else None
+            
+            try:
+                if batch:
+                    self._prefill(batch)
+                elif self._cohorts:
+                    self._next_cohort %= len(self._cohorts)
+                    cohort = self._cohorts[self._next_cohort]
+                    if self._decode_step(cohort):
+                        self._next_cohort += 1
+                    else:
+                        self._cohorts.remove(cohort)
+            except Exception as e:
+                print(f"Batch scheduler error: {e}")
+                failed = batch if batch else self._cohorts.pop(self._next_cohort).requests
+                for request in failed:
+                    if not request.finished:
+                        self.failed += 1
+                        self._finish(request, e)
+        
+        # Shutting down: fail whatever is still queued or running
+        error = RuntimeError("Batch scheduler stopped")
+        for request in list(self._waiting) + [r for c in self._cohorts for r in c.requests]:
+            if not request.finished:
+                self._finish(request, error)
+        self._waiting.clear()
+        self._cohorts.clear()
+    
+    def _take_batch(self) -> Optional[List[_Request]]:
+        """Oldest waiting request plus others from its length bucket (caller holds the lock)"""
+        while self._waiting and self._waiting[0].cancelled:
+            self.cancelled += 1
+            self._finish(self._waiting.popleft())
+        if not self._waiting:
+            return None
+        
+        oldest = self._waiting[0]
+        batch = [r for r in self._waiting if r.bucket == oldest.bucket and not r.cancelled][:self.max_batch_size]
+        
+        # When idle, give a partial batch a few milliseconds to fill up
+        wait = oldest.enqueued_at + self.max_wait - time.perf_counter()
+        if len(batch) < self.max_batch_size and not self._cohorts and wait > 0 and oldest.image is None:
+            self._condition.wait(wait)
+            batch = [r for r in self._waiting if r.bucket == oldest.bucket and not r.cancelled][:self.max_batch_size]
+        
+        for request in batch:
+            self._waiting.remove(request)
+        return batch
+    
+    def _prefill(self, requests: List[_Request]):
+        """Run the prompts of a new cohort and emit each row's first token"""
+        now = time.perf_counter()
+        for request in requests:
+            request.started_at = now
+            self.queue_times.append((now - request.enqueued_at) * 1000)
+        
+        inputs = self._pad_inputs([request.inputs for request in requests])
+        attention_mask = inputs["attention_mask"]
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+        
+        with torch.inference_mode():
+            outputs = self.model(**inputs, position_ids=position_ids, use_cache=True, return_dict=True)
+        
+        cache = outputs.past_key_values
+        if isinstance(cache, tuple):
+            cache = DynamicCache.from_legacy_cache(cache)
+        
+        cohort = _Cohort(
+            requests=requests,
+            cache=cache,
+            attention_mask=attention_mask,
+            positions=position_ids[:, -1] + 1,
+            next_tokens=torch.empty(0),
+            cache_len=attention_mask.shape[-1]
+        )
+        self.cohorts_formed += 1
+        self.cohort_rows += len(requests)
+        
+        if self._advance(cohort, outputs.logits[:, -1, :]):
+            self._cohorts.append(cohort)
+    
+    def _decode_step(self, cohort: _Cohort) -> bool:
+        """Generate the next token for every row of a cohort; False once all rows are done"""
+        device = self.model.device
+        cohort.attention_mask = torch.cat(
+            [cohort.attention_mask, cohort.attention_mask.new_ones((cohort.attention_mask.shape[0], 1))], dim=-1
+        )
+        
+        with torch.inference_mode():
+            outputs = self.model(
+                input_ids=cohort.next_tokens.unsqueeze(-1),
+                attention_mask=cohort.attention_mask,
+                position_ids=cohort.positions.unsqueeze(-1),
+                past_key_values=cohort.cache,
+                cache_position=torch.tensor([cohort.cache_len], device=device),
+                use_cache=True,
+                return_dict=True
+            )
+        
+        cohort.cache = outputs.past_key_values
+        cohort.cache_len += 1
+        cohort.positions = cohort.positions + 1
+        self.decode_steps += 1
+        return self._advance(cohort, outputs.logits[:, -1, :])
+    
+    def _advance(self, cohort: _Cohort, logits: torch.Tensor) -> bool:
+        """Sample one token per row, stream it, and drop finished rows from the cohort"""
+        tokens = self._sample(logits, cohort.requests)
+        now = time.perf_counter()
+        
+        for request, token in zip(cohort.requests, tokens.tolist()):
+            if request.finished:
+                continue  # Row kept only because the cache cannot drop it
+            if request.cancelled:
+                self.cancelled += 1
+                self._finish(request)
+                continue
+            
+            if request.first_token_at is None:
+                request.first_token_at = now
+                self.first_token_times.append((now - request.enqueued_at) * 1000)
+            
+            if token in self.eos_token_ids:
+                self.completed += 1
+                self._emit_text(request, final=True)
+                self._finish(request)
+                continue
+            
+            request.generated.append(token)
+            self.tokens_generated += 1
+            done = len(request.generated) >= request.max_new_tokens
+            self._emit_text(request, final=done)
+            
+            if done:
+                self.completed += 1
+                self._finish(request)
+        
+        cohort.next_tokens = tokens
+        keep = [i for i, request in enumerate(cohort.requests) if not request.finished]
+        if not keep:
+            return False
+        if len(keep) < len(cohort.requests) and hasattr(cohort.cache, "batch_select_indices"):
+            index = torch.tensor(keep, device=tokens.device)
+            cohort.cache.batch_select_indices(index)
+            cohort.requests = [cohort.requests[i] for i in keep]
+            cohort.attention_mask = cohort.attention_mask[index]
+            cohort.positions = cohort.positions[index]
+            cohort.next_tokens = tokens[index]
+        return True
+    
+    def _sample(self, logits: torch.Tensor, requests: List[_Request]) -> torch.Tensor:
+        """Greedy or temperature/top-p sampling with each request's own parameters"""
+        tokens = torch.argmax(logits, dim=-1)
+        for i, request in enumerate(requests):
+            if request.temperature <= 0 or request.finished:
+                continue
+            probs = torch.softmax(logits[i].float() / request.temperature, dim=-1)
+            if request.top_p < 1.0:
+                sorted_probs, sorted_ids = torch.sort(probs, descending=True)
+                outside = sorted_probs.cumsum(-1) - sorted_probs > request.top_p
+                sorted_probs[outside] = 0
+                probs = torch.zeros_like(probs).scatter_(0, sorted_ids, sorted_probs)
+            tokens[i] = torch.multinomial(probs, num_samples=1)[0]
+        return tokens
+    
+    def _pad_inputs(self, inputs: List[Dict[str, torch.Tensor]]) -> Dict[str, torch.Tensor]:
+        """Left-pad tokenized prompts into one batch"""
+        if len(inputs) == 1:
+            return dict(inputs[0])
+        
+        max_len = max(item["input_ids"].shape[-1] for item in inputs)
+        batch = {}
+        for key in inputs[0].keys():
+            rows = []
+            for item in inputs:
+                value = item[key]
+                pad = max_len - value.shape[-1]
+                if pad:
+                    fill = self.pad_token_id if key == "input_ids" else 0
+                    value = torch.cat([value.new_full((value.shape[0], pad), fill), value], dim=-1)
+                rows.append(value)
+            batch[key] = torch.cat(rows, dim=0)
+        return batch
+    
+    def _emit_text(self, request: _Request, final: bool = False):
+        """Send the newly decoded text, holding back incomplete multi-byte characters until the end"""
+        text = self.tokenizer.decode(request.generated, skip_special_tokens=True)
+        if text.endswith("�") and not final:
+            return
+        delta = text[len(request.emitted_text):]
+        request.emitted_text = text
+        if delta:
+            self._deliver(request, delta)
+    
+    def _finish(self, request: _Request, error: Optional[Exception] = None):
+        request.finished = True
+        self._deliver(request, error)
+    
+    def _deliver(self, request: _Request, item: Any):
+        try:
+            request.loop.call_soon_threadsafe(request.output.put_nowait, item)
+        except RuntimeError:
+            pass  # The client's event loop has closed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        queue_times = list(self.queue_times)
+        first_token_times = sorted(self.first_token_times)
+        return {
+            "waiting": len(self._waiting),
+            "active_cohorts": len(self._cohorts),
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "tokens_generated": self.tokens_generated,
+            "cohorts_formed": self.cohorts_formed,
+            "avg_cohort_size": self.cohort_rows / self.cohorts_formed if self.cohorts_formed else 0,
+            "decode_steps": self.decode_steps,
+            "avg_queue_ms": sum(queue_times) / len(queue_times) if queue_times else 0,
+            "p50_first_token_ms": first_token_times[len(first_token_times) // 2] if first_token_times else 0,
+            "max_first_token_ms": first_token_times[-1] if first_token_times else 0,
+        }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Throughput/latency benchmark for the batch scheduler.
+
+Sends the same set of concurrent requests through the scheduler twice: once
+with batching disabled (batch size 1, one cohort, i.e. requests serialize as
+they did before) and once with the configured batching, then reports
+throughput, time to first token and end-to-end latency for both. With greedy
+decoding (the default) it also checks both runs produce the same text as
+ModelHandler.generate (plain model.generate, one request at a time).
+
+Runs on CPU with a tiny model by default:
+
+    python benchmark_batching.py
+    python benchmark_batching.py --requests 32 --max-tokens 64 --batch-size 8
+
+Use --model/--loader (or MODEL_NAME/MODEL_LOADER) to benchmark the real model.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the batch scheduler")
+    parser.add_argument("--model", default=os.getenv("MODEL_NAME", "sshleifer/tiny-gpt2"))
+    parser.add_argument("--loader", default=os.getenv("MODEL_LOADER", "causal_lm"), choices=["causal_lm", "gemma3n"])
+    parser.add_argument("--requests", type=int, default=16, help="Number of concurrent requests")
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument("--temperature", type=float, default=0.0)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--cohorts", type=int, default=2)
+    parser.add_argument("--bucket-width", type=int, default=64)
+    return parser.parse_args()
+
+
+def make_prompts(count: int):
+    random.seed(0)
+    words = "the camera sees a person holding a red cup near the kitchen window while music plays".split()
+    return [" ".join(random.choice(words) for _ in range(random.randint(4, 40))) for _ in range(count)]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def run_requests(scheduler, prompts, params):
+    async def one(prompt):
+        start = time.perf_counter()
+        first_token = None
+        parts = []
+        async for text in scheduler.generate_stream(prompt, None, params):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            parts.append(text)
+        return "".join(parts), first_token or 0.0, time.perf_counter() - start
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(prompt) for prompt in prompts))
+    return results, time.perf_counter() - start
+
+
+def benchmark(handler, prompts, params, **scheduler_args):
+    from batch_scheduler import BatchScheduler
+    
+    scheduler = BatchScheduler(handler, **scheduler_args)
+    scheduler.start()
+    try:
+        results, elapsed = asyncio.run(run_requests(scheduler, prompts, params))
+    finally:
+        scheduler.stop()
+    
+    stats = scheduler.get_stats()
+    first_tokens = [r[1] * 1000 for r in results]
+    latencies = [r[2] * 1000 for r in results]
+    print(f"  tokens generated:   {stats['tokens_generated']}")
+    print(f"  wall time:          {elapsed:.2f}s")
+    print(f"  throughput:         {stats['tokens_generated'] / elapsed:.1f} tokens/s, {len(prompts) / elapsed:.2f} requests/s")
+    print(f"  first token:        p50 {percentile(first_tokens, 0.5):.0f}ms, p95 {percentile(first_tokens, 0.95):.0f}ms")
+    print(f"  latency:            p50 {percentile(latencies, 0.5):.0f}ms, p95 {percentile(latencies, 0.95):.0f}ms")
+    print(f"  cohorts formed:     {stats['cohorts_formed']} (avg size {stats['avg_cohort_size']:.1f})")
+    return [r[0] for r in results], elapsed
+
+
+def main():
+    args = parse_args()
+    os.environ["MODEL_NAME"] = args.model
+    os.environ["MODEL_LOADER"] = args.loader
+    
+    from model_handler import ModelHandler
+    handler = ModelHandler()
+    
+    prompts = make_prompts(args.requests)
+    params = {"max_new_tokens": args.max_tokens, "temperature": args.temperature, "top_p": 1.0}
+    
+    print(f"\nSerial (batch size 1): {args.requests} requests, {args.max_tokens} new tokens each")
+    serial_texts, serial_time = benchmark(handler, prompts, params, max_batch_size=1, max_cohorts=1)
+    
+    print(f"\nBatched (batch size {args.batch_size}, {args.cohorts} cohorts, bucket width {args.bucket_width})")
+    batched_texts, batched_time = benchmark(
+        handler, prompts, params,
+        max_batch_size=args.batch_size, max_cohorts=args.cohorts, bucket_width=args.bucket_width
+    )
+    
+    print(f"\nSpeedup: {serial_time / batched_time:.2f}x")
+    if args.temperature == 0:
+        reference = [asyncio.run(handler.generate(prompt, None, params)) for prompt in prompts]
+        success = True
+        for name, texts in (("serial", serial_texts), ("batched", batched_texts)):
+            mismatches = sum(a != b for a, b in zip(reference, texts))
+            if mismatches:
+                print(f"✗ {mismatches}/{len(prompts)} greedy outputs of the {name} run differ from ModelHandler.generate")
+                success = False
+        if not success:
+            return False
+        print("✓ Greedy outputs of both runs match ModelHandler.generate")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -3,7 +3,7 @@ import sys
 import torch
 from typing import Optional, Dict, AsyncGenerator
 from PIL import Image
-from transformers import AutoProcessor, Gemma3nForConditionalGeneration
+from transformers import AutoModelForCausalLM, AutoProcessor, AutoTokenizer, Gemma3nForConditionalGeneration
 from huggingface_hub import login
 import asyncio
 
@@ -11,6 +11,8 @@ import asyncio
 class ModelHandler:
     def __init__(self):
         self.model_id = os.getenv("MODEL_NAME", "google/gemma-3n-e4b")
+        # "gemma3n" (multimodal) or "causal_lm" (any text-only model, e.g. a tiny model for CPU tests)
+        self.model_loader = os.getenv("MODEL_LOADER", "gemma3n")
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
         # Check for HF token if needed
@@ -38,7 +40,8 @@ class ModelHandler:
             
             # Then load the model
             print("Loading model weights...")
-            self.model = Gemma3nForConditionalGeneration.from_pretrained(
+            model_class = AutoModelForCausalLM if self.model_loader == "causal_lm" else Gemma3nForConditionalGeneration
+            self.model = model_class.from_pretrained(
                 self.model_id,
                 device_map=self.device,
                 torch_dtype=dtype,
@@ -46,17 +49,21 @@ class ModelHandler:
                 cache_dir=self.cache_dir,
                 attn_implementation="eager"  # Use eager attention on Jetson
             ).eval()
-
+            
             # First try to load the processor
             print("Loading processor...")
-            self.processor = AutoProcessor.from_pretrained(self.model_id, cache_dir=self.cache_dir)
+            if self.model_loader == "causal_lm":
+                self.processor = AutoTokenizer.from_pretrained(self.model_id, cache_dir=self.cache_dir)
+            else:
+                self.processor = AutoProcessor.from_pretrained(self.model_id, cache_dir=self.cache_dir)
+            self.tokenizer = getattr(self.processor, "tokenizer", self.processor)
             
             print(f"✓ Model loaded successfully on {self.device}")
             
             # Print model info
             total_params = sum(p.numel() for p in self.model.parameters())
             print(f"Model parameters: {total_params:,}")
-            
+        
         except Exception as e:
             print(f"✗ Failed to load model: {e}")
             print("\nTroubleshooting:")
@@ -69,6 +76,9 @@ class ModelHandler:
     def prepare_input(self, prompt: str, image: Optional[Image.Image] = None) -> Dict:
         """Prepare input for the model."""
         if image is not None:
+            if self.model_loader == "causal_lm":
+                raise ValueError(f"{self.model_id} is loaded as a text-only model")
+            
             # Multimodal input with image
             # Use the special image token as shown in the example
             full_prompt = f"<image_soft_token> {prompt}"
@@ -187,7 +197,7 @@ class ModelHandler:
                 token_text = self.processor.decode(next_token, skip_special_tokens=True)
                 
                 # Check for end of sequence
-                if next_token.item() == self.processor.tokenizer.eos_token_id:
+                if next_token.item() == self.tokenizer.eos_token_id:
                     break
                 
                 if token_text:
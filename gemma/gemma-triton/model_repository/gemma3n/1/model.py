@@ -1,7 +1,7 @@
 import triton_python_backend_utils as pb_utils
 import numpy as np
 import torch
-from transformers import AutoTokenizer, Gemma3nForConditionalGeneration, AutoProcessor, TextIteratorStreamer
+from transformers import AutoTokenizer, AutoModelForCausalLM, Gemma3nForConditionalGeneration, AutoProcessor, TextIteratorStreamer, StoppingCriteria, StoppingCriteriaList
 import json
 import base64
 from PIL import Image
@@ -14,6 +14,19 @@ import asyncio
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class CancelledCriteria(StoppingCriteria):
+    """Stops generation once Triton marks the request cancelled (client disconnected)"""
+    
+    def __init__(self, response_sender):
+        # is_cancelled() is only available in newer Python backends
+        self.is_cancelled = getattr(response_sender, "is_cancelled", None)
+    
+    def cancelled(self):
+        return bool(self.is_cancelled and self.is_cancelled())
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.cancelled(), dtype=torch.bool, device=input_ids.device)
+
 class TritonPythonModel:
     def initialize(self, args):
         self.model_config = json.loads(args['model_config'])
@@ -22,8 +35,10 @@ class TritonPythonModel:
         self.model_repository = args['model_repository']
         self.model_version = args['model_version']
         
-        # Model name - can be overridden by environment variable
-        self.model_name = os.environ.get('MODEL_NAME', 'google/gemma-3n-e4b')
+        # Model name - set by a config parameter (e.g. configs/cpu_tiny.pbtxt) or the environment
+        self.model_name = self._get_parameter('MODEL_NAME', 'google/gemma-3n-e4b')
+        # "gemma3n" (multimodal) or "causal_lm" (text-only, e.g. a tiny model for CPU load tests)
+        self.model_loader = self._get_parameter('MODEL_LOADER', 'gemma3n')
         
         # Initialize device
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -31,12 +46,21 @@ class TritonPythonModel:
         
         # Load tokenizer and processor
         logger.info(f"Loading processor and tokenizer for {self.model_name}")
-        self.processor = AutoProcessor.from_pretrained(self.model_name)
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        if self.model_loader == "causal_lm":
+            self.processor = None
+        else:
+            self.processor = AutoProcessor.from_pretrained(self.model_name)
+        
+        # Batched prompts are left-padded so generation continues from the end of every row
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
         
         # Load model
         logger.info(f"Loading model {self.model_name}")
-        self.model = Gemma3nForConditionalGeneration.from_pretrained(
+        model_class = AutoModelForCausalLM if self.model_loader == "causal_lm" else Gemma3nForConditionalGeneration
+        self.model = model_class.from_pretrained(
             self.model_name,
             torch_dtype=torch.bfloat16 if torch.cuda.is_available() else torch.float32,
             device_map="auto",
@@ -54,168 +78,225 @@ class TritonPythonModel:
             model_config=self.model_config
         )
         
-        logger.info(f"Model initialization complete. Decoupled mode: {self.decoupled}")
+        # Batch statistics
+        self.generate_calls = 0
+        self.batched_requests = 0
+        
+        logger.info(f"Model initialization complete. Decoupled mode: {self.decoupled}, "
+                    f"max batch size: {self.model_config.get('max_batch_size', 0)}")
+    
+    def _get_parameter(self, key, default):
+        """Model config parameter, falling back to the environment"""
+        value = self.model_config.get('parameters', {}).get(key, {}).get('string_value')
+        return value or os.environ.get(key, default)
     
     def execute(self, requests):
-        responses = []
+        # Responses in request order (non-decoupled mode only)
+        responses = [None] * len(requests)
         
-        for request in requests:
+        # Non-streaming text requests with the same generation parameters share one
+        # left-padded generate() call; streaming and image requests run on their own
+        groups = {}
+        for index, request in enumerate(requests):
             # For decoupled mode, we need the response sender
-            if self.decoupled:
-                response_sender = request.get_response_sender()
+            response_sender = request.get_response_sender() if self.decoupled else None
+            try:
+                item = self._parse_request(request)
+            except Exception as e:
+                logger.error(f"Error parsing request: {e}")
+                item = {'index': index, 'response_sender': response_sender}
+                self._send_text(item, f"Error: {str(e)}", responses)
+                continue
+            item['index'] = index
+            item['response_sender'] = response_sender
             
-            # Get inputs
-            prompt = pb_utils.get_input_tensor_by_name(request, "prompt")
-            prompt_str = prompt.as_numpy()[0].decode('utf-8')
+            if item['stream'] and self.decoupled:
+                key = ('stream', index)
+            elif item['images']:
+                key = ('image', index)
+            else:
+                key = ('text', item['max_tokens'], item['temperature'], item['top_p'])
+            groups.setdefault(key, []).append(item)
+        
+        for key, items in groups.items():
+            if key[0] == 'stream':
+                self._generate_stream(items[0])
+            else:
+                self._generate_batch(items, responses)
+        
+        # Decoupled models send everything through the response senders and must return None
+        return None if self.decoupled else responses
+    
+    def _parse_request(self, request):
+        """Read a request's inputs (with or without the batch dimension)"""
+        # Get inputs
+        prompt = pb_utils.get_input_tensor_by_name(request, "prompt")
+        prompt_str = prompt.as_numpy().reshape(-1)[0].decode('utf-8')
+        
+        # Optional inputs
+        images_tensor = pb_utils.get_input_tensor_by_name(request, "images")
+        max_tokens_tensor = pb_utils.get_input_tensor_by_name(request, "max_tokens")
+        temperature_tensor = pb_utils.get_input_tensor_by_name(request, "temperature")
+        top_p_tensor = pb_utils.get_input_tensor_by_name(request, "top_p")
+        stream_tensor = pb_utils.get_input_tensor_by_name(request, "stream")
+        
+        # Parse optional parameters
+        max_tokens = int(max_tokens_tensor.as_numpy().reshape(-1)[0]) if max_tokens_tensor else self.default_max_tokens
+        temperature = float(temperature_tensor.as_numpy().reshape(-1)[0]) if temperature_tensor else self.default_temperature
+        top_p = float(top_p_tensor.as_numpy().reshape(-1)[0]) if top_p_tensor else self.default_top_p
+        stream = bool(stream_tensor.as_numpy().reshape(-1)[0]) if stream_tensor else False
+        
+        # Process images if provided
+        images = None
+        if images_tensor:
+            image_data = images_tensor.as_numpy().reshape(-1)
+            if len(image_data) > 0 and image_data[0]:
+                try:
+                    images = []
+                    for img_str in image_data:
+                        if img_str:
+                            img_bytes = base64.b64decode(img_str.decode('utf-8'))
+                            img = Image.open(BytesIO(img_bytes))
+                            images.append(img)
+                except Exception as e:
+                    logger.error(f"Error processing images: {e}")
+                    images = None
+        if images and self.processor is None:
+            logger.warning(f"{self.model_name} is loaded as a text-only model, ignoring images")
+            images = None
+        
+        return {
+            'prompt': prompt_str,
+            'images': images,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'top_p': top_p,
+            'stream': stream
+        }
+    
+    def _prepare_inputs(self, items):
+        if items[0]['images']:
+            # Multimodal generation (one request per call)
+            return self.processor(
+                text=items[0]['prompt'],
+                images=items[0]['images'],
+                return_tensors="pt"
+            ).to(self.device)
+        
+        # Text-only generation
+        return self.tokenizer(
+            [item['prompt'] for item in items],
+            return_tensors="pt",
+            padding=True
+        ).to(self.device)
+    
+    def _generation_kwargs(self, item):
+        return dict(
+            max_new_tokens=item['max_tokens'],
+            temperature=item['temperature'],
+            top_p=item['top_p'],
+            do_sample=item['temperature'] > 0,
+            pad_token_id=self.tokenizer.pad_token_id,
+            eos_token_id=self.tokenizer.eos_token_id
+        )
+    
+    def _generate_batch(self, items, responses):
+        """Generate for several compatible non-streaming requests in one call"""
+        try:
+            inputs = self._prepare_inputs(items)
             
-            # Optional inputs
-            images_tensor = pb_utils.get_input_tensor_by_name(request, "images")
-            max_tokens_tensor = pb_utils.get_input_tensor_by_name(request, "max_tokens")
-            temperature_tensor = pb_utils.get_input_tensor_by_name(request, "temperature")
-            top_p_tensor = pb_utils.get_input_tensor_by_name(request, "top_p")
-            stream_tensor = pb_utils.get_input_tensor_by_name(request, "stream")
+            with torch.no_grad():
+                outputs = self.model.generate(**inputs, **self._generation_kwargs(items[0]))
             
-            # Parse optional parameters
-            max_tokens = int(max_tokens_tensor.as_numpy()[0]) if max_tokens_tensor else self.default_max_tokens
-            temperature = float(temperature_tensor.as_numpy()[0]) if temperature_tensor else self.default_temperature
-            top_p = float(top_p_tensor.as_numpy()[0]) if top_p_tensor else self.default_top_p
-            stream = bool(stream_tensor.as_numpy()[0]) if stream_tensor else False
+            # Decode each row after the (padded) prompt
+            texts = self.tokenizer.batch_decode(
+                outputs[:, inputs['input_ids'].shape[1]:],
+                skip_special_tokens=True
+            )
             
-            # Process images if provided
-            images = None
-            if images_tensor:
-                image_data = images_tensor.as_numpy()
-                if len(image_data) > 0 and image_data[0]:
-                    try:
-                        images = []
-                        for img_str in image_data:
-                            if img_str:
-                                img_bytes = base64.b64decode(img_str.decode('utf-8'))
-                                img = Image.open(BytesIO(img_bytes))
-                                images.append(img)
-                    except Exception as e:
-                        logger.error(f"Error processing images: {e}")
-                        images = None
+            self.generate_calls += 1
+            self.batched_requests += len(items)
+            if len(items) > 1:
+                logger.debug(f"Generated {len(items)} requests in one batch "
+                             f"(average batch {self.batched_requests / self.generate_calls:.2f})")
+        
+        except Exception as e:
+            logger.error(f"Error during generation: {e}")
+            texts = [f"Error: {str(e)}"] * len(items)
+        
+        for item, text in zip(items, texts):
+            self._send_text(item, text, responses)
+    
+    def _generate_stream(self, item):
+        """Stream a single request's tokens as decoupled responses"""
+        response_sender = item['response_sender']
+        try:
+            inputs = self._prepare_inputs([item])
+            
+            # Streaming generation for decoupled mode
+            streamer = TextIteratorStreamer(
+                self.tokenizer, 
+                skip_prompt=True,
+                skip_special_tokens=True
+            )
+            cancelled = CancelledCriteria(response_sender)
             
-            # Generate response
+            generation_kwargs = dict(
+                **inputs,
+                **self._generation_kwargs(item),
+                streamer=streamer,
+                stopping_criteria=StoppingCriteriaList([cancelled])
+            )
+            
+            # Start generation in a separate thread
+            thread = Thread(target=self.model.generate, kwargs=generation_kwargs)
+            thread.start()
+            
+            # Stream tokens as they are generated
             try:
-                if images:
-                    # Multimodal generation
-                    inputs = self.processor(
-                        text=prompt_str,
-                        images=images,
-                        return_tensors="pt"
-                    ).to(self.device)
-                else:
-                    # Text-only generation
-                    inputs = self.tokenizer(
-                        prompt_str,
-                        return_tensors="pt"
-                    ).to(self.device)
-                
-                if stream and self.decoupled:
-                    # Streaming generation for decoupled mode
-                    streamer = TextIteratorStreamer(
-                        self.tokenizer, 
-                        skip_prompt=True,
-                        skip_special_tokens=True
-                    )
-                    
-                    generation_kwargs = dict(
-                        **inputs,
-                        max_new_tokens=max_tokens,
-                        temperature=temperature,
-                        top_p=top_p,
-                        do_sample=temperature > 0,
-                        pad_token_id=self.tokenizer.pad_token_id,
-                        eos_token_id=self.tokenizer.eos_token_id,
-                        streamer=streamer
-                    )
-                    
-                    # Start generation in a separate thread
-                    thread = Thread(target=self.model.generate, kwargs=generation_kwargs)
-                    thread.start()
-                    
-                    # Stream tokens as they are generated
-                    try:
-                        for text_chunk in streamer:
-                            if text_chunk:
-                                output_tensor = pb_utils.Tensor(
-                                    "text",
-                                    np.array([text_chunk.encode('utf-8')], dtype=np.object_)
-                                )
-                                response = pb_utils.InferenceResponse(output_tensors=[output_tensor])
-                                response_sender.send(response)
-                    
-                    except Exception as e:
-                        logger.error(f"Error during streaming: {e}")
-                    
-                    finally:
-                        # Send final empty response to signal completion
-                        response_sender.send(flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
-                        thread.join()
-                    
-                else:
-                    # Non-streaming generation
-                    with torch.no_grad():
-                        outputs = self.model.generate(
-                            **inputs,
-                            max_new_tokens=max_tokens,
-                            temperature=temperature,
-                            top_p=top_p,
-                            do_sample=temperature > 0,
-                            pad_token_id=self.tokenizer.pad_token_id,
-                            eos_token_id=self.tokenizer.eos_token_id
-                        )
-                    
-                    # Decode response
-                    response_text = self.tokenizer.decode(
-                        outputs[0][inputs['input_ids'].shape[1]:],
-                        skip_special_tokens=True
-                    )
-                    
-                    # Create output tensor
-                    output_tensor = pb_utils.Tensor(
-                        "text",
-                        np.array([response_text.encode('utf-8')], dtype=np.object_)
-                    )
-                    
-                    if self.decoupled:
-                        # For decoupled mode, send response and complete
-                        response = pb_utils.InferenceResponse(output_tensors=[output_tensor])
-                        response_sender.send(response)
-                        response_sender.send(flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
-                    else:
-                        # For regular mode, add to responses list
-                        inference_response = pb_utils.InferenceResponse(
-                            output_tensors=[output_tensor]
-                        )
-                        responses.append(inference_response)
-                
+                for text_chunk in streamer:
+                    if cancelled.cancelled():
+                        # generate() stops at its next step; the streamer queue is unbounded so it never blocks
+                        logger.info("Request cancelled, stopping generation")
+                        break
+                    if text_chunk:
+                        response_sender.send(self._text_response(text_chunk))
+            
             except Exception as e:
-                logger.error(f"Error during generation: {e}")
-                error_message = f"Error: {str(e)}"
-                output_tensor = pb_utils.Tensor(
-                    "text",
-                    np.array([error_message.encode('utf-8')], dtype=np.object_)
-                )
-                
-                if self.decoupled:
-                    response = pb_utils.InferenceResponse(output_tensors=[output_tensor])
-                    response_sender.send(response)
-                    response_sender.send(flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
-                else:
-                    inference_response = pb_utils.InferenceResponse(
-                        output_tensors=[output_tensor]
-                    )
-                    responses.append(inference_response)
-        
-        # Return empty list for decoupled mode, responses for regular mode
-        return [] if self.decoupled else responses
+                logger.error(f"Error during streaming: {e}")
+            
+            finally:
+                # Send final empty response to signal completion
+                response_sender.send(flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
+                thread.join()
+        
+        except Exception as e:
+            logger.error(f"Error during generation: {e}")
+            self._send_text(item, f"Error: {str(e)}", None)
+    
+    def _text_response(self, text):
+        # One row of text per request; the leading dimension is the request's batch size
+        output_tensor = pb_utils.Tensor(
+            "text",
+            np.array([[text.encode('utf-8')]], dtype=np.object_)
+        )
+        return pb_utils.InferenceResponse(output_tensors=[output_tensor])
+    
+    def _send_text(self, item, text, responses):
+        """Send a complete text response for one request"""
+        response = self._text_response(text)
+        if self.decoupled:
+            # For decoupled mode, send response and complete
+            item['response_sender'].send(response, flags=pb_utils.TRITONSERVER_RESPONSE_COMPLETE_FINAL)
+        else:
+            # For regular mode, add to responses list
+            responses[item['index']] = response
     
     def finalize(self):
         logger.info("Cleaning up model")
+        if self.generate_calls:
+            logger.info(f"Average generate() batch size: {self.batched_requests / self.generate_calls:.2f}")
         del self.model
         del self.processor
         del self.tokenizer
-        torch.cuda.empty_cache()
\ No newline at end of file
+        torch.cuda.empty_cache()
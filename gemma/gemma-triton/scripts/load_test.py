@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+perf_analyzer-style load test for the gemma3n Triton model.
+
+Sweeps a range of client concurrency levels against Triton's gRPC endpoint
+and reports throughput, latency percentiles and the average batch size
+Triton executed at each level, so batching throughput can be weighed against
+latency. Uses the same inputs as the API server.
+
+Runs without a GPU against the tiny CPU model configuration:
+
+    tritonserver --model-repository=/models --model-config-name=cpu_tiny
+    python scripts/load_test.py --concurrency-range 1:8 --requests 64
+
+Add --stream to measure time to first token on streaming requests instead.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src import server
+from src.server import MODEL_NAME, MODEL_VERSION, get_grpc_client, stream_triton_model
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the gemma3n Triton model")
+    parser.add_argument("--url", default=server.TRITON_GRPC_URL, help="Triton gRPC endpoint")
+    parser.add_argument("--concurrency-range", default="1:8",
+                        help="start:end[:step] concurrency levels (step doubles when omitted)")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument("--temperature", type=float, default=0.0)
+    parser.add_argument("--top-p", type=float, default=0.9)
+    parser.add_argument("--stream", action="store_true", help="Send streaming requests")
+    return parser.parse_args()
+
+
+def concurrency_levels(spec: str):
+    parts = [int(p) for p in spec.split(":")]
+    start, end = parts[0], parts[1] if len(parts) > 1 else parts[0]
+    levels = []
+    level = start
+    while level <= end:
+        levels.append(level)
+        level = level + parts[2] if len(parts) > 2 else level * 2
+    return levels
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def model_counts():
+    """Triton's (inference_count, execution_count) for the model"""
+    stats = await get_grpc_client().get_inference_statistics(MODEL_NAME, MODEL_VERSION, as_json=True)
+    model_stats = stats["model_stats"][0]
+    return int(model_stats.get("inference_count", 0)), int(model_stats.get("execution_count", 0))
+
+
+async def run_level(args, concurrency: int):
+    prompts = [f"Request {i}: describe what a home robot should do when it sees a spilled drink."
+               for i in range(args.requests)]
+    latencies = []
+    first_tokens = []
+    errors = 0
+    next_prompt = iter(prompts)
+    
+    async def worker():
+        nonlocal errors
+        for prompt in next_prompt:
+            start = time.perf_counter()
+            first = None
+            try:
+                async for _ in stream_triton_model(prompt, [], args.max_tokens, args.temperature,
+                                                   args.top_p, stream=args.stream):
+                    if first is None:
+                        first = time.perf_counter() - start
+            except Exception as e:
+                errors += 1
+                print(f"  request failed: {e}")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            first_tokens.append((first or 0.0) * 1000)
+    
+    inferences_before, executions_before = await model_counts()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    inferences_after, executions_after = await model_counts()
+    
+    executions = executions_after - executions_before
+    return {
+        "concurrency": concurrency,
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p90": percentile(latencies, 0.9),
+        "p99": percentile(latencies, 0.99),
+        "first_token_p50": percentile(first_tokens, 0.5),
+        "avg_batch": (inferences_after - inferences_before) / executions if executions else 0.0,
+        "errors": errors,
+    }
+
+
+async def main():
+    args = parse_args()
+    server.TRITON_GRPC_URL = args.url
+    
+    mode = "streaming" if args.stream else "non-streaming"
+    print("*** Measurement Settings ***")
+    print(f"  Model: {MODEL_NAME} (version {MODEL_VERSION}) at {args.url}")
+    print(f"  {args.requests} {mode} requests per level, {args.max_tokens} max tokens, temperature {args.temperature}\n")
+    
+    header = f"{'Concurrency':>11} {'Infer/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'Avg batch':>10}"
+    if args.stream:
+        header += f" {'TTFT p50':>9}"
+    print(header)
+    
+    for concurrency in concurrency_levels(args.concurrency_range):
+        result = await run_level(args, concurrency)
+        line = (f"{result['concurrency']:>11} {result['throughput']:>9.2f} {result['p50']:>9.0f} "
+                f"{result['p90']:>9.0f} {result['p99']:>9.0f} {result['avg_batch']:>10.2f}")
+        if args.stream:
+            line += f" {result['first_token_p50']:>9.0f}"
+        if result["errors"]:
+            line += f"  ({result['errors']} errors)"
+        print(line)
+    
+    await get_grpc_client().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
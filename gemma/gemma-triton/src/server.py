@@ -1,12 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Union, Dict, Any
-import tritonclient.http as httpclient
+from typing import AsyncGenerator, List, Optional, Union, Dict, Any
+from contextlib import asynccontextmanager
 import tritonclient.grpc as grpcclient
+import tritonclient.grpc.aio as grpcclient_aio
 import numpy as np
 import json
-import asyncio
 import uuid
 from datetime import datetime
 import os
@@ -16,17 +16,30 @@ import base64
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Gemma-Triton OpenAI API", version="1.0.0")
-
 # Triton server configuration
-TRITON_HTTP_URL = os.environ.get("TRITON_HTTP_URL", "localhost:8000")
 TRITON_GRPC_URL = os.environ.get("TRITON_GRPC_URL", "localhost:8001")
 MODEL_NAME = "gemma3n"
 MODEL_VERSION = "1"
 
-# Initialize Triton clients
-http_client = httpclient.InferenceServerClient(url=TRITON_HTTP_URL)
-grpc_client = grpcclient.InferenceServerClient(url=TRITON_GRPC_URL)
+# Async gRPC client, created on first use inside the server's event loop.
+# The gemma3n model is decoupled, so every request goes through the gRPC stream API.
+grpc_client: Optional[grpcclient_aio.InferenceServerClient] = None
+
+def get_grpc_client() -> grpcclient_aio.InferenceServerClient:
+    global grpc_client
+    if grpc_client is None:
+        grpc_client = grpcclient_aio.InferenceServerClient(url=TRITON_GRPC_URL)
+    return grpc_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global grpc_client
+    yield
+    if grpc_client is not None:
+        await grpc_client.close()
+        grpc_client = None
+
+app = FastAPI(title="Gemma-Triton OpenAI API", version="1.0.0", lifespan=lifespan)
 
 # OpenAI API Models
 class Message(BaseModel):
@@ -110,62 +123,97 @@ def format_messages_to_prompt(messages: List[Message]) -> tuple[str, List[str]]:
     
     return "\n\n".join(prompt_parts), images
 
+def build_triton_inputs(prompt: str, images: List[str], max_tokens: int,
+                       temperature: float, top_p: float, stream: bool) -> List[grpcclient.InferInput]:
+    """Build the gemma3n model inputs (batch of one; Triton batches concurrent requests)"""
+    inputs = []
+    
+    # Prompt input
+    prompt_input = grpcclient.InferInput("prompt", [1, 1], "BYTES")
+    prompt_input.set_data_from_numpy(np.array([[prompt.encode('utf-8')]], dtype=np.object_))
+    inputs.append(prompt_input)
+    
+    # Images input (optional)
+    if images:
+        images_input = grpcclient.InferInput("images", [1, len(images)], "BYTES")
+        images_data = np.array([[img.encode('utf-8') for img in images]], dtype=np.object_)
+        images_input.set_data_from_numpy(images_data)
+        inputs.append(images_input)
+    
+    # Max tokens input
+    max_tokens_input = grpcclient.InferInput("max_tokens", [1, 1], "INT32")
+    max_tokens_input.set_data_from_numpy(np.array([[max_tokens]], dtype=np.int32))
+    inputs.append(max_tokens_input)
+    
+    # Temperature input
+    temperature_input = grpcclient.InferInput("temperature", [1, 1], "FP32")
+    temperature_input.set_data_from_numpy(np.array([[temperature]], dtype=np.float32))
+    inputs.append(temperature_input)
+    
+    # Top-p input
+    top_p_input = grpcclient.InferInput("top_p", [1, 1], "FP32")
+    top_p_input.set_data_from_numpy(np.array([[top_p]], dtype=np.float32))
+    inputs.append(top_p_input)
+    
+    # Stream input
+    stream_input = grpcclient.InferInput("stream", [1, 1], "BOOL")
+    stream_input.set_data_from_numpy(np.array([[stream]], dtype=bool))
+    inputs.append(stream_input)
+    
+    return inputs
+
+async def stream_triton_model(prompt: str, images: List[str], max_tokens: int,
+                              temperature: float, top_p: float, stream: bool = False) -> AsyncGenerator[str, None]:
+    """Yield the text of each decoupled response from the Triton model as it arrives
+    
+    Cancelling the consuming task (e.g. the HTTP client disconnected) cancels
+    the gRPC call, which marks the request cancelled in Triton so the model
+    stops generating.
+    """
+    inputs = build_triton_inputs(prompt, images, max_tokens, temperature, top_p, stream)
+    
+    # One request per stream; Triton keeps sending its responses after the request side closes
+    async def request_iterator():
+        yield {
+            "model_name": MODEL_NAME,
+            "model_version": MODEL_VERSION,
+            "inputs": inputs,
+            "outputs": [grpcclient.InferRequestedOutput("text")],
+            "request_id": uuid.uuid4().hex,
+            # Have Triton flag the last response so we know when the request is done
+            "parameters": {"triton_enable_empty_final_response": True}
+        }
+    
+    responses = get_grpc_client().stream_infer(request_iterator())
+    final_seen = False
+    try:
+        async for result, error in responses:
+            if error is not None:
+                raise error
+            
+            output_data = result.as_numpy("text")
+            if output_data is not None and output_data.size > 0:
+                text = output_data.reshape(-1)[0].decode('utf-8')
+                if text:
+                    yield text
+            
+            if result.get_response().parameters["triton_final_response"].bool_param:
+                final_seen = True
+                break
+    finally:
+        # Stopped early (error, client disconnect): cancel the call so Triton stops generating
+        if not final_seen:
+            responses.cancel()
+
 async def call_triton_model(prompt: str, images: List[str], max_tokens: int, 
-                          temperature: float, top_p: float, stream: bool = False):
-    """Call Triton inference server"""
+                          temperature: float, top_p: float) -> str:
+    """Call Triton inference server and return the complete response"""
     try:
-        # Prepare inputs
-        inputs = []
-        
-        # Prompt input
-        prompt_input = httpclient.InferInput("prompt", [1], "BYTES")
-        prompt_input.set_data_from_numpy(np.array([prompt.encode('utf-8')], dtype=np.object_))
-        inputs.append(prompt_input)
-        
-        # Images input (optional)
-        if images:
-            images_input = httpclient.InferInput("images", [len(images)], "BYTES")
-            images_data = np.array([img.encode('utf-8') for img in images], dtype=np.object_)
-            images_input.set_data_from_numpy(images_data)
-            inputs.append(images_input)
-        
-        # Max tokens input
-        max_tokens_input = httpclient.InferInput("max_tokens", [1], "INT32")
-        max_tokens_input.set_data_from_numpy(np.array([max_tokens], dtype=np.int32))
-        inputs.append(max_tokens_input)
-        
-        # Temperature input
-        temperature_input = httpclient.InferInput("temperature", [1], "FP32")
-        temperature_input.set_data_from_numpy(np.array([temperature], dtype=np.float32))
-        inputs.append(temperature_input)
-        
-        # Top-p input
-        top_p_input = httpclient.InferInput("top_p", [1], "FP32")
-        top_p_input.set_data_from_numpy(np.array([top_p], dtype=np.float32))
-        inputs.append(top_p_input)
-        
-        # Stream input
-        stream_input = httpclient.InferInput("stream", [1], "BOOL")
-        stream_input.set_data_from_numpy(np.array([stream], dtype=bool))
-        inputs.append(stream_input)
-        
-        # Prepare outputs
-        outputs = [httpclient.InferRequestedOutput("text")]
-        
-        # Make inference request
-        response = http_client.infer(
-            model_name=MODEL_NAME,
-            model_version=MODEL_VERSION,
-            inputs=inputs,
-            outputs=outputs
-        )
-        
-        # Get output
-        output_data = response.as_numpy("text")
-        text = output_data[0].decode('utf-8')
-        
-        return text
-        
+        parts = []
+        async for text in stream_triton_model(prompt, images, max_tokens, temperature, top_p, stream=False):
+            parts.append(text)
+        return "".join(parts)
+    
     except Exception as e:
         logger.error(f"Triton inference error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -175,9 +223,10 @@ async def health_check():
     """Health check endpoint"""
     try:
         # Check if Triton server is responsive
-        if http_client.is_server_live():
+        client = get_grpc_client()
+        if await client.is_server_live():
             # Check if model is ready
-            if http_client.is_model_ready(MODEL_NAME, MODEL_VERSION):
+            if await client.is_model_ready(MODEL_NAME, MODEL_VERSION):
                 return {"status": "healthy", "model": MODEL_NAME, "version": MODEL_VERSION}
             else:
                 return {"status": "unhealthy", "error": "Model not ready"}
@@ -206,57 +255,56 @@ async def chat_completions(request: ChatCompletionRequest):
     # Convert messages to prompt and extract images
     prompt, images = format_messages_to_prompt(request.messages)
     
-    # Call Triton model
-    response_text = await call_triton_model(
-        prompt=prompt,
-        images=images,
-        max_tokens=request.max_tokens,
-        temperature=request.temperature,
-        top_p=request.top_p,
-        stream=request.stream
-    )
-    
     if request.stream:
-        # Streaming response
-        async def generate_stream():
-            # Split response into chunks for streaming
-            words = response_text.split()
-            chunk_size = 3  # Words per chunk
-            
-            for i in range(0, len(words), chunk_size):
-                chunk_words = words[i:i + chunk_size]
-                chunk_text = " ".join(chunk_words)
-                if i + chunk_size < len(words):
-                    chunk_text += " "
-                
-                chunk_data = {
-                    "id": f"chatcmpl-{uuid.uuid4().hex}",
-                    "object": "chat.completion.chunk",
-                    "created": int(datetime.now().timestamp()),
-                    "model": request.model,
-                    "choices": [{
-                        "index": 0,
-                        "delta": {"content": chunk_text},
-                        "finish_reason": None
-                    }]
-                }
-                
-                yield f"data: {json.dumps(chunk_data)}\n\n"
-                await asyncio.sleep(0.01)  # Small delay for streaming effect
-            
-            # Final chunk
-            final_chunk = {
-                "id": f"chatcmpl-{uuid.uuid4().hex}",
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        text_stream = stream_triton_model(
+            prompt=prompt,
+            images=images,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            top_p=request.top_p,
+            stream=True
+        )
+        
+        # Wait for the first token here so a failed request is reported as an HTTP error
+        try:
+            first_text = await anext(text_stream, None)
+        except Exception as e:
+            logger.error(f"Triton inference error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+        
+        def make_chunk(delta: Dict[str, str], finish_reason: Optional[str]) -> str:
+            chunk_data = {
+                "id": completion_id,
                 "object": "chat.completion.chunk",
                 "created": int(datetime.now().timestamp()),
                 "model": request.model,
                 "choices": [{
                     "index": 0,
-                    "delta": {},
-                    "finish_reason": "stop"
+                    "delta": delta,
+                    "finish_reason": finish_reason
                 }]
             }
-            yield f"data: {json.dumps(final_chunk)}\n\n"
+            return f"data: {json.dumps(chunk_data)}\n\n"
+        
+        async def generate_stream():
+            # Forward each decoupled response as it arrives. If the client disconnects,
+            # this generator is cancelled and the Triton request with it.
+            finish_reason = "stop"
+            try:
+                if first_text is not None:
+                    yield make_chunk({"content": first_text}, None)
+                    async for text in text_stream:
+                        yield make_chunk({"content": text}, None)
+            except Exception as e:
+                # The reply is truncated; tell the client rather than finishing normally
+                logger.error(f"Triton streaming error: {e}")
+                finish_reason = "error"
+            finally:
+                await text_stream.aclose()
+            
+            # Final chunk
+            yield make_chunk({}, finish_reason)
             yield "data: [DONE]\n\n"
         
         return StreamingResponse(
@@ -265,6 +313,14 @@ async def chat_completions(request: ChatCompletionRequest):
         )
     else:
         # Non-streaming response
+        response_text = await call_triton_model(
+            prompt=prompt,
+            images=images,
+            max_tokens=request.max_tokens,
+            temperature=request.temperature,
+            top_p=request.top_p
+        )
+        
         completion_id = f"chatcmpl-{uuid.uuid4().hex}"
         created_time = int(datetime.now().timestamp())
         
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Test the API server's Triton streaming against a fake stream_infer (no Triton needed)"""
+
+import asyncio
+import json
+
+import numpy as np
+from fastapi.testclient import TestClient
+from tritonclient.grpc import InferResult, service_pb2
+from tritonclient.utils import serialize_byte_tensor
+
+from src import server
+
+
+def make_result(text=None, final=False):
+    """Build an InferResult like the decoupled gemma3n model sends"""
+    response = service_pb2.ModelInferResponse(model_name=server.MODEL_NAME)
+    if text is not None:
+        response.outputs.add(name="text", datatype="BYTES", shape=[1, 1])
+        response.raw_output_contents.append(
+            serialize_byte_tensor(np.array([[text.encode("utf-8")]], dtype=np.object_)).item()
+        )
+    response.parameters["triton_final_response"].bool_param = final
+    return InferResult(response)
+
+
+class FakeResponses:
+    """Mimics the aio client's response iterator: async iteration plus cancel()"""
+
+    def __init__(self, request_iterator, results):
+        self.request_iterator = request_iterator
+        self.results = results
+        self.requests = []
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.requests:
+            self.requests = [request async for request in self.request_iterator]
+        if self.cancelled or not self.results:
+            raise StopAsyncIteration
+        return self.results.pop(0)
+
+    def cancel(self):
+        self.cancelled = True
+        return True
+
+
+class FakeClient:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def stream_infer(self, request_iterator):
+        responses = FakeResponses(request_iterator, list(self.results))
+        self.calls.append(responses)
+        return responses
+
+
+def use_fake_client(results):
+    client = FakeClient(results)
+    server.grpc_client = client
+    return client
+
+
+def test_call_triton_model():
+    client = use_fake_client([(make_result("Hello there."), None), (make_result(final=True), None)])
+
+    text = asyncio.run(server.call_triton_model("Hi", [], 16, 0.0, 0.9))
+
+    assert text == "Hello there."
+    responses = client.calls[0]
+    request = responses.requests[0]
+    assert request["parameters"] == {"triton_enable_empty_final_response": True}
+    assert "enable_empty_final_response" not in request
+    assert not responses.cancelled
+
+
+def test_call_triton_model_error():
+    from tritonclient.utils import InferenceServerException
+
+    client = use_fake_client([(None, InferenceServerException(msg="model failed"))])
+
+    try:
+        asyncio.run(server.call_triton_model("Hi", [], 16, 0.0, 0.9))
+    except server.HTTPException as e:
+        assert e.status_code == 500
+        assert "model failed" in e.detail
+    else:
+        raise AssertionError("expected HTTPException")
+    assert client.calls[0].cancelled
+
+
+def test_chat_completions_non_streaming():
+    use_fake_client([(make_result("Hello there."), None), (make_result(final=True), None)])
+
+    response = TestClient(server.app).post("/v1/chat/completions", json={
+        "model": "gemma3n", "messages": [{"role": "user", "content": "Hi"}]
+    })
+
+    assert response.status_code == 200
+    assert response.json()["choices"][0]["message"]["content"] == "Hello there."
+
+
+def test_chat_completions_streaming():
+    client = use_fake_client([
+        (make_result("Hello"), None),
+        (make_result(" there."), None),
+        (make_result(final=True), None),
+    ])
+
+    response = TestClient(server.app).post("/v1/chat/completions", json={
+        "model": "gemma3n", "messages": [{"role": "user", "content": "Hi"}], "stream": True
+    })
+
+    assert response.status_code == 200
+    events = [line[len("data: "):] for line in response.text.split("\n\n") if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    assert [c["choices"][0]["delta"].get("content") for c in chunks] == ["Hello", " there.", None]
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    assert not client.calls[0].cancelled
+
+
+def test_chat_completions_streaming_error():
+    from tritonclient.utils import InferenceServerException
+
+    client = use_fake_client([
+        (make_result("Hello"), None),
+        (None, InferenceServerException(msg="model failed")),
+    ])
+
+    response = TestClient(server.app).post("/v1/chat/completions", json={
+        "model": "gemma3n", "messages": [{"role": "user", "content": "Hi"}], "stream": True
+    })
+
+    assert response.status_code == 200
+    events = [line[len("data: "):] for line in response.text.split("\n\n") if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    assert [c["choices"][0]["delta"].get("content") for c in chunks] == ["Hello", None]
+    assert chunks[-1]["choices"][0]["finish_reason"] == "error"
+    assert client.calls[0].cancelled
+
+
+def test_lifespan_closes_client():
+    closed = []
+
+    class ClosingClient(FakeClient):
+        async def close(self):
+            closed.append(True)
+
+    server.grpc_client = ClosingClient([])
+    with TestClient(server.app):
+        pass
+
+    assert closed == [True]
+    assert server.grpc_client is None
+
+
+def test_stream_stopped_early_cancels():
+    client = use_fake_client([(make_result("Hello"), None), (make_result(" there."), None)])
+
+    async def read_first():
+        text_stream = server.stream_triton_model("Hi", [], 16, 0.0, 0.9, stream=True)
+        first = await anext(text_stream)
+        await text_stream.aclose()
+        return first
+
+    assert asyncio.run(read_first()) == "Hello"
+    assert client.calls[0].cancelled
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
+    server.grpc_client = None
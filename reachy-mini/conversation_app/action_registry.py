@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Action Script Registry
+
+Loads every action script in actions/scripts/ once, validates it, and keeps
+the compiled module in memory so dispatching an action is a dictionary
+lookup instead of a compile + exec from disk.
+
+Scripts are hot-reloaded: each lookup compares the file's mtime with the
+loaded version (one stat call) and re-imports the script only when it has
+changed.  New scripts are picked up on first use and deleted ones are
+dropped.
+
+Files starting with ``_`` or ``test_`` are ignored.
+
+Scripts may declare which actuators they drive, used by ActionsQueue to run
+non-conflicting actions concurrently:
+
+    ACTUATORS = {"head"}        # any of: head, antennas, body_yaw, speech
+    ACTUATORS = set()           # read-only query, never blocks anything
+    PREEMPT = True              # cancel running/pending actions first
+
+Scripts without ACTUATORS are assumed to drive every motor.
+"""
+
+import importlib.util
+import inspect
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Actuator lanes
+HEAD = "head"
+ANTENNAS = "antennas"
+BODY_YAW = "body_yaw"
+SPEECH = "speech"
+MOTOR_ACTUATORS = frozenset({HEAD, ANTENNAS, BODY_YAW})
+ALL_ACTUATORS = MOTOR_ACTUATORS | {SPEECH}
+
+
+@dataclass
+class ActionScript:
+    """A loaded and validated action script."""
+    name: str
+    path: Path
+    mtime_ns: int
+    module: ModuleType
+    execute: Callable
+    load_ms: float
+    actuators: FrozenSet[str] = MOTOR_ACTUATORS
+    preempt: bool = False
+
+
+class ActionRegistry:
+    """Cache of compiled action scripts with mtime-based hot reload."""
+
+    def __init__(self, scripts_path: Path):
+        """
+        Initialize the registry and load all scripts.
+
+        Args:
+            scripts_path: Directory containing action scripts
+        """
+        self.scripts_path = Path(scripts_path)
+        self.scripts: Dict[str, ActionScript] = {}
+        self.errors: Dict[str, str] = {}  # Scripts that failed to load or validate
+        self._failed_mtimes: Dict[str, int] = {}  # So a broken script is not re-imported on every call
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self.load_all()
+
+    @staticmethod
+    def _is_action_file(path: Path) -> bool:
+        return path.suffix == ".py" and not path.name.startswith(("_", "test_"))
+
+    def load_all(self):
+        """Load and validate every script in the scripts directory."""
+        start = time.time()
+        if not self.scripts_path.is_dir():
+            logger.warning(f"⚠️  Action scripts directory not found: {self.scripts_path}")
+            return
+
+        for script_file in sorted(self.scripts_path.glob("*.py")):
+            if self._is_action_file(script_file):
+                self._load(script_file.stem, script_file)
+
+        logger.info(f"✓ Loaded {len(self.scripts)} action scripts in {(time.time() - start) * 1000:.0f}ms"
+                    + (f" ({len(self.errors)} failed: {', '.join(sorted(self.errors))})" if self.errors else ""))
+
+    def _load(self, name: str, script_file: Path) -> Optional[ActionScript]:
+        """Import and validate one script, recording the error on failure."""
+        start = time.time()
+        mtime_ns = None
+        try:
+            mtime_ns = script_file.stat().st_mtime_ns
+            spec = importlib.util.spec_from_file_location(name, script_file)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+            execute = getattr(module, "execute", None)
+            if execute is None:
+                raise ValueError("missing execute function")
+            if not inspect.iscoroutinefunction(execute):
+                raise ValueError("execute must be an async function")
+            if len(inspect.signature(execute).parameters) != 3:
+                raise ValueError("execute must take (controller, tts_queue, params)")
+
+            actuators = getattr(module, "ACTUATORS", None)
+            actuators = MOTOR_ACTUATORS if actuators is None else frozenset(actuators)
+            unknown = actuators - ALL_ACTUATORS
+            if unknown:
+                raise ValueError(f"unknown ACTUATORS {sorted(unknown)}")
+        except Exception as e:
+            self.scripts.pop(name, None)
+            self.errors[name] = str(e)
+            self._failed_mtimes[name] = mtime_ns
+            logger.error(f"   ❌ Invalid action script {script_file.name}: {e}")
+            return None
+
+        script = ActionScript(
+            name=name,
+            path=script_file,
+            mtime_ns=mtime_ns,
+            module=module,
+            execute=execute,
+            load_ms=(time.time() - start) * 1000,
+            actuators=actuators,
+            preempt=bool(getattr(module, "PREEMPT", False))
+        )
+        self.scripts[name] = script
+        self.errors.pop(name, None)
+        self._failed_mtimes.pop(name, None)
+        return script
+
+    def get(self, name: str) -> Tuple[Optional[ActionScript], Optional[str]]:
+        """
+        Look up an action script, reloading it if the file changed.
+
+        Args:
+            name: Action name (script file stem)
+
+        Returns:
+            (script, None) on success or (None, error message)
+        """
+        script_file = self.scripts_path / f"{name}.py"
+        if not name.isidentifier() or not self._is_action_file(script_file):
+            return None, f"Action script not found: {name}"
+        with self._lock:
+            try:
+                mtime_ns = script_file.stat().st_mtime_ns
+            except FileNotFoundError:
+                if self.scripts.pop(name, None):
+                    logger.info(f"   Action script removed: {name}")
+                self.errors.pop(name, None)
+                self._failed_mtimes.pop(name, None)
+                return None, f"Action script not found: {name}"
+
+            script = self.scripts.get(name)
+            if script is not None and script.mtime_ns == mtime_ns:
+                return script, None
+
+            # Unchanged since it last failed to load
+            if script is None and self._failed_mtimes.get(name) == mtime_ns:
+                return None, f"Invalid action script {name}: {self.errors[name]}"
+
+            # New, changed, or fixed script
+            if script is not None:
+                logger.info(f"   ↻ Reloading changed action script: {name}")
+                self.reloads += 1
+            script = self._load(name, script_file)
+            if script is None:
+                return None, f"Invalid action script {name}: {self.errors[name]}"
+            return script, None
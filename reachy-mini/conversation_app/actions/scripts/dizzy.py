@@ -4,6 +4,10 @@ import asyncio
 import math
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """
     Make the robot look dizzy by moving its head in slow circles.
@@ -2,6 +2,10 @@
 import asyncio
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head", "antennas"}
+
+
 async def execute(controller, tts_queue, params):
     """
     Make the robot express an emotion using head and antenna movements.
@@ -4,6 +4,10 @@ Gets the current state of the robot's antennas.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = set()
+
+
 async def execute(controller, tts_queue, params):
     """Execute the get_antennas_state tool."""
     # Get current state from controller
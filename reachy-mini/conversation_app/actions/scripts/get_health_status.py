@@ -4,6 +4,10 @@ Gets the overall health status of the robot.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = set()
+
+
 async def execute(controller, tts_queue, params):
     """Execute the get_health_status tool."""
     # Access reachy instance directly for health status
@@ -4,6 +4,10 @@ Gets the current power state of the robot.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = set()
+
+
 async def execute(controller, tts_queue, params):
     """Execute the get_power_state tool."""
     # Access reachy instance for power/motor status
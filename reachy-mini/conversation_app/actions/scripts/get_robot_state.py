@@ -4,6 +4,10 @@ Gets the current full state of the Reachy Mini robot.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = set()
+
+
 async def execute(controller, tts_queue, params):
     """Execute the get_robot_state tool."""
     # Get states from controller
@@ -4,6 +4,10 @@ Makes the robot look in a specific direction.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """Execute the look_at_direction tool."""
     import asyncio
@@ -4,6 +4,10 @@ Moves the robot's antennas independently.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"antennas"}
+
+
 async def execute(controller, tts_queue, params):
     """Execute the move_antennas tool."""
     import asyncio
@@ -4,6 +4,10 @@ Moves the robot's head to a target pose.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """Execute the move_head tool."""
     import asyncio
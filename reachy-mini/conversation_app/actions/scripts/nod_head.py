@@ -2,6 +2,10 @@
 import asyncio
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """
     Make the robot nod its head (pitch up and down).
@@ -3,6 +3,10 @@ import asyncio
 import math
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head", "antennas"}
+
+
 async def execute(controller, tts_queue, params):
     """
     Perform a predefined gesture sequence.
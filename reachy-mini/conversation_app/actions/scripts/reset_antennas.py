@@ -4,6 +4,10 @@ Resets both antennas to their neutral position (0 degrees).
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"antennas"}
+
+
 async def execute(controller, tts_queue, params):
     """Execute the reset_antennas tool."""
     import asyncio
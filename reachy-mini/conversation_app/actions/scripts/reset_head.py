@@ -4,6 +4,10 @@ Resets the robot's head to the default neutral position.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """Execute the reset_head tool."""
     import asyncio
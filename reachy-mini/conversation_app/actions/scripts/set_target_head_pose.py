@@ -2,6 +2,10 @@
 import asyncio
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """
     Move the robot's head to a specific pose (roll, pitch, yaw).
@@ -2,6 +2,10 @@
 import asyncio
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"speech"}
+
+
 async def execute(controller, tts_queue, params):
     """
     Speak text aloud through text-to-speech.
@@ -4,6 +4,11 @@ Emergency stop - immediately halts all robot movements.
 """
 
 
+# Drives every motor and cancels running/pending actions first
+ACTUATORS = {"head", "antennas", "body_yaw"}
+PREEMPT = True
+
+
 async def execute(controller, tts_queue, params):
     """Execute the stop_all_movements tool."""
     speech = params.get('speech')
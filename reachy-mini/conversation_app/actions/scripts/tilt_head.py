@@ -4,6 +4,10 @@ Tilts the robot's head to the left or right.
 """
 
 
+# Actuators this action drives (see action_registry.py)
+ACTUATORS = {"head"}
+
+
 async def execute(controller, tts_queue, params):
     """Execute the tilt_head tool."""
     import asyncio
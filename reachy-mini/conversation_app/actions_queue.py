@@ -8,7 +8,14 @@ This module provides a background actions queue that:
 3. Manages a background action execution queue
 4. Can clear the queue when needed (e.g., when user sends new message)
 
-Actions are loaded dynamically from tools_repository/scripts/ directory.
+Actions run in lanes keyed by the actuators they drive (head, antennas,
+body_yaw, speech).  Actions on disjoint actuators run concurrently; an
+action that shares an actuator with a running or earlier queued action
+waits for it, so conflicting actions keep their order.  A PREEMPT action
+(stop_all_movements) cancels everything running and pending first.
+
+Actions are loaded from the tools_repository/scripts/ directory once at
+startup by ActionRegistry (hot-reloaded when a script changes).
 Each action script should have an async execute() function.
 
 Requirements:
@@ -20,20 +27,36 @@ import httpx
 import json
 import math
 import os
-import importlib.util
+import time
 import traceback
 from pathlib import Path
+from dataclasses import dataclass, field
 from queue import Queue, Empty
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, FrozenSet, List
 import threading
 import logging
 
+from .action_registry import ActionRegistry, SPEECH
+
 logger = logging.getLogger(__name__)
 
 # Default reachy-daemon URL
 DEFAULT_REACHY_BASE_URL = "http://localhost:8000"
 
 
+@dataclass
+class ActionJob:
+    """An action admitted to the scheduler."""
+    data: Dict[str, Any]
+    actuators: FrozenSet[str]
+    preempt: bool = False
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    
+    @property
+    def name(self) -> str:
+        return self.data.get('action')
+
+
 class ActionsQueue:
     """Manages robot action execution queue."""
     
@@ -62,14 +85,24 @@ class ActionsQueue:
             tools_repository_path = Path(__file__).parent.parent / "tools_repository"
         self.tools_repository_path = tools_repository_path
         self.scripts_path = tools_repository_path / "scripts"
+        self.registry = ActionRegistry(self.scripts_path)
+        
+        # Per-action dispatch latency (enqueue -> execute() called), in ms
+        self.dispatch_stats: Dict[str, Dict[str, float]] = {}
         
         self.action_queue = Queue()
         self.execution_thread = None
-        self.is_executing = False
         self.should_stop = False
         
+        # Scheduler state (only touched from the worker's event loop)
+        self._pending: List[ActionJob] = []
+        self._running: List[ActionJob] = []
+        self._busy: Dict[str, ActionJob] = {}  # actuator -> running job
+        
         # Event loop for async operations in thread
         self.loop = None
+        # Persistent HTTP client to the daemon, bound to the worker's event loop
+        self.http_client: Optional[httpx.AsyncClient] = None
         
         # Check if reachy-daemon is available
         self._check_daemon_available()
@@ -95,22 +128,37 @@ class ActionsQueue:
         self.execution_thread = threading.Thread(target=self._execution_worker, daemon=True)
         self.execution_thread.start()
     
+    @property
+    def is_executing(self) -> bool:
+        """True while any action is running."""
+        return bool(self._running)
+    
     def _execution_worker(self):
-        """Background worker that processes the action queue."""
+        """Background worker that runs the action scheduler."""
         # Create a new event loop for this thread
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
         
+        try:
+            self.loop.run_until_complete(self._scheduler())
+        finally:
+            # Close the HTTP client and event loop
+            if self.http_client is not None:
+                self.loop.run_until_complete(self.http_client.aclose())
+                self.http_client = None
+            self.loop.close()
+    
+    async def _scheduler(self):
+        """Admit queued actions and start them as soon as their actuators are free."""
         while not self.should_stop:
             try:
-                # Get action from queue (blocking with timeout)
-                action_data = self.action_queue.get(timeout=0.5)
+                # Get action from queue (blocking with timeout, off the loop so running actions progress)
+                action_data = await asyncio.to_thread(self.action_queue.get, True, 0.5)
                 
                 if action_data is None:  # Poison pill
                     break
                 
-                # Execute action asynchronously in this thread's event loop
-                self.loop.run_until_complete(self._execute_action(action_data))
+                self._admit(action_data)
                 
             except Empty:
                 continue
@@ -118,8 +166,88 @@ class ActionsQueue:
                 logger.error(f"⚠️  Error in action execution worker: {e}")
                 traceback.print_exc()
         
-        # Close the event loop
-        self.loop.close()
+        # Shutdown: cancel whatever is still running
+        self._pending.clear()
+        tasks = [job.task for job in self._running if job.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _admit(self, action_data: Dict[str, Any]):
+        """Classify an action by actuator and queue it behind conflicting work."""
+        action_name = action_data.get('action')
+        script, _ = self.registry.get(action_name)
+        # Unknown scripts fail fast in _execute_action; they need no lane
+        actuators = set(script.actuators) if script else set()
+        if action_data.get('params', {}).get('speech'):
+            actuators.add(SPEECH)  # Keep spoken lines in order
+        job = ActionJob(action_data, frozenset(actuators), preempt=bool(script and script.preempt))
+        
+        if job.preempt:
+            self._preempt(job)
+        self._pending.append(job)
+        self._start_ready()
+    
+    def _preempt(self, job: ActionJob):
+        """Cancel all running and pending actions ahead of a preempting action."""
+        dropped = len(self._pending)
+        self._pending.clear()
+        cancelled = 0
+        for running in list(self._running):
+            if running.task and not running.task.done():
+                running.task.cancel()
+                cancelled += 1
+        
+        # Freeze the movement layers so cancelled gestures do not finish their last target
+        movement_manager = getattr(getattr(self.gateway, 'reachy_controller', None), 'movement_manager', None)
+        if movement_manager is not None:
+            try:
+                movement_manager.hold_current_pose()
+            except Exception as e:
+                logger.error(f"Error holding pose during preemption: {e}")
+        
+        logger.info(f"⛔ {job.name} preempting: {cancelled} running cancelled, {dropped} pending dropped")
+    
+    def _start_ready(self):
+        """Start pending actions in order, skipping any that conflict with earlier ones."""
+        blocked = set(self._busy)
+        for job in list(self._pending):
+            if job.actuators & blocked:
+                # Later actions on the same actuators must wait behind this one
+                blocked |= job.actuators
+                continue
+            # A preempting action waits for cancelled actions to release their actuators
+            if job.preempt and self._running:
+                blocked |= job.actuators
+                continue
+            self._pending.remove(job)
+            self._running.append(job)
+            for actuator in job.actuators:
+                self._busy[actuator] = job
+            blocked |= job.actuators
+            lanes = ", ".join(sorted(job.actuators)) or "no actuators"
+            logger.info(f"🛤️  Starting {job.name} on [{lanes}] ({len(self._running)} running, "
+                        f"{len(self._pending)} waiting)")
+            job.task = self.loop.create_task(self._run_job(job))
+    
+    async def _run_job(self, job: ActionJob):
+        """Run one action, then release its actuators and start whatever was waiting."""
+        try:
+            await self._execute_action(job.data)
+        except asyncio.CancelledError:
+            logger.info(f"   ⛔ Action cancelled: {job.name}")
+            if self.event_callback:
+                try:
+                    self.event_callback("action_failed", {"action": job.name, "error": "preempted"})
+                except Exception as e:
+                    logger.error(f"Error in event_callback (action_failed): {e}")
+        finally:
+            self._running.remove(job)
+            for actuator in job.actuators:
+                if self._busy.get(actuator) is job:
+                    del self._busy[actuator]
+            if not self.should_stop:
+                self._start_ready()
     
     async def _execute_action(self, action_data: Dict[str, Any]):
         """
@@ -130,7 +258,6 @@ class ActionsQueue:
         """
         action_name = None
         try:
-            self.is_executing = True
             action_name = action_data.get('action')
             params = action_data.get('params', {})
             
@@ -143,8 +270,10 @@ class ActionsQueue:
                 except Exception as e:
                     logger.error(f"Error in event_callback (action_started): {e}")
             
-            # Load and execute the action script
-            result = await self._load_and_execute_script(action_name, params)
+            # Look up and execute the action script
+            exec_start = time.monotonic()
+            result = await self._load_and_execute_script(action_name, params, action_data.get('enqueued_at'))
+            execution_ms = (time.monotonic() - exec_start) * 1000
             
             if result.get('status') == 'failed' or 'error' in result:
                 error_msg = result.get('error', 'Unknown error')
@@ -157,7 +286,7 @@ class ActionsQueue:
                     except Exception as e:
                         logger.error(f"Error in event_callback (action_failed): {e}")
             else:
-                logger.info(f"   ✓ Action completed successfully")
+                logger.info(f"   ✓ Action completed successfully ({execution_ms:.0f}ms)")
                 
                 # Emit action_completed event
                 if self.event_callback:
@@ -176,40 +305,31 @@ class ActionsQueue:
                     self.event_callback("action_failed", {"action": action_name, "error": str(e)})
                 except Exception as e2:
                     logger.error(f"Error in event_callback (action_failed): {e2}")
-        finally:
-            self.is_executing = False
     
-    async def _load_and_execute_script(self, action_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _load_and_execute_script(self, action_name: str, params: Dict[str, Any],
+                                       enqueued_at: Optional[float] = None) -> Dict[str, Any]:
         """
-        Load and execute an action script from tools_repository/scripts/.
+        Look up an action script in the registry and execute it.
         
         Args:
             action_name: Name of the action (e.g., 'nod_head', 'look_at_direction')
             params: Parameters to pass to the action
+            enqueued_at: time.monotonic() when the action was enqueued, for dispatch latency
             
         Returns:
             Result dictionary from the action execution
         """
-        script_file = self.scripts_path / f"{action_name}.py"
+        script, error = self.registry.get(action_name)
+        if script is None:
+            logger.error(f"   ❌ {error}")
+            return {"error": error, "status": "failed"}
         
-        if not script_file.exists():
-            logger.error(f"   ❌ Action script not found: {script_file}")
-            return {"error": f"Action script not found: {action_name}", "status": "failed"}
+        if enqueued_at is not None:
+            self._record_dispatch(action_name, (time.monotonic() - enqueued_at) * 1000)
         
         try:
-            # Load the script module
-            spec = importlib.util.spec_from_file_location(action_name, script_file)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            # Check if module has execute function
-            if not hasattr(module, 'execute'):
-                return {"error": f"Action script missing execute function: {action_name}", "status": "failed"}
-            
-            logger.info(f"   ✓ Action script loaded: {script_file}")
-
             # Execute the action with gateway instance
-            result = await module.execute(
+            result = await script.execute(
                 self.gateway,
                 self.tts_queue,
                 params
@@ -218,10 +338,34 @@ class ActionsQueue:
             return result if result else {"status": "success"}
             
         except Exception as e:
-            logger.error(f"   ❌ Error loading/executing script: {e}")
+            logger.error(f"   ❌ Error executing script: {e}")
             traceback.print_exc()
             return {"error": str(e), "status": "failed"}
     
+    def _record_dispatch(self, action_name: str, dispatch_ms: float):
+        """Record enqueue -> execute() latency for an action."""
+        stats = self.dispatch_stats.setdefault(action_name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += dispatch_ms
+        stats["max_ms"] = max(stats["max_ms"], dispatch_ms)
+        logger.info(f"   ⏱️  Dispatch latency for {action_name}: {dispatch_ms:.1f}ms")
+    
+    def get_dispatch_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-action dispatch latency summary.
+        
+        Returns:
+            {action: {"count", "avg_ms", "max_ms"}}
+        """
+        return {
+            name: {
+                "count": stats["count"],
+                "avg_ms": stats["total_ms"] / stats["count"],
+                "max_ms": stats["max_ms"]
+            }
+            for name, stats in self.dispatch_stats.items()
+        }
+    
     # DEPRECATED: This method is kept for backward compatibility only
     # New scripts should use controller.move_smoothly_to() instead
     def _create_head_pose(
@@ -278,24 +422,28 @@ class ActionsQueue:
         """Make an HTTP request to the Reachy Mini daemon."""
         url = f"{self.reachy_base_url}{endpoint}"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                if method.upper() == "GET":
-                    response = await client.get(url, params=params)
-                elif method.upper() == "POST":
-                    response = await client.post(url, json=json_data)
-                elif method.upper() == "PUT":
-                    response = await client.put(url, json=json_data)
-                elif method.upper() == "DELETE":
-                    response = await client.delete(url)
-                else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                response.raise_for_status()
-                return response.json() if response.content else {"status": "success"}
-                
-            except httpx.HTTPError as e:
-                return {"error": str(e), "status": "failed"}
+        # Reuse one keep-alive client for all daemon calls instead of a new connection per request
+        if self.http_client is None or self.http_client.is_closed:
+            self.http_client = httpx.AsyncClient(timeout=30.0)
+        client = self.http_client
+        
+        try:
+            if method.upper() == "GET":
+                response = await client.get(url, params=params)
+            elif method.upper() == "POST":
+                response = await client.post(url, json=json_data)
+            elif method.upper() == "PUT":
+                response = await client.put(url, json=json_data)
+            elif method.upper() == "DELETE":
+                response = await client.delete(url)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            response.raise_for_status()
+            return response.json() if response.content else {"status": "success"}
+            
+        except httpx.HTTPError as e:
+            return {"error": str(e), "status": "failed"}
     
     def parse_action_string(self, action_string: str) -> Dict[str, Any]:
         """
@@ -385,7 +533,7 @@ class ActionsQueue:
             params: Dictionary of parameters
         """
         logger.info(f"⚙️  Enqueueing command: {action_name}")
-        self.action_queue.put({"action": action_name, "params": params})
+        self.action_queue.put({"action": action_name, "params": params, "enqueued_at": time.monotonic()})
     
     def enqueue_action(self, action_string: str):
         """
@@ -396,6 +544,7 @@ class ActionsQueue:
         """
         try:
             action_data = self.parse_action_string(action_string)
+            action_data["enqueued_at"] = time.monotonic()
             logger.info(f"⚙️  Enqueueing action: {action_data['action']}")
             self.action_queue.put(action_data)
         except Exception as e:
@@ -412,9 +561,19 @@ class ActionsQueue:
             except Empty:
                 break
         
+        # Drop actions admitted to the scheduler but still waiting for a lane
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._clear_pending)
+        
         if cleared_count > 0:
             logger.info(f"🚫 Actions queue cleared ({cleared_count} actions removed)")
     
+    def _clear_pending(self):
+        """Drop waiting (not yet started) actions; runs on the worker loop."""
+        if self._pending:
+            logger.info(f"🚫 {len(self._pending)} waiting actions removed")
+            self._pending.clear()
+    
     def cleanup(self):
         """Clean up resources."""
         # Stop execution thread
@@ -428,6 +587,9 @@ class ActionsQueue:
         if self.execution_thread and self.execution_thread.is_alive():
             self.execution_thread.join(timeout=2.0)
         
+        for name, stats in sorted(self.get_dispatch_stats().items()):
+            logger.info(f"   {name}: {stats['count']} runs, dispatch avg {stats['avg_ms']:.1f}ms / max {stats['max_ms']:.1f}ms")
+        
         logger.info("🧹 Actions queue cleanup complete")
 
 
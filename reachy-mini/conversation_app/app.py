@@ -35,7 +35,6 @@ import httpx
 import traceback
 import os
 import sys
-import base64
 from pathlib import Path
 from typing import List, Dict, Any
 import logging
@@ -89,9 +88,8 @@ class ConversationApp:
         self.action_handler = None  # Will be initialized in initialize()
         self.movement_manager = None  # Will be initialized in initialize()
         
-        # Video frame memory - store recent frame paths
-        self.recent_frames = []  # List of recent frame paths
-        self.max_frames_in_memory = int(os.getenv('MAX_FRAMES_IN_MEMORY', '10'))
+        # Recent video frames live in the gateway's in-memory FrameStore (see _latest_frame)
+        self.max_frame_age_s = float(os.getenv('MAX_FRAME_AGE_S', '5.0'))
         
         # DOA from most recent speech event (for parameterized actions)
         self.current_doa = None  # Dict with angle_degrees and angle_radians
@@ -102,22 +100,17 @@ class ConversationApp:
         # Conversation audit logging
         self.audit_log_path = None
 
-    def _encode_image_to_base64(self, image_path: str) -> str:
+    def _latest_frame(self):
         """
-        Encode an image file to base64 for API transmission.
+        Get the most recent camera frame if it is fresh enough to attach to a request.
         
-        Args:
-            image_path: Path to the image file
-            
         Returns:
-            Base64-encoded string of the image
+            StoredFrame from the gateway's frame store, or None
         """
-        try:
-            with open(image_path, 'rb') as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
-        except Exception as e:
-            logger.error(f"Failed to encode image {image_path}: {e}")
+        gateway_video = getattr(self.gateway, 'gateway_video', None) if self.gateway else None
+        if gateway_video is None:
             return None
+        return gateway_video.frame_store.latest(max_age_s=self.max_frame_age_s)
 
     async def initialize(self):
         """Initialize the application."""
@@ -387,22 +380,15 @@ class ConversationApp:
         Callback for video frame captured events.
         
         Args:
-            data: Event data containing frame_number, file_path, timestamp, etc.
+            data: Event data containing frame_number, file_path (None unless frames are saved), timestamp, etc.
         """
         frame_number = data.get("frame_number")
         file_path = data.get("file_path")
         total_frames = data.get("total_frames")
         
-        logger.info(f"🎥 Video frame captured: #{frame_number} (total: {total_frames}) - {file_path}")
-        
-        # Store frame path in memory
-        self.recent_frames.append(file_path)
-        
-        # Keep only the most recent frames in memory
-        if len(self.recent_frames) > self.max_frames_in_memory:
-            self.recent_frames = self.recent_frames[-self.max_frames_in_memory:]
-        
-        logger.debug(f"Stored frame path in memory. Total frames in memory: {len(self.recent_frames)}")
+        # The frame itself is already in the gateway's frame store
+        logger.debug(f"🎥 Video frame captured: #{frame_number} (total: {total_frames})"
+                     + (f" - {file_path}" if file_path else ""))
     
     async def on_vision_result(self, data: Dict[str, Any]):
         """
@@ -638,36 +624,21 @@ class ConversationApp:
         # Construct multimodal message content
         content = [{"type": "text", "text": user_message}]
         
-        # Add the latest frame if available and recent (< 5 seconds old)
-        if self.recent_frames:
-            latest_frame_path = self.recent_frames[-1]
-            
-            # Check if frame is recent enough
+        # Add the latest frame if available and recent (< MAX_FRAME_AGE_S old)
+        frame = self._latest_frame()
+        if frame is not None:
             try:
-                from pathlib import Path
-                frame_mtime = Path(latest_frame_path).stat().st_mtime
-                current_time = time.time()
-                frame_age_seconds = current_time - frame_mtime
-                
-                if frame_age_seconds < 5.0:
-                    # Encode image to base64
-                    image_base64 = self._encode_image_to_base64(latest_frame_path)
-                    
-                    if image_base64:
-                        # Add image to content
-                        content.append({
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}"
-                            }
-                        })
-                        logger.info(f"📸 Added image to request: {latest_frame_path} (age: {frame_age_seconds:.1f}s)")
-                    else:
-                        logger.warning(f"Failed to encode image: {latest_frame_path}")
-                else:
-                    logger.debug(f"Frame too old ({frame_age_seconds:.1f}s), skipping image")
+                # Encoded once per frame and cached, so repeated turns on the same frame are free
+                image_url = await asyncio.to_thread(frame.data_url)
+                content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": image_url
+                    }
+                })
+                logger.info(f"📸 Added image to request: frame #{frame.frame_number} (age: {frame.age_s:.1f}s)")
             except Exception as e:
-                logger.error(f"Error checking frame age: {e}")
+                logger.error(f"Failed to encode frame #{frame.frame_number}: {e}")
         
         # Add user message to conversation
         user_msg = {"role": "user", "content": content}
@@ -1012,6 +983,9 @@ class ConversationApp:
             await asyncio.sleep(0.5)  # Give it time to shutdown gracefully
             self.gateway.cleanup()
         
+        # Write out queued audit log entries
+        get_logger().close()
+        
         logger.info("   ✓ Cleanup complete")
 
 
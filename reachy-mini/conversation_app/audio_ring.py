@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Audio Ring Buffers - preallocated sample storage for the capture loop
+
+This module provides:
+1. AudioRingBuffer: fixed-capacity circular buffer for capture and pre-roll,
+   with contiguous zero-copy reads and overrun accounting
+2. AudioAccumulator: growable utterance buffer that is reused across
+   utterances instead of collecting lists of small arrays
+
+Both hand out NumPy views into their storage.  A view is only valid until the
+region it covers is overwritten, so callers that keep audio across awaits
+must either stay within the documented capacity or take a copy.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRingBuffer:
+    """Preallocated circular sample buffer with contiguous zero-copy reads.
+
+    Samples are stored twice (at ``i`` and ``i + capacity``) so any window of
+    up to ``capacity`` samples is a single contiguous slice, never a copy.
+
+    In FIFO mode (``rolling=False``) unread samples that get overwritten are
+    counted as an overrun.  In rolling mode (pre-roll) overwriting the oldest
+    samples is the point, so nothing is counted.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16, rolling: bool = False, name: str = "ring"):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity: Maximum number of samples held
+            dtype: Sample dtype
+            rolling: Keep only the latest samples without overrun accounting
+            name: Label used in overrun log messages
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.rolling = rolling
+        self.name = name
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._written = 0  # Total samples ever written
+        self._read = 0  # Total samples ever consumed (FIFO mode)
+        self.overrun_samples = 0
+        self.overrun_events = 0
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Append samples, overwriting the oldest ones when full.
+
+        Args:
+            samples: 1-D array of samples (converted to the buffer dtype on copy)
+
+        Returns:
+            Number of unread samples dropped by this write (always 0 in rolling mode)
+        """
+        n = len(samples)
+        if n == 0:
+            return 0
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            skipped = n - self.capacity
+            self._written += skipped
+            n = self.capacity
+
+        cap = self.capacity
+        start = self._written % cap
+        first = min(n, cap - start)
+        # Each sample goes to p and p + capacity
+        self._buf[start:start + first] = samples[:first]
+        self._buf[start + cap:start + cap + first] = samples[:first]
+        if first < n:
+            rest = n - first
+            self._buf[:rest] = samples[first:]
+            self._buf[cap:cap + rest] = samples[first:]
+        self._written += n
+
+        if self.rolling:
+            return 0
+        dropped = self._written - self._read - cap
+        if dropped > 0:
+            self._read += dropped
+            self.overrun_samples += dropped
+            self.overrun_events += 1
+            logger.warning(f"Audio {self.name} overrun: dropped {dropped} unread samples "
+                           f"({self.overrun_events} overruns, {self.overrun_samples} samples total)")
+            return dropped
+        return 0
+
+    @property
+    def available(self) -> int:
+        """Number of unread samples (FIFO mode)."""
+        return self._written - self._read
+
+    def __len__(self) -> int:
+        """Number of valid samples currently held."""
+        return min(self._written, self.capacity)
+
+    def _view(self, logical_start: int, n: int) -> np.ndarray:
+        start = logical_start % self.capacity
+        return self._buf[start:start + n]
+
+    def read(self, n: int) -> Optional[np.ndarray]:
+        """
+        Consume the next ``n`` unread samples.
+
+        Returns:
+            Zero-copy view, or None if fewer than ``n`` samples are available
+        """
+        if n > self.capacity or self.available < n:
+            return None
+        view = self._view(self._read, n)
+        self._read += n
+        return view
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the most recent ``n`` samples (default: everything held)."""
+        n = len(self) if n is None else min(n, len(self))
+        return self._view(self._written - n, n)
+
+    def clear(self):
+        """Drop all samples (storage is kept)."""
+        self._written = 0
+        self._read = 0
+
+
+class AudioAccumulator:
+    """Growable sample buffer for one utterance, reused across utterances.
+
+    ``append`` copies into preallocated storage (doubling when full) and
+    ``view`` returns a zero-copy slice of everything appended so far.
+    ``clear`` keeps the storage, so steady-state capture does not allocate.
+    A view stays valid until ``clear`` is called and the region is rewritten.
+    """
+
+    def __init__(self, initial_capacity: int, dtype=np.int16):
+        """
+        Initialize the accumulator.
+
+        Args:
+            initial_capacity: Initial storage size in samples
+            dtype: Sample dtype
+        """
+        self._buf = np.zeros(max(1, initial_capacity), dtype=dtype)
+        self._len = 0
+
+    def append(self, samples: np.ndarray):
+        """Copy samples onto the end of the buffer."""
+        n = len(samples)
+        needed = self._len + n
+        if needed > len(self._buf):
+            new_capacity = len(self._buf)
+            while new_capacity < needed:
+                new_capacity *= 2
+            grown = np.zeros(new_capacity, dtype=self._buf.dtype)
+            grown[:self._len] = self._buf[:self._len]
+            self._buf = grown
+        self._buf[self._len:needed] = samples
+        self._len = needed
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of samples ``[start:end]`` appended so far."""
+        end = self._len if end is None else min(end, self._len)
+        return self._buf[start:end]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def clear(self):
+        """Reset to empty, keeping the storage."""
+        self._len = 0
@@ -6,19 +6,19 @@ This module handles speech events from the hearing_event_emitter service,
 managing socket connections and event processing.
 
 Key features:
-1. Unix Domain Socket connection management
-2. Event listening and parsing
+1. Unix Domain Socket connection management (asyncio, see event_transport)
+2. Event listening and parsing (length-prefixed frames or legacy newline JSON)
 3. Speech started/stopped event handling
 4. Event-driven conversation flow
 """
 
 import asyncio
-import json
-import socket
 import os
 import logging
 from typing import Dict, Any, Callable, Optional, Awaitable
 
+from .event_transport import EventClient, FrameError
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,8 +33,7 @@ class EventHandler:
             socket_path: Path to the Unix Domain Socket (default: from SOCKET_PATH env var)
         """
         self.socket_path = socket_path or os.getenv('SOCKET_PATH', '/tmp/reachy_sockets/hearing.sock')
-        self.socket: Optional[socket.socket] = None
-        self.socket_buffer = ""
+        self.client: Optional[EventClient] = None
         
         # State tracking
         self.is_speaking = False
@@ -65,27 +64,11 @@ class EventHandler:
                 # Check if socket file exists
                 if not os.path.exists(self.socket_path):
                     logger.warning(f"Socket file does not exist: {self.socket_path}")
-                else:
-                    logger.info(f"Socket file exists: {self.socket_path}")
-                    # Check file permissions
-                    import stat
-                    st = os.stat(self.socket_path)
-                    logger.info(f"Socket permissions: {oct(st.st_mode)}")
                 
-                self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                self.socket.connect(self.socket_path)
-                self.socket.setblocking(False)
+                self.client = EventClient(self.socket_path)
+                await self.client.connect()
                 
                 logger.info("✓ Connected to hearing service")
-                logger.info(f"   Socket FD: {self.socket.fileno()}")
-                
-                # Try to get peer name (Unix sockets don't really have this, but try anyway)
-                try:
-                    peer = self.socket.getpeername()
-                    logger.info(f"   Peer: {peer}")
-                except:
-                    logger.info(f"   (Unix socket, no peer name)")
-                
                 return
                 
             except (FileNotFoundError, ConnectionRefusedError) as e:
@@ -105,64 +88,40 @@ class EventHandler:
     async def listen(self):
         """Listen to events from the hearing service."""
         logger.info("Starting event listener...")
-        logger.info(f"Socket file descriptor: {self.socket.fileno()}")
-        logger.info(f"Socket is connected: {self.socket.getpeername() if hasattr(self.socket, 'getpeername') else 'unknown'}")
         
         event_count = 0
-        last_data_time = asyncio.get_event_loop().time()
         
         while True:
             try:
-                # Try to receive data (non-blocking)
-                try:
-                    data = await asyncio.to_thread(self.socket.recv, 4096)
-                    
-                    if not data:
-                        logger.warning("Socket closed by server (received empty data)")
-                        break
-                    
-                    current_time = asyncio.get_event_loop().time()
-                    time_since_last = current_time - last_data_time
-                    last_data_time = current_time
-                    
-                    logger.debug(f"Received {len(data)} bytes from socket (time since last: {time_since_last:.2f}s)")
-                    
-                    # Add to buffer
-                    self.socket_buffer += data.decode('utf-8')
-                    logger.debug(f"Buffer size: {len(self.socket_buffer)} chars")
-                    
-                    # Process complete lines (events)
-                    lines_processed = 0
-                    while '\n' in self.socket_buffer:
-                        line, self.socket_buffer = self.socket_buffer.split('\n', 1)
-                        if line.strip():
-                            lines_processed += 1
-                            event_count += 1
-                            logger.info(f"Processing event #{event_count} from buffer")
-                            await self._handle_event(line)
-                    
-                    if lines_processed > 0:
-                        logger.debug(f"Processed {lines_processed} line(s), remaining buffer: {len(self.socket_buffer)} chars")
-                            
-                except BlockingIOError:
-                    # No data available, sleep briefly
-                    await asyncio.sleep(0.1)
-                except Exception as recv_error:
-                    logger.error(f"Error receiving data: {recv_error}", exc_info=True)
-                    await asyncio.sleep(0.1)
-                    
+                # Wakes up as soon as a complete event arrives
+                event = await self.client.read_event()
+                
+                if event is None:
+                    logger.warning("Socket closed by server")
+                    break
+                
+                event_count += 1
+                logger.info(f"Processing event #{event_count}")
+                await self._handle_event(event)
+                
+            except FrameError as e:
+                # Corrupt length prefix: the stream can no longer be trusted
+                logger.error(f"Failed to read event frame: {e}")
+                break
+            except ValueError as e:
+                # Malformed payload or JSON line: already consumed, skip it
+                logger.error(f"Failed to decode event: {e}")
+                continue
             except Exception as e:
                 logger.error(f"Error in event listener main loop: {e}", exc_info=True)
                 await asyncio.sleep(1)
         
-        logger.warning(f"Event listener stopped after processing {event_count} events")
-        await asyncio.sleep(0.1)
+        logger.warning(f"Event listener stopped after processing {event_count} events "
+                       f"(delivery latency avg {self.client.latency_avg_ms:.2f}ms, max {self.client.latency_max_ms:.2f}ms)")
     
-    async def _handle_event(self, event_line: str):
+    async def _handle_event(self, event: Dict[str, Any]):
         """Handle a received event."""
         try:
-            logger.debug(f"Parsing event line: {event_line[:100]}...")
-            event = json.loads(event_line)
             event_type = event.get("type")
             event_data = event.get("data", {})
             
@@ -178,12 +137,9 @@ class EventHandler:
                 logger.warning(f"Unknown event type: {event_type}")
                 logger.debug(f"   Full unknown event: {event}")
                 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse event JSON: {e}")
-            logger.error(f"   Raw data: {event_line}")
         except Exception as e:
             logger.error(f"Error handling event: {e}", exc_info=True)
-            logger.error(f"   Event line was: {event_line}")
+            logger.error(f"   Event was: {event}")
     
     async def _on_speech_started(self, data: Dict[str, Any]):
         """Handle speech started event."""
@@ -246,9 +202,9 @@ class EventHandler:
     
     def close(self):
         """Close the socket connection."""
-        if self.socket:
+        if self.client:
             try:
-                self.socket.close()
+                self.client.close()
                 logger.info("Socket connection closed")
             except Exception as e:
                 logger.warning(f"Error closing socket: {e}")
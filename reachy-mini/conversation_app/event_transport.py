@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Event Transport - asyncio Unix socket transport for gateway events
+
+Replaces the polled newline-JSON sockets with an event-driven transport:
+1. EventServer: asyncio.start_unix_server, one bounded send queue and
+   writer task per client, so a slow client never delays the emitter or
+   the other clients
+2. EventClient: asyncio.open_unix_connection, wakes up as soon as a frame
+   arrives (no recv polling)
+
+Wire format, per event:
+
+    [4-byte big-endian length][1-byte codec][payload]
+
+where the length covers codec + payload.  Codec 0 is compact JSON, codec 1
+is msgpack (used when EVENT_CODEC=msgpack and msgpack is installed).
+
+Frames are limited to 16 MiB, so the first byte of a frame is always 0.
+EventClient uses that to also accept the legacy newline-JSON stream
+(first byte ``{``) from older emitters such as hearing_app.
+
+Every event is stamped with ``sent_at`` (epoch seconds) when it is emitted;
+EventClient adds ``received_at`` and tracks delivery latency.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+
+
+class FrameError(ValueError):
+    """Invalid length prefix: the stream is out of sync and can't be read further."""
+
+
+def encode_event(event: Dict[str, Any], codec: int = CODEC_JSON) -> bytes:
+    """Serialize an event into one length-prefixed frame."""
+    if codec == CODEC_MSGPACK:
+        payload = msgpack.packb(event, use_bin_type=True)
+    else:
+        payload = json.dumps(event, separators=(',', ':')).encode('utf-8')
+    if len(payload) + 1 > MAX_FRAME_BYTES:
+        raise ValueError(f"Event too large: {len(payload)} bytes")
+    return HEADER.pack(len(payload) + 1) + bytes((codec,)) + payload
+
+
+def decode_payload(codec: int, payload: bytes) -> Dict[str, Any]:
+    """Deserialize the payload of one frame."""
+    if codec == CODEC_MSGPACK:
+        if not HAS_MSGPACK:
+            raise ValueError("Received msgpack event but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    if codec == CODEC_JSON:
+        return json.loads(payload)
+    raise ValueError(f"Unknown event codec: {codec}")
+
+
+def default_codec() -> int:
+    """Codec selected by EVENT_CODEC (json or msgpack)."""
+    name = os.getenv('EVENT_CODEC', 'json').lower()
+    if name == 'msgpack':
+        if HAS_MSGPACK:
+            return CODEC_MSGPACK
+        logger.warning("EVENT_CODEC=msgpack but msgpack is not installed, using json")
+    return CODEC_JSON
+
+
+class _ClientConnection:
+    """One connected client: bounded send queue drained by a writer task."""
+
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int):
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.closed = False
+
+    async def run(self):
+        try:
+            while True:
+                frame = await self.queue.get()
+                if frame is None:
+                    break
+                self.writer.write(frame)
+                await self.writer.drain()  # Backpressure: wait for the socket, not the emitter
+                self.sent += 1
+        except (ConnectionError, BrokenPipeError) as e:
+            logger.warning(f"Client disconnected: {e}")
+        finally:
+            self.closed = True
+            self.writer.close()
+
+    def drop(self):
+        """Discard queued events and stop the writer task."""
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+        self.writer.transport.abort()  # Discard unsent bytes so a pending drain() returns now
+
+
+class EventServer:
+    """Unix socket server broadcasting length-prefixed events to all clients."""
+
+    def __init__(self, socket_path: str, queue_size: int = 256, codec: Optional[int] = None):
+        """
+        Initialize the server (call start() from the event loop).
+
+        Args:
+            socket_path: Path of the Unix Domain Socket
+            queue_size: Events buffered per client before it is dropped as too slow
+            codec: CODEC_JSON or CODEC_MSGPACK (default: from EVENT_CODEC)
+        """
+        self.socket_path = socket_path
+        self.queue_size = queue_size
+        self.codec = default_codec() if codec is None else codec
+        self.clients: List[_ClientConnection] = []
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.dropped_clients = 0
+
+    async def start(self):
+        """Create the socket file and start accepting clients."""
+        logger.debug(f"Setting up Unix socket server at {self.socket_path}")
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        self.server = await asyncio.start_unix_server(self._on_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o666)
+        logger.info(f"Socket server listening on {self.socket_path} "
+                    f"(codec: {'msgpack' if self.codec == CODEC_MSGPACK else 'json'})")
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = _ClientConnection(writer, self.queue_size)
+        self.clients.append(client)
+        logger.info(f"New client connected. Total clients: {len(self.clients)}")
+        await client.run()
+        if client in self.clients:
+            self.clients.remove(client)
+        logger.info(f"Client disconnected. Active: {len(self.clients)}")
+
+    def broadcast(self, event: Dict[str, Any]):
+        """
+        Queue an event for every client without waiting on any socket.
+
+        A copy of the event is stamped with ``sent_at`` and serialized once.  A client
+        whose queue is full is disconnected rather than silently losing
+        events (it can reconnect and resync).
+        """
+        if not self.clients:
+            return
+        event = {**event, "sent_at": time.time()}
+        frame = encode_event(event, self.codec)
+        for client in list(self.clients):
+            if client.closed:
+                continue
+            try:
+                client.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning(f"Client send queue full ({self.queue_size} events), disconnecting slow client")
+                self.dropped_clients += 1
+                self.clients.remove(client)
+                client.drop()
+
+    async def close(self):
+        """Flush and close client connections, stop the server and remove the socket file."""
+        for client in list(self.clients):
+            if not client.closed:
+                try:
+                    client.queue.put_nowait(None)  # Flush what is queued, then close
+                except asyncio.QueueFull:
+                    client.drop()
+        if self.server:
+            self.server.close()
+            try:
+                await asyncio.wait_for(self.server.wait_closed(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            self.server = None
+        self.clients.clear()
+        if os.path.exists(self.socket_path):
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+
+class EventClient:
+    """Reads events from an EventServer (or a legacy newline-JSON emitter)."""
+
+    def __init__(self, socket_path: str):
+        """
+        Args:
+            socket_path: Path of the Unix Domain Socket
+        """
+        self.socket_path = socket_path
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.legacy = None  # Detected from the first byte received
+
+        # Delivery latency stats (emit -> decoded here), in ms
+        self.received = 0
+        self.latency_samples = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+
+    async def connect(self):
+        """Open the connection (raises FileNotFoundError / ConnectionRefusedError)."""
+        self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_FRAME_BYTES)
+
+    async def read_event(self) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+
+        Returns:
+            Event dict, or None when the server closed the connection
+        
+        Raises:
+            FrameError: Invalid length prefix (the connection is unusable)
+            ValueError: Undecodable payload (already consumed; the next event can be read)
+        """
+        try:
+            if self.legacy is None:
+                first = await self.reader.readexactly(1)
+                self.legacy = first != b'\x00'
+                if self.legacy:
+                    logger.info("Peer sends newline-delimited JSON (legacy framing)")
+                    line = first + await self.reader.readuntil(b'\n')
+                    return self._stamp(json.loads(line))
+                header = first + await self.reader.readexactly(HEADER.size - 1)
+            elif self.legacy:
+                line = await self.reader.readuntil(b'\n')
+                while not line.strip():
+                    line = await self.reader.readuntil(b'\n')
+                return self._stamp(json.loads(line))
+            else:
+                header = await self.reader.readexactly(HEADER.size)
+
+            (length,) = HEADER.unpack(header)
+            if not 1 <= length <= MAX_FRAME_BYTES:
+                raise FrameError(f"Invalid frame length: {length}")
+            frame = await self.reader.readexactly(length)
+            return self._stamp(decode_payload(frame[0], frame[1:]))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return None
+
+    def _stamp(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        event["received_at"] = time.time()
+        self.received += 1
+        sent_at = event.get("sent_at")
+        if sent_at:
+            latency_ms = (event["received_at"] - sent_at) * 1000
+            self.latency_samples += 1
+            self.latency_total_ms += latency_ms
+            self.latency_max_ms = max(self.latency_max_ms, latency_ms)
+            logger.debug(f"Event {event.get('type')} delivered in {latency_ms:.2f}ms")
+        return event
+
+    @property
+    def latency_avg_ms(self) -> float:
+        return self.latency_total_ms / self.latency_samples if self.latency_samples else 0.0
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Frame Store - bounded in-memory ring of recent camera frames
+
+GatewayVideo puts every polled frame here instead of writing a JPEG to disk.
+Consumers (the conversation turn attaching the latest image, debugging
+tools) look frames up by recency or frame number.
+
+Each frame keeps its raw BGR array.  The JPEG and base64 encodings are
+produced at most once, on first request, and cached on the frame, so
+repeated lookups of the same frame cost nothing and frames nobody asks for
+are never encoded.
+"""
+
+import base64
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import cv2
+    HAS_CV2 = True
+except ImportError:
+    HAS_CV2 = False
+
+
+@dataclass
+class StoredFrame:
+    """One captured frame with lazily cached encodings."""
+    frame_number: int
+    timestamp: int  # Capture time in milliseconds since epoch
+    image: np.ndarray  # BGR, must not be modified after storing
+    jpeg_quality: int = 85
+    _jpeg: Optional[bytes] = field(default=None, repr=False)
+    _base64: Optional[str] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def age_s(self) -> float:
+        """Seconds since capture."""
+        return time.time() - self.timestamp / 1000
+
+    def jpeg(self) -> bytes:
+        """JPEG encoding of the frame (encoded once, then cached)."""
+        with self._lock:
+            if self._jpeg is None:
+                start = time.time()
+                self._jpeg = encode_jpeg(self.image, self.jpeg_quality)
+                logger.debug(f"Encoded frame #{self.frame_number} to JPEG "
+                             f"({len(self._jpeg)} bytes, {(time.time() - start) * 1000:.1f}ms)")
+            return self._jpeg
+
+    def base64(self) -> str:
+        """Base64 of the JPEG encoding (cached)."""
+        jpeg = self.jpeg()
+        with self._lock:
+            if self._base64 is None:
+                self._base64 = base64.b64encode(jpeg).decode('utf-8')
+            return self._base64
+
+    def data_url(self) -> str:
+        """JPEG as a data URL for multimodal chat requests."""
+        return f"data:image/jpeg;base64,{self.base64()}"
+
+
+def encode_jpeg(image_bgr: np.ndarray, quality: int = 85) -> bytes:
+    """Encode a BGR frame to JPEG with OpenCV, falling back to PIL."""
+    if HAS_CV2:
+        ok, buf = cv2.imencode('.jpg', image_bgr, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return buf.tobytes()
+
+    import io
+    from PIL import Image
+    out = io.BytesIO()
+    Image.fromarray(image_bgr[:, :, ::-1]).save(out, format='JPEG', quality=quality)  # BGR -> RGB
+    return out.getvalue()
+
+
+class FrameStore:
+    """Thread-safe ring of the last ``capacity`` frames."""
+
+    def __init__(self, capacity: int = 10, jpeg_quality: int = 85):
+        """
+        Initialize the store.
+
+        Args:
+            capacity: Number of most recent frames kept
+            jpeg_quality: JPEG quality used when a frame is encoded
+        """
+        self.capacity = max(1, capacity)
+        self.jpeg_quality = jpeg_quality
+        self._frames: deque = deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+
+    def add(self, image: np.ndarray, frame_number: int, timestamp: Optional[int] = None) -> StoredFrame:
+        """
+        Store a frame, evicting the oldest one when full.
+
+        Args:
+            image: BGR frame (the store keeps a reference, not a copy)
+            frame_number: Frame number in the stream
+            timestamp: Capture time in ms (default: now)
+
+        Returns:
+            The stored frame
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        frame = StoredFrame(frame_number, timestamp, image, self.jpeg_quality)
+        with self._lock:
+            self._frames.append(frame)
+        return frame
+
+    def latest(self, max_age_s: Optional[float] = None) -> Optional[StoredFrame]:
+        """
+        Most recent frame.
+
+        Args:
+            max_age_s: Return None if the newest frame is older than this
+
+        Returns:
+            StoredFrame or None
+        """
+        with self._lock:
+            frame = self._frames[-1] if self._frames else None
+        if frame is None or (max_age_s is not None and frame.age_s > max_age_s):
+            return None
+        return frame
+
+    def get(self, frame_number: int) -> Optional[StoredFrame]:
+        """Look up a frame still held in the store by its frame number."""
+        with self._lock:
+            for frame in reversed(self._frames):
+                if frame.frame_number == frame_number:
+                    return frame
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
@@ -19,10 +19,8 @@ Usage:
 import time
 import numpy as np
 import os
-import socket
 import sys
 import logging
-import json
 import argparse
 import signal
 from datetime import datetime
@@ -35,6 +33,7 @@ from .gateway_audio import GatewayAudio
 #from .gateway_video import GatewayVideo
 
 from .reachy_controller import ReachyController
+from .event_transport import EventServer
 
 # Set up logging
 logging.basicConfig(
@@ -104,11 +103,13 @@ class ReachyGateway:
         else:
             logger.info("Video processing component: Disabled (ENABLE_VISION=false)")
         
-        # Socket setup (conditional)
-        self.server_socket = None
-        self.clients = []
+        # Socket setup (conditional); the server itself starts with the event loop in run()
+        self.event_server = None
         if self.enable_socket_server:
-            self.setup_socket_server()
+            self.event_server = EventServer(
+                self.socket_path,
+                queue_size=int(os.getenv('EVENT_CLIENT_QUEUE_SIZE', '256'))
+            )
         else:
             logger.info("Socket server disabled - using callback mode")
         
@@ -128,29 +129,6 @@ class ReachyGateway:
         signal.signal(signal.SIGINT, signal_handler)
         logger.info("Signal handlers registered for SIGTERM and SIGINT")
     
-    def setup_socket_server(self):
-        """Set up Unix Domain Socket server"""
-        logger.debug(f"Setting up Unix socket server at {self.socket_path}")
-        
-        # Create socket directory if it doesn't exist
-        socket_dir = os.path.dirname(self.socket_path)
-        os.makedirs(socket_dir, exist_ok=True)
-        
-        # Remove existing socket file if it exists
-        if os.path.exists(self.socket_path):
-            os.remove(self.socket_path)
-        
-        # Create socket
-        self.server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        self.server_socket.bind(self.socket_path)
-        self.server_socket.listen(5)
-        self.server_socket.setblocking(False)
-        
-        # Set permissions
-        os.chmod(self.socket_path, 0o666)
-        
-        logger.info(f"Socket server listening on {self.socket_path}")
-    
     def move_smoothly_to(self, duration=1.0, roll=None, pitch=None, yaw=None, antennas=None, body_yaw=None):
         """Move the robot smoothly to a target head pose and/or antennas position and/or body direction."""
         self.reachy_controller.move_smoothly_to(duration=duration, roll=roll, pitch=pitch, yaw=yaw, antennas=antennas, body_yaw=body_yaw)
@@ -202,27 +180,6 @@ class ReachyGateway:
             return self.reachy_controller._degrees_to_compass(degrees)
         return "North"
     
-    async def accept_clients(self):
-        """Accept new client connections"""
-        if not self.enable_socket_server:
-            return
-        
-        while not self.shutdown_requested:
-            try:
-                try:
-                    client_socket, _ = self.server_socket.accept()
-                    client_socket.setblocking(False)
-                    self.clients.append(client_socket)
-                    logger.info(f"New client connected. Total clients: {len(self.clients)}")
-                except BlockingIOError:
-                    pass
-                
-                await asyncio.sleep(0.1)
-            except Exception as e:
-                if not self.shutdown_requested:
-                    logger.error(f"Error accepting clients: {e}")
-                await asyncio.sleep(1)
-    
     async def emit_event(self, event_type, data=None):
         """Emit event to all connected clients and/or callback asynchronously"""
         event = {
@@ -247,35 +204,13 @@ class ReachyGateway:
             except Exception as e:
                 logger.error(f"Error in event callback: {e}", exc_info=True)
         
-        # Send to socket clients if enabled
-        if self.enable_socket_server:
-            message = json.dumps(event) + "\n"
-            message_bytes = message.encode('utf-8')
-            
-            # Send to all clients
-            disconnected_clients = []
-            for client in self.clients:
-                try:
-                    await asyncio.to_thread(client.sendall, message_bytes)
-                except (BrokenPipeError, ConnectionResetError) as e:
-                    logger.warning(f"Client disconnected: {e}")
-                    disconnected_clients.append(client)
-                except Exception as e:
-                    logger.error(f"Error sending to client: {e}")
-                    disconnected_clients.append(client)
-            
-            # Remove disconnected clients
-            for client in disconnected_clients:
-                try:
-                    client.close()
-                except:
-                    pass
-                self.clients.remove(client)
-            
-            if disconnected_clients:
-                logger.info(f"Removed {len(disconnected_clients)} disconnected clients. Active: {len(self.clients)}")
-            
-            logger.debug(f"Emitted event to {len(self.clients)} socket clients: {event_type}")
+        # Queue for socket clients if enabled (never waits on a client socket)
+        if self.event_server:
+            try:
+                self.event_server.broadcast(event)
+                logger.debug(f"Emitted event to {len(self.event_server.clients)} socket clients: {event_type}")
+            except Exception as e:
+                logger.error(f"Error sending event to clients: {e}")
         
         logger.debug(f"Emitted event: {event_type}")
     
@@ -302,9 +237,8 @@ class ReachyGateway:
         # Start tasks
         tasks = []
         
-        if self.enable_socket_server:
-            accept_task = asyncio.create_task(self.accept_clients())
-            tasks.append(accept_task)
+        if self.event_server:
+            await self.event_server.start()
         
         # Delegate audio processing to gateway_audio
         listen_task = asyncio.create_task(self.gateway_audio.listen())
@@ -347,6 +281,8 @@ class ReachyGateway:
         except Exception as e:
             logger.error(f"Error during service operation: {e}", exc_info=True)
         finally:
+            if self.event_server:
+                await self.event_server.close()
             self.cleanup()
     
     def cleanup(self):
@@ -379,22 +315,8 @@ class ReachyGateway:
             except Exception as e:
                 logger.error(f"Error cleaning up DOA detector: {e}")
         
-        # Close all client connections
-        for client in self.clients:
-            try:
-                client.close()
-            except:
-                pass
-        
-        # Close server socket
-        if self.server_socket:
-            try:
-                self.server_socket.close()
-            except:
-                pass
-        
-        # Remove socket file
-        if os.path.exists(self.socket_path):
+        # Remove socket file (client connections are closed by EventServer.close() in run())
+        if self.event_server and os.path.exists(self.socket_path):
             try:
                 os.remove(self.socket_path)
             except:
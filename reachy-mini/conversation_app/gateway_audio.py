@@ -23,7 +23,8 @@ import soundfile as sf
 # Import our custom modules
 from .vad_detector import VADDetector
 from .silero_vad import SileroVAD
-from .whisper_stt import WhisperSTT
+from .whisper_stt import WhisperSTT, StreamingTranscriber, WHISPER_SAMPLE_RATE
+from .audio_ring import AudioRingBuffer, AudioAccumulator
 from .logger import get_logger
 
 logger = logging.getLogger(__name__)
@@ -85,18 +86,23 @@ class GatewayAudio:
         self.min_partial_chunks = int(os.getenv('MIN_PARTIAL_CHUNKS', '10'))
         
         # Buffers
+        # audio_buffer holds zero-copy chunk views into capture_ring, so the ring is sized
+        # to cover the whole backlog plus one second of headroom for the incoming sample
         buffer_size = int(os.getenv('AUDIO_BUFFER_SIZE', '100'))
         self.audio_buffer = deque(maxlen=buffer_size)
-        self.speech_buffer = []
-        self.post_speech_buffer = []
+        self.audio_buffer_overruns = 0  # Chunks dropped because process() fell behind
+        self.capture_ring = AudioRingBuffer(self.chunk_size * (buffer_size + 1) + self.rate, name="capture")
         
-        # Incoming buffer for exact chunk sizing (VAD requirement)
-        self.incoming_buffer = np.array([], dtype=np.int16)
+        # Utterance audio (speech + post-speech chunks, in arrival order)
+        self.speech_audio = AudioAccumulator(self.rate * 10)
+        self.speech_chunk_count = 0
+        self.post_speech_chunk_count = 0
         
         # Recording state with pre-roll buffer
         self.pre_roll_duration = float(os.getenv('PRE_ROLL_DURATION', '2.0'))  # seconds of audio before speech
-        self.pre_roll_buffer = deque(maxlen=int(self.rate * self.pre_roll_duration / self.chunk_size))
-        self.recording_samples = []
+        pre_roll_chunks = max(1, int(self.rate * self.pre_roll_duration / self.chunk_size))
+        self.pre_roll_ring = AudioRingBuffer(pre_roll_chunks * self.chunk_size, rolling=True, name="pre-roll")
+        self.recording_audio = AudioAccumulator(self.rate * 10)
         self.recording_active = False  # Track if we're currently recording speech
         self.recording_start_time = None
         self.speech_gap_tolerance = int(os.getenv('SPEECH_GAP_TOLERANCE', '30'))  # Allow N non-speech readings before stopping
@@ -157,7 +163,16 @@ class GatewayAudio:
             model_path_or_size=whisper_model_path_or_size,
             device=whisper_device,
             compute_type=whisper_compute_type,
-            language=self.language
+            language=self.language,
+            condition_on_previous_text=os.getenv('WHISPER_CONDITION_ON_PREVIOUS_TEXT', 'false').lower() == 'true'
+        )
+        
+        # Streaming transcription: partials commit stable words so the final pass only covers the tail
+        self.streaming_stt = StreamingTranscriber(
+            self.whisper,
+            sample_rate=self.rate,
+            overlap_s=float(os.getenv('STREAMING_STT_OVERLAP', '0.5')),
+            partial_beam_size=int(os.getenv('PARTIAL_BEAM_SIZE', '1'))
         )
         
         logger.info("Gateway Audio initialization complete")
@@ -191,29 +206,34 @@ class GatewayAudio:
                     logger.error(f"Expected mono audio (1D array), got shape: {sample.shape}")
                     continue
                 
-                # ReachyMini may return float arrays, convert to int16 if needed
+                # ReachyMini may return float arrays; the ring converts to int16 as it copies
                 if sample.dtype == np.float32 or sample.dtype == np.float64:
-                    # Normalize and convert to int16
-                    np_data = (sample * 32767).astype(np.int16)
-                    logger.debug(f"Converted float audio sample to int16, shape: {np_data.shape}")
+                    # Normalize to the int16 range
+                    np_data = sample * 32767
                 elif sample.dtype == np.int16:
                     np_data = sample
                 else:
                     logger.warning(f"Unexpected audio data type: {sample.dtype}, attempting conversion")
-                    np_data = sample.astype(np.int16)
+                    np_data = sample
                 
-                # Add incoming samples to buffer
+                # Add incoming samples to the capture ring
                 async with self.processing_lock:
-                    self.incoming_buffer = np.concatenate([self.incoming_buffer, np_data])
+                    self.capture_ring.write(np_data)
                 
                 # Process chunks of exact size for VAD
-                while len(self.incoming_buffer) >= self.chunk_size:
-                    # Extract exact chunk
-                    chunk = self.incoming_buffer[:self.chunk_size]
-                    self.incoming_buffer = self.incoming_buffer[self.chunk_size:]
+                while True:
+                    # Extract exact chunk (zero-copy view into the ring)
+                    chunk = self.capture_ring.read(self.chunk_size)
+                    if chunk is None:
+                        break
                     
                     # Add to audio buffer for speech processing
                     async with self.processing_lock:
+                        if len(self.audio_buffer) == self.audio_buffer.maxlen:
+                            self.audio_buffer_overruns += 1
+                            if self.audio_buffer_overruns == 1 or self.audio_buffer_overruns % 100 == 0:
+                                logger.warning(f"Audio processing falling behind: {self.audio_buffer_overruns} "
+                                               f"chunks dropped so far")
                         self.audio_buffer.append(chunk)
                     
                     # === Pre-roll Buffer Recording Logic ===
@@ -225,7 +245,7 @@ class GatewayAudio:
                     if not self.recording_active:
                         # Not recording: maintain pre-roll buffer (rolling window)
                         async with self.processing_lock:
-                            self.pre_roll_buffer.append(chunk)
+                            self.pre_roll_ring.write(chunk)
                         
                         # Track consecutive speech detections
                         if is_speech_now:
@@ -234,14 +254,13 @@ class GatewayAudio:
                             
                             # Start recording only after consecutive detections
                             if self.consecutive_speech_count >= self.min_speech_start_count:
-                                logger.info(f"Speech confirmed after {self.consecutive_speech_count} detections - starting recording (with {len(self.pre_roll_buffer)} pre-roll samples)")
+                                logger.info(f"Speech confirmed after {self.consecutive_speech_count} detections - starting recording (with {len(self.pre_roll_ring)} pre-roll samples)")
                                 self.recording_active = True
                                 self.recording_start_time = time.time()
-                                # Copy pre-roll buffer to recording samples
+                                # Copy pre-roll buffer (already ending with the current chunk) to the recording
                                 async with self.processing_lock:
-                                    self.recording_samples = list(self.pre_roll_buffer)
-                                    # Add current sample
-                                    self.recording_samples.append(chunk)
+                                    self.recording_audio.clear()
+                                    self.recording_audio.append(self.pre_roll_ring.latest())
                                 # Reset speech counter
                                 self.consecutive_speech_count = 0
                         else:
@@ -256,26 +275,26 @@ class GatewayAudio:
                             # Speech detected - continue recording and reset gap counter
                             self.consecutive_non_speech_count = 0
                             async with self.processing_lock:
-                                self.recording_samples.append(chunk)
+                                self.recording_audio.append(chunk)
                         else:
                             # No speech detected - increment counter and add to recording buffer (extra frames)
                             self.consecutive_non_speech_count += 1
                             async with self.processing_lock:
-                                self.recording_samples.append(chunk)
+                                self.recording_audio.append(chunk)
                             
                             # Check if we've exceeded the gap tolerance
                             if self.consecutive_non_speech_count > self.speech_gap_tolerance:
                                 # Gap too long - end recording (with extra frame already included)
-                                logger.info(f"Speech ended after {self.consecutive_non_speech_count} non-speech readings - saving recording ({len(self.recording_samples)} total samples)")
+                                logger.info(f"Speech ended after {self.consecutive_non_speech_count} non-speech readings - saving recording ({len(self.recording_audio)} total samples)")
                                 await self.save_recording()
                                 # Reset recording state
                                 self.recording_active = False
-                                self.recording_samples = []
+                                self.recording_audio.clear()
                                 self.recording_start_time = None
                                 self.consecutive_non_speech_count = 0
                                 # Current sample goes into pre-roll buffer for next recording
                                 async with self.processing_lock:
-                                    self.pre_roll_buffer.append(chunk)
+                                    self.pre_roll_ring.write(chunk)
                             else:
                                 # Within tolerance - continue recording through the gap
                                 logger.debug(f"Non-speech reading {self.consecutive_non_speech_count}/{self.speech_gap_tolerance} - continuing recording")
@@ -306,7 +325,8 @@ class GatewayAudio:
                     await self.handle_speech(data)
                 else:
                     if self.collecting_post_speech:
-                        self.post_speech_buffer.append(data)
+                        self.speech_audio.append(data)
+                        self.post_speech_chunk_count += 1
                     await self.handle_silence()
             else:
                 await asyncio.sleep(0.01)
@@ -317,9 +337,11 @@ class GatewayAudio:
             self.start_time = time.time()
             self.last_partial_transcription_time = time.time()
             self.speech_detected = True
-            self.speech_buffer = []
-            self.post_speech_buffer = []
+            self.speech_audio.clear()
+            self.speech_chunk_count = 0
+            self.post_speech_chunk_count = 0
             self.last_partial_text = ""
+            self.streaming_stt.reset()
             
             # Clear DOA buffer for new speech segment
             if self.reachy_controller:
@@ -335,7 +357,8 @@ class GatewayAudio:
             #     "duration_so_far": time.time() - self.start_time
             # })
 
-            self.speech_buffer.append(data)
+            self.speech_audio.append(data)
+            self.speech_chunk_count += 1
             self.silence_start_time = None
             
             # Check if we should perform partial transcription
@@ -344,11 +367,12 @@ class GatewayAudio:
                 time_since_last_partial = current_time - self.last_partial_transcription_time
                 
                 if (time_since_last_partial >= self.partial_transcription_interval and 
-                    len(self.speech_buffer) >= self.min_partial_chunks):
+                    self.speech_chunk_count >= self.min_partial_chunks):
                     asyncio.create_task(self.process_partial_speech())
                     
         elif self.collecting_post_speech:
-            self.post_speech_buffer.append(data)
+            self.speech_audio.append(data)
+            self.post_speech_chunk_count += 1
             self.speech_detected = True
             self.collecting_post_speech = False
             self.silence_start_time = None
@@ -379,16 +403,18 @@ class GatewayAudio:
         self.partial_transcription_in_progress = True
         
         try:
-            current_chunks = self.speech_buffer.copy()
-            
-            if not current_chunks or len(current_chunks) < self.min_partial_chunks:
+            if self.speech_chunk_count < self.min_partial_chunks:
                 return
             
-            logger.info(f"Processing partial transcription with {len(current_chunks)} chunks")
+            # Snapshot only the uncommitted tail: capture keeps appending while Whisper runs
+            window = self.streaming_stt.snapshot(self.speech_audio.view())
+            
+            logger.info(f"Processing partial transcription with {self.speech_chunk_count} chunks "
+                        f"({len(window.audio) / WHISPER_SAMPLE_RATE:.2f}s uncommitted)")
             
             partial_transcription = None
             try:
-                partial_transcription = await self.transcribe_audio(current_chunks)
+                partial_transcription = await asyncio.to_thread(self.streaming_stt.update, window)
                 
                 if partial_transcription and any(c.isalnum() for c in partial_transcription):
                     logger.info(f"Partial transcription: '{partial_transcription}'")
@@ -419,10 +445,11 @@ class GatewayAudio:
         duration = time.time() - self.start_time
         audit_logger = get_logger()
         
-        all_audio_chunks = self.speech_buffer + self.post_speech_buffer
-        audio_size = len(all_audio_chunks) * self.chunk_size * 2
+        # Zero-copy view; capture does not append to speech_audio until process() resumes
+        all_audio = self.speech_audio.view()
+        audio_size = all_audio.nbytes
         
-        logger.info(f"Processing speech segment: {len(self.speech_buffer)} speech chunks + {len(self.post_speech_buffer)} post-speech chunks = {len(all_audio_chunks)} total chunks, {audio_size} bytes")
+        logger.info(f"Processing speech segment: {self.speech_chunk_count} speech chunks + {self.post_speech_chunk_count} post-speech chunks = {self.speech_chunk_count + self.post_speech_chunk_count} total chunks, {audio_size} bytes")
         
         # Get average DOA for this speech segment
         avg_doa = None
@@ -440,9 +467,12 @@ class GatewayAudio:
         # Perform STT transcription
         transcription = None
         transcription_start_time = time.time()
-        if all_audio_chunks:
+        if len(all_audio) > 0:
             try:
-                transcription = await self.transcribe_audio(all_audio_chunks)
+                # Reuses words committed by partial passes; only the tail is transcribed here
+                transcription = await asyncio.to_thread(
+                    self.streaming_stt.finalize, all_audio, self.streaming_stt.generation
+                )
                 logger.info(f"Transcription result: '{transcription}'")
             except Exception as e:
                 logger.error(f"Error during transcription: {e}", exc_info=True)
@@ -469,7 +499,7 @@ class GatewayAudio:
                        f"Duration: {duration:.2f} seconds - Transcription: '{transcription}'")
             
             if os.getenv('SAVE_AUDIO_FILES', 'false').lower() == 'true':
-                await self.save_audio_file(all_audio_chunks)
+                await self.save_audio_file(all_audio)
         else:
             logger.info("No valid transcription obtained")
             logger.info("Emitting speech stopped event without transcription")
@@ -477,22 +507,23 @@ class GatewayAudio:
         # Reset state
         self.speech_detected = False
         self.silence_start_time = None
-        self.speech_buffer = []
-        self.post_speech_buffer = []
+        self.speech_audio.clear()
+        self.speech_chunk_count = 0
+        self.post_speech_chunk_count = 0
         self.last_partial_text = ""
         self.partial_transcription_in_progress = False
     
-    async def transcribe_audio(self, audio_chunks):
-        """Transcribe audio using faster-whisper"""
-        if not audio_chunks:
+    async def transcribe_audio(self, audio):
+        """Transcribe an int16 audio array using faster-whisper"""
+        if audio is None or len(audio) == 0:
             return None
         
         try:
-            logger.info(f"Starting transcription of {len(audio_chunks)} chunks")
+            logger.info(f"Starting transcription of {len(audio)} samples")
             
             transcription = await asyncio.to_thread(
                 self.whisper.transcribe_audio_data,
-                audio_chunks,
+                audio,
                 self.rate,
                 2
             )
@@ -506,13 +537,13 @@ class GatewayAudio:
             logger.error(f"Error in transcribe_audio: {e}", exc_info=True)
             return None
     
-    async def save_audio_file(self, audio_chunks):
+    async def save_audio_file(self, audio):
         """Save recorded speech to file"""
-        if not audio_chunks:
+        if audio is None or len(audio) == 0:
             return
         
         try:
-            combined_audio = np.concatenate(audio_chunks)
+            combined_audio = audio
             filename = f"speech_{self.speech_events}_{int(time.time())}.wav"
             
             await asyncio.to_thread(
@@ -527,14 +558,14 @@ class GatewayAudio:
     
     async def save_recording(self):
         """Save collected audio samples to a WAV file with rolling list management"""
-        if not self.recording_samples:
+        if len(self.recording_audio) == 0:
             logger.warning("No audio data to save")
             return
         
         try:
-            logger.info(f"Saving recording... {len(self.recording_samples)} samples")
-            # Concatenate all samples
-            audio_data = np.concatenate(self.recording_samples, axis=0)
+            logger.info(f"Saving recording... {len(self.recording_audio)} samples")
+            # Zero-copy view; listen() waits for this save before touching the recording again
+            audio_data = self.recording_audio.view()
             
             # Get sample rate
             sample_rate = await asyncio.to_thread(self.reachy_controller.get_sample_rate)
@@ -634,3 +665,6 @@ class GatewayAudio:
     def request_shutdown(self):
         """Request shutdown of audio processing"""
         self.shutdown_requested = True
+        if self.audio_buffer_overruns or self.capture_ring.overrun_events:
+            logger.info(f"Audio overruns: {self.audio_buffer_overruns} chunks dropped from processing backlog, "
+                        f"{self.capture_ring.overrun_samples} samples dropped from capture ring")
@@ -11,17 +11,11 @@ import asyncio
 from pathlib import Path
 from collections import deque
 from typing import Optional, Callable
-import numpy as np
 
 from .logger import get_logger
+from .frame_store import FrameStore, StoredFrame
 logger = logging.getLogger(__name__)
 
-try:
-    import cv2
-    HAS_CV2 = True
-except ImportError:
-    HAS_CV2 = False
-
 # Import processor infrastructure
 try:
     from .processors import ProcessorManager, YoloProcessor, FaceRecognitionProcessor
@@ -33,7 +27,8 @@ except ImportError:
 class GatewayVideo:
     """
     Video processing component that wraps the ReachySDK Media Manager.
-    Polls frames from the SDK, saves them, emits events, and runs image processors.
+    Polls frames from the SDK into an in-memory FrameStore, emits events, and runs image processors.
+    Frames are written to disk only when SAVE_VIDEO_FRAMES is enabled.
     """
     
     def __init__(self, media, event_callback: Callable, frame_interval: int = 10, enable_processors: bool = True):
@@ -52,10 +47,17 @@ class GatewayVideo:
         self.emit_event = event_callback
         self.frame_interval = frame_interval
         # Process frames at very low rate to avoid interfering with audio (0.5 FPS = every 2 seconds)
-        self.poll_interval = 2.0 
+        self.poll_interval = float(os.getenv('VIDEO_POLL_INTERVAL', '2.0'))
+        
+        # Recent frames live in memory; JPEG/base64 encoding happens once, when first requested
+        self.frame_store = FrameStore(capacity=int(os.getenv('MAX_FRAMES_IN_MEMORY', '10')),
+                                      jpeg_quality=int(os.getenv('FRAME_JPEG_QUALITY', '85')))
         
+        # Optional disk persistence (off by default to avoid continuous SD-card writes)
+        self.save_frames = os.getenv('SAVE_VIDEO_FRAMES', 'false').lower() in ('true', '1', 'yes')
         self.videos_dir = os.getenv('VIDEOS_DIR', './videos')
-        os.makedirs(self.videos_dir, exist_ok=True)
+        if self.save_frames:
+            os.makedirs(self.videos_dir, exist_ok=True)
         
         self.max_videos = int(os.getenv('MAX_VIDEOS', '20'))
         self.video_files = deque(maxlen=self.max_videos)
@@ -71,13 +73,18 @@ class GatewayVideo:
             logger.info("Initializing image processors...")
             self.processor_manager = ProcessorManager(event_callback)
             
+            # Optional per-processor rate caps; each processor otherwise runs as fast as it can
+            # on the latest frame, skipping frames that arrive while it is busy
+            yolo_fps = float(os.getenv('YOLO_TARGET_FPS', '0')) or None
+            face_fps = float(os.getenv('FACE_TARGET_FPS', '0')) or None
+            
             # Register YOLO processor
             yolo = YoloProcessor(model_name='yolov8n.pt', confidence_threshold=0.5)
-            self.processor_manager.register_processor(yolo)
+            self.processor_manager.register_processor(yolo, target_fps=yolo_fps)
             
             # Register Face Recognition processor
             face_rec = FaceRecognitionProcessor(known_faces_dir='./conversation_app/data/faces')
-            self.processor_manager.register_processor(face_rec)
+            self.processor_manager.register_processor(face_rec, target_fps=face_fps)
             
             logger.info("Image processors initialized")
         else:
@@ -109,8 +116,26 @@ class GatewayVideo:
                 
                 if frame is not None:
                     self.frame_count += 1
-                    # Save frame asynchronously to avoid blocking the loop
-                    asyncio.create_task(self._save_frame(frame.copy()))
+                    frame = frame.copy()  # SDK buffer may be reused; store, processors and saver share this copy
+                    timestamp = int(time.time() * 1000)
+                    stored = self.frame_store.add(frame, self.frame_count, timestamp)
+                    
+                    # Hand to processors first; they drop stale frames and never block the loop
+                    if self.processor_manager:
+                        await self.processor_manager.process_stream_frame(frame, self.frame_count, timestamp)
+                    
+                    file_path = None
+                    if self.save_frames:
+                        file_path = os.path.join(self.videos_dir, f"frame_{timestamp}.jpg")
+                        # Save frame asynchronously to avoid blocking the loop
+                        asyncio.create_task(self._save_frame(stored, file_path))
+                    
+                    await self.emit_event("video_frame_captured", {
+                        "frame_number": self.frame_count,
+                        "total_frames": self.frame_count,
+                        "file_path": file_path,
+                        "timestamp": timestamp
+                    })
                 else:
                     # Optional: Log warning if stream is consistently empty
                     pass
@@ -123,27 +148,16 @@ class GatewayVideo:
             sleep_time = max(0.01, self.poll_interval - elapsed)
             await asyncio.sleep(sleep_time)
 
-    async def _save_frame(self, frame_bgr: np.ndarray):
+    async def _save_frame(self, stored: StoredFrame, filename: str):
         """
-        Save frame to disk and emit event.
+        Persist a stored frame to disk (SAVE_VIDEO_FRAMES), reusing its cached JPEG encoding.
         Args:
-            frame_bgr: Frame data in BGR format (standard OpenCV/ReachySDK format)
+            stored: Frame from the frame store
+            filename: Destination path
         """
         try:
-            timestamp = int(time.time() * 1000)
-            filename = os.path.join(self.videos_dir, f"frame_{timestamp}.jpg")
-            
-            # Save to disk
-            if HAS_CV2:
-                # OpenCV handles BGR natively
-                await asyncio.to_thread(cv2.imwrite, filename, frame_bgr)
-            else:
-                # Fallback to PIL (Requires RGB)
-                from PIL import Image
-                # Convert BGR -> RGB
-                frame_rgb = frame_bgr[:, :, ::-1] 
-                img = Image.fromarray(frame_rgb)
-                await asyncio.to_thread(img.save, filename)
+            jpeg = await asyncio.to_thread(stored.jpeg)
+            await asyncio.to_thread(Path(filename).write_bytes, jpeg)
             
             self.saved_frame_count += 1
             
@@ -155,22 +169,6 @@ class GatewayVideo:
             
             self.video_files.append(filename)
             
-            # Emit event
-            await self.emit_event("video_frame_captured", {
-                "frame_number": self.saved_frame_count,
-                "total_frames": self.frame_count,
-                "file_path": filename,
-                "timestamp": timestamp
-            })
-            
-            # Process frame through image processors
-            if self.processor_manager:
-                await self.processor_manager.process_stream_frame(
-                    frame_bgr, 
-                    self.saved_frame_count, 
-                    timestamp
-                )
-            
         except Exception as e:
             logger.error(f"Error saving frame: {e}", exc_info=True)
 
@@ -4,18 +4,34 @@ Conversation Audit Logger
 
 This module provides structured logging for conversation audits.
 Logs are written in JSONL format to daily log files.
+
+Logging calls never touch the disk: records are serialized and put on a
+bounded queue, and a background writer thread appends them in batches to
+the day's file, which it keeps open and rotates at midnight.  When the
+queue backs up, high-volume event types are sampled and, if it fills
+completely, records are dropped; the writer logs how many were lost.
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, TextIO
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Frequent, individually unimportant events that are sampled under pressure
+SAMPLED_EVENT_TYPES = frozenset({
+    "tts_cache_lookup",
+    "vision_event",
+    "tool_output",
+})
+
 
 class ConversationLogger:
     """Singleton logger for conversation audit trails in JSONL format."""
@@ -55,27 +71,65 @@ class ConversationLogger:
             
             self.log_dir.mkdir(parents=True, exist_ok=True)
             
+            # Background writer
+            self.batch_size = int(os.getenv('AUDIT_LOG_BATCH_SIZE', '256'))
+            self.flush_interval = float(os.getenv('AUDIT_LOG_FLUSH_INTERVAL', '1.0'))
+            queue_size = int(os.getenv('AUDIT_LOG_QUEUE_SIZE', '10000'))
+            self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=queue_size)
+            # Above this fill level only 1 in sample_every sampled-type records is kept
+            self._sample_threshold = max(1, int(queue_size * 0.5))
+            self.sample_every = max(1, int(os.getenv('AUDIT_LOG_SAMPLE_EVERY', '10')))
+            # Guards the counters below, which many threads update
+            self._counter_lock = threading.Lock()
+            self._sample_counter = 0
+            self.dropped = 0
+            self.sampled_out = 0
+            self._enqueued = 0
+            self._handled = 0
+            self._reported_loss = 0
+            self._last_loss_report = 0.0
+            self._file: Optional[TextIO] = None
+            self._file_date: Optional[str] = None
+            self._closed = False
+            self._writer = threading.Thread(target=self._writer_loop, name="audit-log-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+            
             # Mark as initialized
             self._initialized = True
             
             logger.info(f"ConversationLogger initialized. Log directory: {self.log_dir}")
     
-    def _get_log_file_path(self) -> Path:
-        """Get the current day's log file path."""
-        date_str = datetime.now().strftime("%Y-%m-%d")
+    def _get_log_file_path(self, date_str: Optional[str] = None) -> Path:
+        """Get the log file path for a day (default: today)."""
+        date_str = date_str or datetime.now().strftime("%Y-%m-%d")
         return self.log_dir / f"conversation_audit_{date_str}.jsonl"
     
     def _write_log(self, event_type: str, data: Dict[str, Any], event_id: Optional[str] = None):
         """
-        Write a log entry to the JSONL file.
+        Queue a log entry for the background writer (never blocks).
         
         Args:
             event_type: Type of event being logged
             data: Event-specific data
             event_id: Optional event ID for correlating related events
         """
+        if self._closed:
+            return
+        
+        # Under pressure keep only a sample of the high-volume event types
+        if event_type in SAMPLED_EVENT_TYPES and self._queue.qsize() >= self._sample_threshold:
+            with self._counter_lock:
+                self._sample_counter += 1
+                keep = self._sample_counter % self.sample_every == 0
+                if not keep:
+                    self.sampled_out += 1
+            if not keep:
+                return
+        
+        now = datetime.now()
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "event_type": event_type,
             "data": data
         }
@@ -83,13 +137,115 @@ class ConversationLogger:
         if event_id:
             log_entry["event_id"] = event_id
         
+        try:
+            # Serialize now: callers may mutate data after this returns
+            line = json.dumps(log_entry) + '\n'
+        except Exception as e:
+            logger.error(f"Failed to serialize audit log entry {event_type}: {e}")
+            return
+        
+        with self._counter_lock:
+            try:
+                self._queue.put_nowait((now.strftime("%Y-%m-%d"), line))
+                self._enqueued += 1
+            except queue.Full:
+                self.dropped += 1
+    
+    def _writer_loop(self):
+        """Append queued records in batches, keeping the day's file open."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._report_loss()
+                continue
+            
+            batch = []
+            stop = item is None
+            if not stop:
+                batch.append(item)
+            # Take whatever else is already queued, up to one batch
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            
+            self._write_batch(batch)
+            self._handled += len(batch)
+            self._report_loss(force=stop)
+            if stop:
+                break
+        
+        with self._write_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+    
+    def _write_batch(self, batch: List[tuple]):
+        """Write (date, line) records, rotating the file when the date changes."""
+        if not batch:
+            return
         try:
             with self._write_lock:
-                log_file = self._get_log_file_path()
-                with open(log_file, 'a') as f:
-                    f.write(json.dumps(log_entry) + '\n')
+                i = 0
+                while i < len(batch):
+                    date_str = batch[i][0]
+                    j = i
+                    while j < len(batch) and batch[j][0] == date_str:
+                        j += 1
+                    if date_str != self._file_date or self._file is None:
+                        if self._file:
+                            self._file.close()
+                        self._file = open(self._get_log_file_path(date_str), 'a')
+                        self._file_date = date_str
+                    self._file.write(''.join(line for _, line in batch[i:j]))
+                    i = j
+                self._file.flush()
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}", exc_info=True)
+            with self._write_lock:
+                if self._file:
+                    self._file.close()
+                self._file = None
+    
+    def _report_loss(self, force: bool = False):
+        """Record (at most every 10s) how many entries were dropped or sampled out so far."""
+        lost = self.dropped + self.sampled_out
+        if lost == self._reported_loss or (not force and time.time() - self._last_loss_report < 10.0):
+            return
+        self._reported_loss = lost
+        self._last_loss_report = time.time()
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "event_type": "audit_log_loss",
+            "data": {"dropped_total": self.dropped, "sampled_out_total": self.sampled_out}
+        }
+        logger.warning(f"Audit log under pressure: {self.dropped} dropped, {self.sampled_out} sampled out so far")
+        self._write_batch([(datetime.now().strftime("%Y-%m-%d"), json.dumps(record) + '\n')])
+    
+    def flush(self, timeout: float = 2.0):
+        """Wait (up to timeout) until everything queued so far has been written."""
+        with self._counter_lock:
+            target = self._enqueued
+        deadline = time.time() + timeout
+        while self._handled < target and time.time() < deadline:
+            time.sleep(0.01)
+    
+    def close(self):
+        """Write out everything queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put(None, timeout=2.0)
+        except queue.Full:
+            pass
+        self._writer.join(timeout=5.0)
     
     # Speech Recording Events
     
@@ -181,6 +337,25 @@ class ConversationLogger:
             "duration_ms": duration_ms
         })
     
+    def log_tts_cache_lookup(self, text: str, tier: str, latency_ms: float):
+        """
+        Log a phrase cache lookup.
+
+        Args:
+            text: Phrase looked up
+            tier: 'memory', 'disk' or 'miss'
+            latency_ms: Lookup time in milliseconds
+        """
+        self._write_log("tts_cache_lookup", {
+            "text": text,
+            "tier": tier,
+            "latency_ms": latency_ms
+        })
+
+    def log_tts_cache_stats(self, stats: Dict[str, Any]):
+        """Log cumulative phrase cache hit-rate stats."""
+        self._write_log("tts_cache_stats", stats)
+
     # Action Handler Events
     
     def log_action_received(self, action_string: str):
@@ -53,18 +53,45 @@ class BasePoseLayer(MovementLayer):
     
     Handles smooth interpolation from current pose to target pose using
     configurable easing functions.
+    
+    Each actuator group (head, antennas, body_yaw) transitions independently,
+    so a new antenna target does not restart a head movement that is still in
+    progress (and vice versa).  A group whose target is unchanged keeps its
+    running transition.
     """
     
+    GROUPS = ("head", "antennas", "body_yaw")
+    
     def __init__(self):
         """Initialize the base pose layer."""
         self._current_pose = RobotPose()  # Start at neutral
         self._target_pose = RobotPose()
-        self._transition_start_time = None
-        self._transition_duration = 0.0
-        self._in_transition = False
+        # group -> (start_pose, start_time, duration) for groups in transition
+        self._transitions = {}
         
         logger.info("BasePoseLayer initialized")
     
+    @property
+    def _in_transition(self) -> bool:
+        return bool(self._transitions)
+    
+    @staticmethod
+    def _group_values(pose: RobotPose, group: str) -> tuple:
+        if group == "head":
+            return (pose.roll, pose.pitch, pose.yaw)
+        if group == "antennas":
+            return tuple(pose.antennas)
+        return (pose.body_yaw,)
+    
+    @staticmethod
+    def _copy_group(dst: RobotPose, src: RobotPose, group: str):
+        if group == "head":
+            dst.roll, dst.pitch, dst.yaw = src.roll, src.pitch, src.yaw
+        elif group == "antennas":
+            dst.antennas = (src.antennas[0], src.antennas[1])
+        else:
+            dst.body_yaw = src.body_yaw
+    
     def is_active(self) -> bool:
         """Base layer is always active."""
         return True
@@ -73,19 +100,34 @@ class BasePoseLayer(MovementLayer):
         """
         Set a new target pose with smooth transition.
         
+        Only groups whose target changed start a new transition, beginning
+        from where that group currently is (mid-transition included).
+        
         Args:
             target_pose: Desired final pose
             duration: Transition duration in seconds
         """
-        # Start transition from current pose
-        self._target_pose = target_pose.copy()
-        self._transition_duration = duration
-        self._transition_start_time = time.time()
-        self._in_transition = True
+        now = time.time()
+        current = self.get_pose(now)
+        changed = [g for g in self.GROUPS
+                   if self._group_values(target_pose, g) != self._group_values(self._target_pose, g)]
         
-        logger.info(f"BasePoseLayer: New target set, duration={duration:.2f}s")
+        for group in changed:
+            self._copy_group(self._current_pose, current, group)
+            self._copy_group(self._target_pose, target_pose, group)
+            self._transitions[group] = (current.copy(), now, duration)
+        
+        logger.info(f"BasePoseLayer: New target set for {changed or 'no'} groups, duration={duration:.2f}s")
         logger.debug(f"  Target: {target_pose}")
     
+    def hold(self):
+        """Stop all transitions where they are (used when actions are preempted)."""
+        current = self.get_pose(time.time())
+        self._current_pose = current.copy()
+        self._target_pose = current.copy()
+        self._transitions.clear()
+        logger.info("BasePoseLayer: Holding current pose")
+    
     def set_current_pose(self, pose: RobotPose):
         """
         Update the current pose (used for initialization).
@@ -99,7 +141,7 @@ class BasePoseLayer(MovementLayer):
     
     def get_pose(self, current_time: float) -> RobotPose:
         """
-        Get the current pose, interpolating if in transition.
+        Get the current pose, interpolating groups that are in transition.
         
         Args:
             current_time: Current time in seconds
@@ -107,28 +149,27 @@ class BasePoseLayer(MovementLayer):
         Returns:
             Current interpolated pose
         """
-        if not self._in_transition:
-            return self._current_pose.copy()
-        
-        # Calculate transition progress
-        elapsed = current_time - self._transition_start_time
-        
-        if elapsed >= self._transition_duration:
-            # Transition complete
-            self._current_pose = self._target_pose.copy()
-            self._in_transition = False
-            logger.debug("BasePoseLayer: Transition complete")
+        if not self._transitions:
             return self._current_pose.copy()
         
-        # Smooth easing (cosine ease-in-out)
-        progress = elapsed / self._transition_duration
-        smooth_progress = (1.0 - np.cos(np.pi * progress)) / 2.0
-        
-        # Interpolate from start to target
-        start_pose = self._current_pose if elapsed == 0 else self._current_pose
-        interpolated = start_pose.blend(self._target_pose, smooth_progress)
+        pose = self._current_pose.copy()
+        for group, (start_pose, start_time, duration) in list(self._transitions.items()):
+            elapsed = current_time - start_time
+            
+            if duration <= 0 or elapsed >= duration:
+                # Transition complete
+                self._copy_group(self._current_pose, self._target_pose, group)
+                self._copy_group(pose, self._target_pose, group)
+                del self._transitions[group]
+                logger.debug(f"BasePoseLayer: {group} transition complete")
+                continue
+            
+            # Smooth easing (cosine ease-in-out)
+            progress = max(0.0, elapsed) / duration
+            smooth_progress = (1.0 - np.cos(np.pi * progress)) / 2.0
+            self._copy_group(pose, start_pose.blend(self._target_pose, smooth_progress), group)
         
-        return interpolated
+        return pose
 
 
 class IdleLayer(MovementLayer):
@@ -97,6 +97,11 @@ class MovementManager:
             self.base_layer.set_target(pose, duration)
         logger.debug(f"MovementManager: Target pose updated (duration={duration:.2f}s)")
     
+    def hold_current_pose(self):
+        """Freeze every in-progress transition at the current pose."""
+        with self._lock:
+            self.base_layer.hold()
+    
     def enable_idle(self, enable: bool = True):
         """
         Enable or disable idle animations.
@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
 """
 Processor Manager - Orchestrates multiple image processors.
+
+Each processor runs in its own worker with a single-slot mailbox holding the
+latest frame.  Submitting a frame never waits on a processor: if the worker
+is still busy (or its target rate says it is not due yet) the frame simply
+replaces the one waiting in the slot and the stale frame is counted as
+dropped.  A slow processor therefore always works on the newest frame and
+never builds a backlog, and fast processors are not held back by slow ones.
 """
 
 import time
@@ -132,6 +139,117 @@ class ResultFilter:
         return stable_labels
 
 
+class ProcessorWorker:
+    """
+    Runs one processor on the latest submitted frame, at most ``target_fps``.
+    """
+    
+    def __init__(self, processor: ImageProcessor, handle_result: Callable, target_fps: Optional[float] = None):
+        """
+        Args:
+            processor: Processor to run.
+            handle_result: Async callback(processor, result, timestamp) for each processed frame.
+            target_fps: Maximum processing rate (None = as fast as the processor allows).
+        """
+        self.processor = processor
+        self.handle_result = handle_result
+        self.min_period = 1.0 / target_fps if target_fps and target_fps > 0 else 0.0
+        
+        # Single-slot mailbox: (frame, frame_number, timestamp) or None
+        self._slot: Optional[tuple] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_start = 0.0
+        
+        # Stats
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_processing_ms = 0.0
+        self.last_latency_ms = 0.0  # Frame capture -> result handled
+        self._completions: deque = deque(maxlen=30)
+    
+    @property
+    def name(self) -> str:
+        return self.processor.name
+    
+    def submit(self, frame: np.ndarray, frame_number: int, timestamp: int):
+        """Put a frame in the mailbox, replacing (dropping) any frame still waiting."""
+        if self._slot is not None:
+            self.dropped += 1
+        self._slot = (frame, frame_number, timestamp)
+        self.submitted += 1
+        
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+    
+    async def _run(self):
+        """Worker loop: wait for a frame, honour the target rate, process the newest frame."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            
+            # Not due yet: wait out the period; newer frames overwrite the slot meanwhile
+            wait = self._last_start + self.min_period - time.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            if self._slot is None:
+                continue
+            frame, frame_number, timestamp = self._slot
+            self._slot = None
+            self._last_start = time.time()
+            
+            try:
+                # Run processor in thread pool to avoid blocking
+                result = await asyncio.to_thread(self.processor.process, frame)
+                self.last_processing_ms = (time.time() - self._last_start) * 1000
+                
+                # Add metadata to result
+                result['frame_number'] = frame_number
+                result['timestamp'] = timestamp
+                result['processing_time_ms'] = self.last_processing_ms
+                
+                await self.handle_result(self.processor, result, timestamp)
+                
+                self.processed += 1
+                self._completions.append(time.time())
+                self.last_latency_ms = time.time() * 1000 - timestamp
+                logger.debug(f"Processor {self.name} completed in {self.last_processing_ms:.2f}ms")
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Error processing frame with {self.name}: {e}", exc_info=True)
+    
+    @property
+    def achieved_fps(self) -> float:
+        """Processing rate over the last completed frames."""
+        if len(self._completions) < 2:
+            return 0.0
+        span = self._completions[-1] - self._completions[0]
+        return (len(self._completions) - 1) / span if span > 0 else 0.0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'target_fps': 1.0 / self.min_period if self.min_period else None,
+            'achieved_fps': round(self.achieved_fps, 2),
+            'submitted': self.submitted,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'last_processing_ms': round(self.last_processing_ms, 1),
+            'last_latency_ms': round(self.last_latency_ms, 1),
+        }
+    
+    def stop(self):
+        """Cancel the worker task (a frame already inside the processor finishes in its thread)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._slot = None
+
+
 class ProcessorManager:
     """
     Manages multiple image processors and routes inputs to them.
@@ -141,16 +259,24 @@ class ProcessorManager:
     - Route inputs (frames, files) to active processors
     - Aggregate results
     - Emit events via callback
+    
+    Stream frames are dispatched to per-processor ProcessorWorkers (latest
+    frame wins); see get_stats() for achieved FPS and drop counts.
     """
     
-    def __init__(self, event_callback: Callable, enable_filtering: bool = True, min_emission_interval: float = 1.0):
+    def __init__(self, event_callback: Callable, enable_filtering: bool = True, min_emission_interval: float = 1.0,
+                 stats_interval: float = 60.0):
         """
         Args:
             event_callback: Async callback for emitting events.
             enable_filtering: Enable result filtering (default: True)
             min_emission_interval: Minimum time in seconds between emissions per processor (default: 1.0)
+            stats_interval: Seconds between scheduler stats log lines (0 disables)
         """
         self.processors: List[ImageProcessor] = []
+        self.workers: Dict[str, ProcessorWorker] = {}
+        self.stats_interval = stats_interval
+        self._last_stats_log = time.time()
         self.emit_event = event_callback
         self.enable_filtering = enable_filtering
         self.min_emission_interval = min_emission_interval
@@ -163,12 +289,13 @@ class ProcessorManager:
         
         logger.info(f"ProcessorManager initialized (filtering={'enabled' if enable_filtering else 'disabled'}, min_interval={min_emission_interval}s)")
     
-    def register_processor(self, processor: ImageProcessor) -> bool:
+    def register_processor(self, processor: ImageProcessor, target_fps: Optional[float] = None) -> bool:
         """
         Register a new processor.
         
         Args:
             processor: ImageProcessor instance to register.
+            target_fps: Maximum stream frames per second for this processor (None = unlimited).
         
         Returns:
             True if registration successful, False otherwise.
@@ -177,12 +304,14 @@ class ProcessorManager:
             # Initialize the processor
             if processor.initialize():
                 self.processors.append(processor)
+                self.workers[processor.name] = ProcessorWorker(processor, self._handle_result, target_fps)
                 
                 # Create a filter for this processor if filtering is enabled
                 if self.enable_filtering:
                     self.filters[processor.name] = ResultFilter()
                 
-                logger.info(f"Registered processor: {processor.name}")
+                logger.info(f"Registered processor: {processor.name}"
+                            + (f" (target {target_fps} FPS)" if target_fps else ""))
                 return True
             else:
                 logger.error(f"Failed to initialize processor: {processor.name}")
@@ -193,108 +322,91 @@ class ProcessorManager:
     
     async def process_stream_frame(self, frame: np.ndarray, frame_number: int, timestamp: int):
         """
-        Process a single frame from the video stream through all registered processors.
+        Hand a frame from the video stream to every registered processor.
+        
+        Returns immediately: each processor picks up the frame when it is free,
+        and a frame it has not started yet is replaced by the next one.
         
         Args:
-            frame: Input image as numpy array (H x W x C) in BGR format.
+            frame: Input image as numpy array (H x W x C) in BGR format. Must not be
+                   modified afterwards; it is shared by the processors.
             frame_number: Frame number in the stream.
             timestamp: Timestamp in milliseconds.
         """
-        if not self.processors:
-            return
+        for worker in self.workers.values():
+            worker.submit(frame, frame_number, timestamp)
         
-        # Process frame through each processor asynchronously
-        tasks = []
-        for processor in self.processors:
-            task = asyncio.create_task(
-                self._process_with_processor(processor, frame, frame_number, timestamp)
-            )
-            tasks.append(task)
-        
-        # Wait for all processors to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.stats_interval and time.time() - self._last_stats_log >= self.stats_interval:
+            self._last_stats_log = time.time()
+            self.log_stats()
+    
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-processor scheduler stats (target/achieved FPS, dropped frames, latency)."""
+        return {name: worker.get_stats() for name, worker in self.workers.items()}
     
-    async def _process_with_processor(
-        self, 
-        processor: ImageProcessor, 
-        frame: np.ndarray, 
-        frame_number: int,
-        timestamp: int
-    ):
+    def log_stats(self):
+        """Log one line of scheduler stats per processor."""
+        for name, stats in self.get_stats().items():
+            logger.info(f"Processor {name}: {stats['achieved_fps']:.2f} FPS, "
+                        f"{stats['processed']} processed, {stats['dropped']} dropped, "
+                        f"last {stats['last_processing_ms']:.0f}ms ({stats['last_latency_ms']:.0f}ms after capture)")
+    
+    async def _handle_result(self, processor: ImageProcessor, result: Dict[str, Any], timestamp: int):
         """
-        Process frame with a single processor and emit event.
+        Filter, rate limit and emit one processor result.
         
         Args:
-            processor: Processor to use.
-            frame: Input image.
-            frame_number: Frame number.
-            timestamp: Timestamp in milliseconds.
+            processor: Processor that produced the result.
+            result: Processor result with frame metadata.
+            timestamp: Frame timestamp in milliseconds.
         """
-        try:
-            start_time = time.time()
-            
-            # Run processor in thread pool to avoid blocking
-            result = await asyncio.to_thread(processor.process, frame)
-            
-            processing_time = (time.time() - start_time) * 1000  # ms
+        # Apply filtering if enabled
+        should_emit = True
+        if self.enable_filtering and processor.name in self.filters:
+            result_filter = self.filters[processor.name]
+            filter_result = result_filter.add_result(result, timestamp)
             
-            # Add metadata to result
-            result['frame_number'] = frame_number
-            result['timestamp'] = timestamp
-            result['processing_time_ms'] = processing_time
-            
-            # Apply filtering if enabled
-            should_emit = True
-            if self.enable_filtering and processor.name in self.filters:
-                result_filter = self.filters[processor.name]
-                filter_result = result_filter.add_result(result, timestamp)
+            if filter_result is None:
+                # No change in stable set, don't emit
+                should_emit = False
+                logger.debug(f"Processor {processor.name}: No stable change, skipping event")
+            else:
+                # State changed, unpack the tuple
+                stable_set, entered, left = filter_result
                 
-                if filter_result is None:
-                    # No change in stable set, don't emit
-                    should_emit = False
-                    logger.debug(f"Processor {processor.name}: No stable change, skipping event")
-                else:
-                    # State changed, unpack the tuple
-                    stable_set, entered, left = filter_result
-                    
-                    # Add all information to result
-                    result['stable_labels'] = list(stable_set)
-                    result['entered'] = list(entered)
-                    result['left'] = list(left)
-                    
-                    # Log state changes with specific entered/left information
-                    logger.info(f"Processor {processor.name}: Stable state changed to {stable_set}")
-                    if entered:
-                        logger.info(f"Processor {processor.name}: Entered: {entered}")
-                    if left:
-                        logger.info(f"Processor {processor.name}: Left: {left}")
-            
-            # Apply time-based rate limiting
-            if should_emit:
-                current_time = time.time()
-                last_emission = self.last_emission_time.get(processor.name, 0)
-                time_since_last = current_time - last_emission
+                # Add all information to result
+                result['stable_labels'] = list(stable_set)
+                result['entered'] = list(entered)
+                result['left'] = list(left)
                 
-                if time_since_last < self.min_emission_interval:
-                    # Too soon since last emission
-                    should_emit = False
-                    logger.debug(f"Processor {processor.name}: Rate limited (only {time_since_last:.2f}s since last emission, minimum {self.min_emission_interval}s)")
+                # Log state changes with specific entered/left information
+                logger.info(f"Processor {processor.name}: Stable state changed to {stable_set}")
+                if entered:
+                    logger.info(f"Processor {processor.name}: Entered: {entered}")
+                if left:
+                    logger.info(f"Processor {processor.name}: Left: {left}")
+        
+        # Apply time-based rate limiting
+        if should_emit:
+            current_time = time.time()
+            last_emission = self.last_emission_time.get(processor.name, 0)
+            time_since_last = current_time - last_emission
             
-            # Emit processor-specific event only if all checks pass
-            if should_emit:
-                event_name = f"{processor.name}_result"
-                await self.emit_event(event_name, result)
-                
-                # Update last emission time
-                self.last_emission_time[processor.name] = time.time()
-                
-                # Audit Log
-                get_logger().log_vision_event(processor.name, result)
+            if time_since_last < self.min_emission_interval:
+                # Too soon since last emission
+                should_emit = False
+                logger.debug(f"Processor {processor.name}: Rate limited (only {time_since_last:.2f}s since last emission, minimum {self.min_emission_interval}s)")
+        
+        # Emit processor-specific event only if all checks pass
+        if should_emit:
+            event_name = f"{processor.name}_result"
+            await self.emit_event(event_name, result)
             
-            logger.debug(f"Processor {processor.name} completed in {processing_time:.2f}ms")
+            # Update last emission time
+            self.last_emission_time[processor.name] = time.time()
             
-        except Exception as e:
-            logger.error(f"Error processing frame with {processor.name}: {e}", exc_info=True)
+            # Audit Log
+            get_logger().log_vision_event(processor.name, result)
     
     async def process_single_image(self, image_path: str) -> Dict[str, Any]:
         """
@@ -348,6 +460,11 @@ class ProcessorManager:
         Cleanup all processors.
         """
         logger.info("Cleaning up ProcessorManager")
+        for worker in self.workers.values():
+            worker.stop()
+        if self.workers:
+            self.log_stats()
+        self.workers.clear()
         for processor in self.processors:
             try:
                 processor.cleanup()
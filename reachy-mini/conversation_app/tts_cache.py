@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Phrase-level TTS Audio Cache
+
+The robot repeats many short phrases (greetings, acknowledgements, action
+confirmations).  This module caches their synthesized PCM so a repeat starts
+playing immediately instead of waiting for piper.
+
+Entries are content-addressed by voice model + length scale + normalized text
+and kept in two tiers:
+1. In-memory LRU bounded by total PCM bytes
+2. On-disk WAV files that survive restarts
+
+Only phrases up to ``max_phrase_chars`` are cached; long free-form replies
+rarely repeat and would just evict the useful entries.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+from .logger import get_logger
+
+# (sample_rate, 16-bit mono PCM)
+CachedAudio = Tuple[int, bytes]
+
+
+def normalize_phrase(text: str) -> str:
+    """Normalize text so trivially different spellings share a cache entry."""
+    text = text.replace('\u2018', "'").replace('\u2019', "'")
+    text = text.replace('\u201C', '"').replace('\u201D', '"')
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class PhraseCache:
+    """Two-tier (memory LRU + disk) cache of synthesized phrase audio."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_phrase_chars: int = 120, stats_interval: int = 20):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the on-disk tier (None disables it)
+            max_memory_bytes: PCM byte budget for the in-memory tier
+            max_phrase_chars: Longest normalized phrase that is cached
+            stats_interval: Write cumulative stats to the audit log every N lookups
+        """
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_phrase_chars = max_phrase_chars
+        self.stats_interval = stats_interval
+
+        self._memory: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"⚠️  TTS cache directory unavailable ({e}); using memory only")
+                self.cache_dir = None
+
+    def key(self, voice_model: str, text: str, length_scale: Optional[float] = None) -> Optional[str]:
+        """
+        Build the cache key for a phrase.
+
+        Returns:
+            Hex digest, or None if the phrase should not be cached
+        """
+        phrase = normalize_phrase(text)
+        if not phrase or len(phrase) > self.max_phrase_chars:
+            return None
+        scale = "default" if length_scale is None else f"{length_scale:.3f}"
+        raw = f"{Path(voice_model).name.removesuffix('.onnx')}|{scale}|{phrase}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, audio: CachedAudio):
+        """Insert into the memory tier and evict least recently used entries (lock held)."""
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key)[1])
+        self._memory[key] = audio
+        self._memory_bytes += len(audio[1])
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.wav" if self.cache_dir else None
+
+    def get(self, key: Optional[str], text: str = "") -> Optional[CachedAudio]:
+        """
+        Look up a phrase, promoting disk hits into memory.
+
+        Args:
+            key: Key from ``key()`` (None counts as uncacheable and is not tracked)
+            text: Phrase text, for the audit log
+        """
+        if key is None:
+            return None
+
+        start = time.time()
+        tier = "miss"
+        audio = None
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                tier = "memory"
+
+        if audio is None:
+            path = self._disk_path(key)
+            if path is not None and path.exists():
+                try:
+                    with wave.open(str(path), 'rb') as wav:
+                        audio = (wav.getframerate(), wav.readframes(wav.getnframes()))
+                    with self._lock:
+                        self._remember(key, audio)
+                    tier = "disk"
+                except (OSError, EOFError, wave.Error) as e:
+                    print(f"⚠️  Dropping unreadable TTS cache entry {path.name}: {e}")
+                    path.unlink(missing_ok=True)
+                    audio = None
+
+        with self._lock:
+            if tier == "memory":
+                self.memory_hits += 1
+            elif tier == "disk":
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+            lookups = self.lookups
+
+        if tier != "miss":
+            print(f"   ⚡ TTS cache {tier} hit ({(time.time() - start) * 1000:.1f}ms)")
+        get_logger().log_tts_cache_lookup(text, tier, (time.time() - start) * 1000)
+        if self.stats_interval and lookups % self.stats_interval == 0:
+            self.log_stats()
+        return audio
+
+    def put(self, key: Optional[str], sample_rate: int, pcm: bytes):
+        """Store synthesized audio in both tiers."""
+        if key is None or not pcm:
+            return
+        with self._lock:
+            self._remember(key, (sample_rate, pcm))
+            self.stores += 1
+
+        path = self._disk_path(key)
+        if path is None:
+            return
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with wave.open(str(tmp_path), 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(pcm)
+            tmp_path.replace(path)  # Atomic: readers never see a partial file
+        except OSError as e:
+            print(f"⚠️  Failed to write TTS cache entry: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def prewarm(self, phrases: Iterable[str], voice_model: str, length_scale: Optional[float],
+                synthesize: Callable[[str], Optional[CachedAudio]]) -> int:
+        """
+        Synthesize phrases that are not cached yet.
+
+        Args:
+            phrases: Phrases to warm
+            voice_model: Voice model used for the key
+            length_scale: Length scale used for the key
+            synthesize: Callable returning (sample_rate, pcm) for a phrase, or None
+
+        Returns:
+            Number of phrases newly synthesized
+        """
+        warmed = 0
+        for phrase in phrases:
+            key = self.key(voice_model, phrase, length_scale)
+            if key is None:
+                continue
+            with self._lock:
+                if key in self._memory:
+                    continue
+            path = self._disk_path(key)
+            if path is not None and path.exists():
+                continue
+            audio = synthesize(normalize_phrase(phrase))
+            if audio:
+                self.put(key, *audio)
+                warmed += 1
+        return warmed
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.memory_hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+    def log_stats(self):
+        """Write cumulative hit-rate stats to the audit log."""
+        with self._lock:
+            stats = {
+                "lookups": self.lookups,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 3),
+                "stores": self.stores,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+            }
+        get_logger().log_tts_cache_stats(stats)
+
+
+def load_phrase_list(path: str) -> list:
+    """Read a phrase list: one phrase per line, blank lines and # comments ignored."""
+    phrases = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                phrases.append(line)
+    return phrases
@@ -8,6 +8,15 @@ This module provides a background TTS queue that:
 3. Manages a background audio playback queue
 4. Can clear the queue when needed (e.g., when user sends new message)
 
+Two synthesis paths are supported:
+- In-process (default): the piper Python module loads the voice once and
+  synthesizes each sentence to PCM in memory.  A synthesis thread works ahead
+  of a playback thread that streams the PCM into one long-lived raw ``aplay``
+  process, so the next utterance is synthesized while the current one plays.
+- Subprocess (fallback): one ``piper`` process per utterance writes a temp WAV
+  that is played with ``aplay``.  Used when the piper module is unavailable,
+  the voice fails to load, or TTS_IN_PROCESS=0.
+
 Requirements:
     - piper-gpl installed (https://github.com/OHF-Voice/piper-gpl)
     - aplay or other audio player for playback
@@ -19,22 +28,180 @@ import subprocess
 import tempfile
 import traceback
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import threading
+import time
 from queue import Queue, Empty
 import os
+import wave
 from dotenv import load_dotenv
 from .logger import get_logger
+from .tts_cache import PhraseCache, load_phrase_list
+
+try:
+    from piper import PiperVoice
+except ImportError:  # piper-tts not installed: fall back to the piper executable
+    PiperVoice = None
+
+try:
+    from piper import SynthesisConfig
+except ImportError:  # piper-tts < 1.3 takes synthesis options as keyword arguments
+    SynthesisConfig = None
 
 # Load environment variables from .env file if available
 load_dotenv()
 
 
+class PiperEngine:
+    """Resident piper voice: loads the ONNX model once and synthesizes PCM in memory."""
+    
+    def __init__(self, voice_model: str, length_scale: Optional[float] = None):
+        """
+        Load the voice model.
+        
+        Args:
+            voice_model: Model path, with or without the .onnx extension
+            length_scale: Phoneme length multiplier (>1 is slower); None uses the voice default
+        """
+        self.length_scale = length_scale
+        if PiperVoice is None:
+            raise RuntimeError("piper-tts Python module is not installed")
+        
+        model_file = voice_model if voice_model.endswith(".onnx") else voice_model + ".onnx"
+        load_start = time.time()
+        self.voice = PiperVoice.load(model_file)
+        self.sample_rate = self.voice.config.sample_rate
+        print(f"✓ Piper voice loaded in-process ({(time.time() - load_start) * 1000:.0f}ms, "
+              f"{self.sample_rate}Hz): {model_file}")
+    
+    def synthesize(self, text: str):
+        """Yield 16-bit mono PCM, one chunk per sentence, as it is synthesized."""
+        if hasattr(self.voice, "synthesize_stream_raw"):  # piper-tts < 1.3
+            kwargs = {} if self.length_scale is None else {"length_scale": self.length_scale}
+            yield from self.voice.synthesize_stream_raw(text, **kwargs)
+            return
+        syn_config = None
+        if self.length_scale is not None and SynthesisConfig is not None:
+            syn_config = SynthesisConfig(length_scale=self.length_scale)
+        for chunk in self.voice.synthesize(text, syn_config=syn_config):
+            yield chunk.audio_int16_bytes
+
+
+class PCMOutput:
+    """Persistent raw PCM playback stream backed by a single long-lived aplay process.
+    
+    PCM is written in short slices paced to real time, keeping at most
+    ``lead_s`` of audio buffered ahead of the speaker, so ``stop()`` silences
+    playback within a slice.  The aplay process is started on first write and
+    restarted after ``stop()``.
+    """
+    
+    SLICE_S = 0.04
+    
+    def __init__(self, sample_rate: int, audio_device: Optional[str] = None, lead_s: float = 0.2):
+        self.sample_rate = sample_rate
+        self.audio_device = audio_device
+        self.lead_s = lead_s
+        self.process = None
+        self.play_end = 0.0  # time.time() at which everything written so far has played
+        self._lock = threading.Lock()
+    
+    def _ensure_process(self):
+        if self.process is not None and self.process.poll() is None:
+            return self.process
+        cmd = ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(self.sample_rate)]
+        if self.audio_device:
+            cmd.extend(["-D", self.audio_device])
+        cmd.append("-")
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        self.play_end = 0.0
+        return self.process
+    
+    def write(self, pcm: bytes, cancelled) -> bool:
+        """
+        Stream PCM to the speaker at playback speed.
+        
+        Args:
+            pcm: 16-bit mono PCM at ``sample_rate``
+            cancelled: Callable returning True once playback should be abandoned
+            
+        Returns:
+            False if cancelled or the output failed before all audio was written
+        """
+        bytes_per_s = self.sample_rate * 2
+        slice_bytes = max(2, int(bytes_per_s * self.SLICE_S) & ~1)
+        
+        for offset in range(0, len(pcm), slice_bytes):
+            # Keep no more than lead_s queued so cancellation is near-immediate
+            while not cancelled():
+                ahead = self.play_end - time.time()
+                if ahead <= self.lead_s:
+                    break
+                time.sleep(min(ahead - self.lead_s, self.SLICE_S / 2))
+            if cancelled():
+                return False
+            
+            chunk = pcm[offset:offset + slice_bytes]
+            with self._lock:
+                if cancelled():  # stop() may have run while we waited for the lock
+                    return False
+                try:
+                    process = self._ensure_process()
+                    process.stdin.write(chunk)
+                    process.stdin.flush()
+                except (BrokenPipeError, OSError, ValueError) as e:
+                    # stop() from another thread closes the pipe under us
+                    if not cancelled():
+                        print(f"⚠️  Audio output error: {e}")
+                    self._kill()
+                    return False
+                now = time.time()
+                self.play_end = max(self.play_end, now) + len(chunk) / bytes_per_s
+        return True
+    
+    def _kill(self):
+        process, self.process = self.process, None
+        self.play_end = 0.0
+        if process is None:
+            return
+        try:
+            process.kill()
+            process.wait(timeout=1)
+        except Exception:
+            pass
+    
+    def stop(self):
+        """Drop everything buffered in the output and silence the speaker."""
+        with self._lock:
+            self._kill()
+    
+    def close(self):
+        """Let buffered audio finish, then close the output."""
+        with self._lock:
+            process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=max(1.0, self.play_end - time.time() + 0.5))
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+
 class TTSQueue:
     """Manages text-to-speech conversion and playback queue."""
     
     def __init__(self, piper_executable: str = "piper", voice_model: Optional[str] = None, 
-                 audio_device: Optional[str] = None):
+                 audio_device: Optional[str] = None, in_process: Optional[bool] = None,
+                 length_scale: Optional[float] = None, use_cache: Optional[bool] = None):
         """
         Initialize TTS queue.
         
@@ -43,9 +210,17 @@ class TTSQueue:
             voice_model: Voice model path (required for piper)
             audio_device: ALSA device for audio playback (e.g., "plughw:CARD=Array,DEV=0")
                          If None, uses default device
+            in_process: Synthesize with a resident piper voice instead of one piper
+                        process per utterance (if None, uses TTS_IN_PROCESS env var, default on)
+            length_scale: Speaking speed as piper length scale (if None, uses PIPER_LENGTH_SCALE
+                          env var or the voice default)
+            use_cache: Cache synthesized phrases (if None, uses TTS_CACHE env var, default on)
         """
         self.piper_executable = piper_executable
         self.audio_device = audio_device
+        if length_scale is None and os.environ.get("PIPER_LENGTH_SCALE"):
+            length_scale = float(os.environ["PIPER_LENGTH_SCALE"])
+        self.length_scale = length_scale
         
         # Model is required for piper
         if voice_model is None:
@@ -65,12 +240,49 @@ class TTSQueue:
         self.current_process = None
         self.temp_dir = tempfile.mkdtemp(prefix="tts_")
         
-        # Check if piper is available
-        self._check_piper_available()
+        # In-process engine state; bumping the generation invalidates queued work
+        self.engine: Optional[PiperEngine] = None
+        self.output: Optional[PCMOutput] = None
+        self.text_queue = Queue()
+        self.synthesis_thread = None
+        self._generation = 0
+        self._utterance_seq = 0
+        
+        if in_process is None:
+            in_process = os.environ.get("TTS_IN_PROCESS", "1").lower() not in ("0", "false", "no")
+        if in_process:
+            self._load_engine()
+        
+        if self.engine is None:
+            # Check if piper is available
+            self._check_piper_available()
+        else:
+            self._start_synthesis_thread()
+        
+        # Phrase cache: repeated short phrases skip synthesis entirely
+        self.cache: Optional[PhraseCache] = None
+        if use_cache is None:
+            use_cache = os.environ.get("TTS_CACHE", "1").lower() not in ("0", "false", "no")
+        if use_cache:
+            self.cache = PhraseCache(
+                cache_dir=os.environ.get("TTS_CACHE_DIR", str(Path.home() / ".cache" / "reachy_mini_tts")),
+                max_memory_bytes=int(float(os.environ.get("TTS_CACHE_MEMORY_MB", "32")) * 1024 * 1024)
+            )
+            self._start_prewarm_thread()
         
         # Start playback thread
         self._start_playback_thread()
     
+    def _load_engine(self):
+        """Load the resident piper voice, leaving the subprocess path in place on failure."""
+        try:
+            self.engine = PiperEngine(self.voice_model, self.length_scale)
+            self.output = PCMOutput(self.engine.sample_rate, self.audio_device)
+        except Exception as e:
+            print(f"⚠️  In-process piper unavailable ({e}); using piper executable")
+            self.engine = None
+            self.output = None
+    
     def _find_default_model(self) -> Optional[str]:
         """Try to find a default piper model."""
         # Common locations for piper models
@@ -123,12 +335,136 @@ class TTSQueue:
     
     def _start_playback_thread(self):
         """Start the background playback thread."""
-        self.playback_thread = threading.Thread(target=self._playback_worker, daemon=True)
+        target = self._playback_worker if self.engine is None else self._stream_playback_worker
+        self.playback_thread = threading.Thread(target=target, daemon=True)
         self.playback_thread.start()
     
+    def _start_prewarm_thread(self):
+        """Pre-synthesize the phrase list in the background so startup is not delayed."""
+        phrase_file = os.environ.get("TTS_PREWARM_FILE", str(Path(__file__).parent / "tts_phrases.txt"))
+        if not phrase_file or not os.path.exists(phrase_file):
+            return
+        
+        def _prewarm():
+            try:
+                phrases = load_phrase_list(phrase_file)
+                start = time.time()
+                warmed = self.cache.prewarm(phrases, self.voice_model, self.length_scale, self.synthesize_pcm)
+                print(f"✓ TTS cache pre-warmed: {warmed} new / {len(phrases)} phrases "
+                      f"({time.time() - start:.1f}s)")
+            except Exception as e:
+                print(f"⚠️  TTS cache pre-warm failed: {e}")
+        
+        threading.Thread(target=_prewarm, daemon=True).start()
+    
+    def synthesize_pcm(self, text: str) -> Optional[Tuple[int, bytes]]:
+        """
+        Synthesize a whole phrase to memory (used for cache pre-warming).
+        
+        Returns:
+            (sample_rate, 16-bit mono PCM), or None if synthesis failed
+        """
+        if self.engine is not None:
+            return self.engine.sample_rate, b"".join(self.engine.synthesize(text))
+        audio_file = self.text_to_speech(text, use_cache=False)
+        if audio_file is None:
+            return None
+        try:
+            return self._read_wav(audio_file)
+        finally:
+            os.unlink(audio_file)
+    
+    @staticmethod
+    def _read_wav(path: str) -> Tuple[int, bytes]:
+        with wave.open(path, 'rb') as wav:
+            return wav.getframerate(), wav.readframes(wav.getnframes())
+    
+    def _start_synthesis_thread(self):
+        """Start the background synthesis thread (in-process engine only)."""
+        self.synthesis_thread = threading.Thread(target=self._synthesis_worker, daemon=True)
+        self.synthesis_thread.start()
+    
+    def _synthesis_worker(self):
+        """Synthesize queued text sentence by sentence, ahead of playback."""
+        while not self.should_stop:
+            try:
+                item = self.text_queue.get(timeout=0.5)
+            except Empty:
+                continue
+            if item is None:  # Poison pill to stop
+                break
+            
+            generation, seq, text = item
+            try:
+                cache_key = self.cache.key(self.voice_model, text, self.length_scale) if self.cache else None
+                cached = self.cache.get(cache_key, text) if cache_key else None
+                if cached is not None:
+                    self.audio_queue.put((generation, seq, text, cached[1]))
+                    continue
+                
+                synth_start = time.time()
+                first = True
+                chunks = []
+                for pcm in self.engine.synthesize(text):
+                    if generation != self._generation:
+                        break
+                    if first:
+                        print(f"   ⏱️  First audio in {(time.time() - synth_start) * 1000:.0f}ms")
+                        first = False
+                    chunks.append(pcm)
+                    self.audio_queue.put((generation, seq, text, pcm))
+                else:
+                    # Only complete (uncancelled) utterances are cached
+                    if cache_key:
+                        self.cache.put(cache_key, self.engine.sample_rate, b"".join(chunks))
+            except Exception as e:
+                print(f"⚠️  Error in synthesis worker: {e}")
+            finally:
+                # End-of-utterance marker so playback can close out the audit entry
+                self.audio_queue.put((generation, seq, text, None))
+    
+    def _stream_playback_worker(self):
+        """Background worker that streams synthesized PCM to the persistent output."""
+        audit_logger = get_logger()
+        current_seq = None
+        started_at = 0.0
+        
+        while not self.should_stop:
+            try:
+                item = self.audio_queue.get(timeout=0.5)
+            except Empty:
+                continue
+            if item is None:  # Poison pill to stop
+                break
+            
+            generation, seq, text, pcm = item
+            if generation != self._generation:
+                # Cleared while queued: finish the audit entry of an interrupted utterance
+                if current_seq == seq:
+                    audit_logger.log_tts_finished(text, (time.time() - started_at) * 1000)
+                    current_seq = None
+                    self.is_playing = False
+                continue
+            
+            if seq != current_seq:
+                current_seq = seq
+                started_at = time.time()
+                self.is_playing = True
+                # Audit log: TTS started
+                audit_logger.log_tts_started(text, "<stream>")
+            
+            if pcm is not None:
+                self.output.write(pcm, lambda: generation != self._generation or self.should_stop)
+                continue
+            
+            # End of utterance: report when the buffered tail will have finished playing
+            duration_ms = (max(self.output.play_end, time.time()) - started_at) * 1000
+            audit_logger.log_tts_finished(text, duration_ms)
+            current_seq = None
+            self.is_playing = False
+    
     def _playback_worker(self):
         """Background worker that processes the audio queue."""
-        import time
         audit_logger = get_logger()
         
         while not self.should_stop:
@@ -212,17 +548,17 @@ class TTSQueue:
             
         except Exception as e:
             print(f"⚠️  Error playing audio: {e}")
-            import traceback
             traceback.print_exc()
         finally:
             self.is_playing = False
     
-    def text_to_speech(self, text: str) -> Optional[str]:
+    def text_to_speech(self, text: str, use_cache: bool = True) -> Optional[str]:
         """
         Convert text to speech using piper.
         
         Args:
             text: Text to convert to speech
+            use_cache: Serve from / store into the phrase cache
             
         Returns:
             Path to generated WAV file, or None if conversion failed
@@ -230,6 +566,13 @@ class TTSQueue:
         if not text.strip():
             return None
         
+        cache_key = None
+        if use_cache and self.cache:
+            cache_key = self.cache.key(self.voice_model, text, self.length_scale)
+            cached = self.cache.get(cache_key, text) if cache_key else None
+            if cached is not None:
+                return self._write_temp_wav(*cached)
+        
         try:
             # Create a temporary file for the output
             temp_file = tempfile.NamedTemporaryFile(
@@ -247,6 +590,9 @@ class TTSQueue:
             # Model is required
             cmd.extend(["--model", self.voice_model])
             
+            if self.length_scale is not None:
+                cmd.extend(["--length_scale", str(self.length_scale)])
+            
             cmd.extend(["--output_file", output_path])
             
             # Run piper with text as input
@@ -258,6 +604,8 @@ class TTSQueue:
             )
             
             if result.returncode == 0 and os.path.exists(output_path):
+                if cache_key:
+                    self.cache.put(cache_key, *self._read_wav(output_path))
                 return output_path
             else:
                 print(f"⚠️  piper conversion failed: {result.stderr.decode('utf-8', errors='ignore')}")
@@ -269,6 +617,17 @@ class TTSQueue:
             print(f"⚠️  Error in text_to_speech: {e}")
             return None
     
+    def _write_temp_wav(self, sample_rate: int, pcm: bytes) -> str:
+        """Write cached PCM to a temp WAV for the file playback path."""
+        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', dir=self.temp_dir, delete=False)
+        temp_file.close()
+        with wave.open(temp_file.name, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return temp_file.name
+    
     def extract_quoted_text(self, text: str) -> List[str]:
         """
         Extract text between "..." from the response.
@@ -305,6 +664,13 @@ class TTSQueue:
         # Audit log: TTS request queued
         audit_logger.log_tts_request_queued(text_to_speak)
         
+        if self.engine is not None:
+            # Synthesis thread picks it up; playback starts with the first sentence
+            self._utterance_seq += 1
+            self.text_queue.put((self._generation, self._utterance_seq, text_to_speak))
+            print(f'   ✓ Queued: "{text_to_speak[:50]}..."' if len(text_to_speak) > 50 else f'   ✓ Queued: "{text_to_speak}"')
+            return
+        
         # Convert to speech
         audio_file = self.text_to_speech(text_to_speak)
         
@@ -315,12 +681,24 @@ class TTSQueue:
     
     def clear_queue(self):
         """Clear all pending audio from the queue."""
+        if self.engine is not None:
+            # Invalidate in-flight synthesis and queued PCM, then cut the speaker off
+            self._generation += 1
+            while True:
+                try:
+                    self.text_queue.get_nowait()
+                except Empty:
+                    break
+            self.output.stop()
+            print("🔇 TTS queue cleared")
+            return
+        
         # Clear the queue
         while not self.audio_queue.empty():
             try:
                 audio_file = self.audio_queue.get_nowait()
                 # Clean up the temporary file
-                if audio_file and os.path.exists(audio_file):
+                if isinstance(audio_file, str) and os.path.exists(audio_file):
                     try:
                         os.unlink(audio_file)
                     except Exception:
@@ -348,13 +726,20 @@ class TTSQueue:
         # Stop playback thread
         self.should_stop = True
         self.audio_queue.put(None)  # Poison pill
+        self.text_queue.put(None)
         
         # Clear any remaining audio
         self.clear_queue()
         
-        # Wait for thread to finish
+        # Wait for threads to finish
         if self.playback_thread and self.playback_thread.is_alive():
             self.playback_thread.join(timeout=2)
+        if self.synthesis_thread and self.synthesis_thread.is_alive():
+            self.synthesis_thread.join(timeout=2)
+        if self.output is not None:
+            self.output.close()
+        if self.cache is not None:
+            self.cache.log_stats()
         
         # Clean up temp directory
         try:
@@ -369,8 +754,8 @@ class AsyncTTSQueue:
     """Async wrapper for TTSQueue."""
     
     def __init__(self, piper_executable: str = "piper", voice_model: Optional[str] = None,
-                 audio_device: Optional[str] = None):
-        self.tts_queue = TTSQueue(piper_executable, voice_model, audio_device)
+                 audio_device: Optional[str] = None, in_process: Optional[bool] = None):
+        self.tts_queue = TTSQueue(piper_executable, voice_model, audio_device, in_process)
     
     async def enqueue_text(self, text: str):
         """Enqueue text for TTS (async version)."""
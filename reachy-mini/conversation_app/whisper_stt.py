@@ -2,20 +2,50 @@
 """
 Speech-to-Text (STT) Module using Faster Whisper
 
-This module provides speech-to-text transcription using faster-whisper.
+This module provides speech-to-text transcription using faster-whisper:
+1. WhisperSTT: file and in-memory array transcription
+2. StreamingTranscriber: incremental transcription of a growing utterance
 """
 
 import numpy as np
+import re
+import threading
 import wave
-import tempfile
-import os
 import logging
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Tuple, Union
 from faster_whisper import WhisperModel
 
 logger = logging.getLogger(__name__)
 
+# Whisper expects 16kHz mono float32
+WHISPER_SAMPLE_RATE = 16000
+
+# WebRTC VAD sometimes makes mistakes, and whisper mis-transcribes it
+HALLUCINATIONS = [
+    "Thank you for watching.",
+    "Thank you.",
+    "Okay.",
+    "Thanks for watching.",
+    "I'll see you next time.",
+    "We'll be right back.",
+    "Thanks for watching!",
+]
+
+
+def to_whisper_audio(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Convert int16 (or float) audio to 16kHz float32 in [-1, 1]."""
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    else:
+        audio = audio.astype(np.float32, copy=False)
+    if sample_rate != WHISPER_SAMPLE_RATE and len(audio) > 0:
+        n_out = int(round(len(audio) * WHISPER_SAMPLE_RATE / sample_rate))
+        x_out = np.linspace(0, len(audio) - 1, n_out, dtype=np.float64)
+        audio = np.interp(x_out, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
 
 class WhisperSTT:
     """Speech-to-Text using Faster Whisper"""
@@ -25,7 +55,8 @@ class WhisperSTT:
         model_path_or_size: str = "base",
         device: str = "cpu",
         compute_type: str = "int8",
-        language: str = "en"
+        language: str = "en",
+        condition_on_previous_text: bool = False
     ):
         """
         Initialize Whisper STT
@@ -36,6 +67,10 @@ class WhisperSTT:
             device: Device to run on (cpu, cuda)
             compute_type: Compute type (float16, float32, int8)
             language: Language code for transcription
+            condition_on_previous_text: Condition each segment on the previous one in
+                                        transcribe_array() (off: the committed text is
+                                        passed as prompt instead, and conditioning
+                                        tends to repeat hallucinations across segments)
         """
         self.model_path_or_size = model_path_or_size
         self.device = device
@@ -47,6 +82,7 @@ class WhisperSTT:
         
         self.compute_type = compute_type
         self.language = language
+        self.condition_on_previous_text = condition_on_previous_text
         
         # Detect if model_path_or_size is a local path or a model size
         # Check if it's an absolute path AND the directory exists
@@ -124,9 +160,47 @@ class WhisperSTT:
             logger.error(f"Error during transcription: {e}", exc_info=True)
             return None
     
+    def transcribe_array(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = None,
+        beam_size: int = 5,
+        initial_prompt: Optional[str] = None,
+        word_timestamps: bool = False
+    ) -> list:
+        """
+        Transcribe in-memory 16kHz float32 audio
+        
+        Args:
+            audio: Audio from to_whisper_audio()
+            language: Language code (uses default if not specified)
+            beam_size: Beam size for transcription
+            initial_prompt: Preceding text to condition on
+            word_timestamps: Include per-word timings on the segments
+            
+        Returns:
+            List of faster-whisper segments (times relative to the start of ``audio``)
+        """
+        segments, info = self.model.transcribe(
+            audio,
+            language=language or self.language,
+            beam_size=beam_size,
+            initial_prompt=initial_prompt or None,
+            word_timestamps=word_timestamps,
+            condition_on_previous_text=self.condition_on_previous_text
+        )
+        return list(segments)
+    
+    @staticmethod
+    def filter_hallucination(text: Optional[str]) -> Optional[str]:
+        """Drop stock phrases Whisper produces for non-speech audio."""
+        if text in HALLUCINATIONS:
+            return ""
+        return text
+    
     def transcribe_audio_data(
         self,
-        audio_chunks: List[np.ndarray],
+        audio_chunks: Union[np.ndarray, List[np.ndarray]],
         sample_rate: int,
         sample_width: int = 2,
         language: Optional[str] = None,
@@ -136,7 +210,7 @@ class WhisperSTT:
         Transcribe audio from numpy arrays
         
         Args:
-            audio_chunks: List of numpy arrays containing audio data
+            audio_chunks: Audio array, or list of numpy arrays to concatenate
             sample_rate: Audio sample rate in Hz
             sample_width: Sample width in bytes (default 2 for int16)
             language: Language code (uses default if not specified)
@@ -145,46 +219,26 @@ class WhisperSTT:
         Returns:
             Transcribed text or None if transcription fails
         """
-        if not audio_chunks:
+        if audio_chunks is None or len(audio_chunks) == 0:
             logger.warning("No audio data provided for transcription")
             return None
         
         try:
             # Combine audio chunks
-            combined_audio = np.concatenate(audio_chunks)
-            
-            # Create a temporary WAV file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_wav:
-                temp_wav_path = temp_wav.name
+            if isinstance(audio_chunks, np.ndarray):
+                combined_audio = audio_chunks
+            else:
+                combined_audio = np.concatenate(audio_chunks)
             
-            try:
-                # Write audio to temporary file
-                self._save_audio_to_wav(
-                    combined_audio,
-                    temp_wav_path,
-                    sample_rate,
-                    sample_width
-                )
-                
-                # Transcribe the temporary file
-                result = self.transcribe(temp_wav_path, language, beam_size)
-
-                # WebRTC VAD sometimes makes mistakes, and whisper mis-transcribes it
-                if result in ["Thank you for watching.", 
-                    "Thank you.", 
-                    "Okay.", 
-                    "Thanks for watching.",
-                    "I'll see you next time.",
-                    "We'll be right back.",
-                    "Thanks for watching!"]:
-                    result = ""
-                return result
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_wav_path)
-                except Exception as e:
-                    logger.warning(f"Failed to delete temporary file {temp_wav_path}: {e}")
+            # Feed the model directly from memory (no temporary WAV round trip)
+            segments = self.transcribe_array(
+                to_whisper_audio(combined_audio, sample_rate),
+                language,
+                beam_size
+            )
+            result = " ".join(seg.text.strip() for seg in segments if seg.text.strip()).strip()
+            logger.info(f"Transcription complete: '{result}'")
+            return self.filter_hallucination(result or None)
         
         except Exception as e:
             logger.error(f"Error in transcribe_audio_data: {e}", exc_info=True)
@@ -223,3 +277,151 @@ class WhisperSTT:
         """
         self.language = language
         logger.info(f"Language updated to {language}")
+
+
+@dataclass
+class StreamWindow:
+    """Uncommitted tail of an utterance, snapshotted for a transcription pass."""
+    generation: int
+    start_sample: int  # Offset of ``audio`` within the utterance (capture sample rate)
+    audio: np.ndarray  # 16kHz float32
+
+
+def _norm_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of a growing utterance.
+    
+    Each pass only transcribes audio after the last committed word (plus a
+    short overlap for context, with the committed text as prompt).  Words
+    that two consecutive passes agree on are committed and never
+    re-transcribed (local agreement), so partial updates cost O(new audio)
+    instead of O(utterance) and the final transcription only has to cover
+    the uncommitted tail.
+    
+    ``snapshot`` runs on the event loop and copies just the tail; ``update``
+    and ``finalize`` run in a worker thread and are serialized by a lock.
+    ``finalize`` takes its own snapshot under the lock, so the tail reflects
+    words committed by a partial pass that was still running.
+    """
+    
+    def __init__(
+        self,
+        stt: WhisperSTT,
+        sample_rate: int,
+        overlap_s: float = 0.5,
+        partial_beam_size: int = 1,
+        final_beam_size: int = 5,
+        prompt_chars: int = 200
+    ):
+        """
+        Initialize the streaming transcriber
+        
+        Args:
+            stt: Loaded WhisperSTT instance
+            sample_rate: Sample rate of the utterance audio
+            overlap_s: Audio before the commit point re-fed to the model for context
+            partial_beam_size: Beam size for partial passes
+            final_beam_size: Beam size for the final pass
+            prompt_chars: Committed text passed as initial prompt
+        """
+        self.stt = stt
+        self.sample_rate = sample_rate
+        self.overlap_samples = int(overlap_s * sample_rate)
+        self.partial_beam_size = partial_beam_size
+        self.final_beam_size = final_beam_size
+        self.prompt_chars = prompt_chars
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Start a new utterance (pending passes for the old one are discarded)."""
+        self.generation = getattr(self, "generation", 0) + 1
+        self.committed_words: List[str] = []
+        self.committed_sample = 0  # Utterance sample offset up to which text is committed
+        self._hypothesis: List[Tuple[str, int, int]] = []  # (word, start, end) after the commit point
+    
+    @property
+    def committed_text(self) -> str:
+        return "".join(self.committed_words).strip()
+    
+    def snapshot(self, audio: np.ndarray) -> StreamWindow:
+        """
+        Copy the uncommitted tail of the utterance (call on the capture thread/loop).
+        
+        Args:
+            audio: Whole utterance so far (int16, may be a view that is later reused)
+        """
+        start = max(0, self.committed_sample - self.overlap_samples)
+        return StreamWindow(self.generation, start, to_whisper_audio(audio[start:], self.sample_rate))
+    
+    def _transcribe_words(self, window: StreamWindow, beam_size: int) -> List[Tuple[str, int, int]]:
+        """Transcribe a window and return words past the commit point, in utterance samples."""
+        prompt = self.committed_text[-self.prompt_chars:]
+        segments = self.stt.transcribe_array(
+            window.audio,
+            beam_size=beam_size,
+            initial_prompt=prompt,
+            word_timestamps=True
+        )
+        words = []
+        for segment in segments:
+            for w in segment.words or []:
+                start = window.start_sample + int(w.start * self.sample_rate)
+                end = window.start_sample + int(w.end * self.sample_rate)
+                # Words centred in the overlap were already committed
+                if (start + end) // 2 > self.committed_sample:
+                    words.append((w.word, start, end))
+        return words
+    
+    def update(self, window: StreamWindow) -> Optional[str]:
+        """
+        Run a partial pass and commit the words it agrees on with the previous pass.
+        
+        Returns:
+            Current best full text (committed + tentative), or None if the
+            utterance was reset meanwhile
+        """
+        with self._lock:
+            if window.generation != self.generation:
+                return None
+            words = self._transcribe_words(window, self.partial_beam_size)
+            
+            agreed = 0
+            for new, old in zip(words, self._hypothesis):
+                if _norm_word(new[0]) != _norm_word(old[0]) or not _norm_word(new[0]):
+                    break
+                agreed += 1
+            if agreed:
+                self.committed_words.extend(w for w, _, _ in words[:agreed])
+                self.committed_sample = words[agreed - 1][2]
+                logger.debug(f"Committed {agreed} words up to {self.committed_sample / self.sample_rate:.2f}s: "
+                             f"'{self.committed_text}'")
+            self._hypothesis = words[agreed:]
+            
+            return "".join(self.committed_words + [w for w, _, _ in self._hypothesis]).strip()
+    
+    def finalize(self, audio: np.ndarray, generation: int) -> Optional[str]:
+        """
+        Transcribe the uncommitted tail and return the full utterance text.
+        
+        Waits for an in-flight partial pass, whose commits shrink the tail.
+        
+        Args:
+            audio: Whole utterance (int16, must not change until this returns)
+            generation: ``generation`` when the utterance ended
+        """
+        with self._lock:
+            if generation != self.generation:
+                return None
+            window = self.snapshot(audio)
+            tail_s = len(window.audio) / WHISPER_SAMPLE_RATE
+            committed_s = self.committed_sample / self.sample_rate
+            words = self._transcribe_words(window, self.final_beam_size)
+            text = "".join(self.committed_words + [w for w, _, _ in words]).strip()
+            logger.info(f"Final transcription: {committed_s:.2f}s already committed, "
+                        f"{tail_s:.2f}s tail transcribed")
+            return WhisperSTT.filter_hallucination(text or None)
@@ -5,15 +5,25 @@ Test script for STT-enabled Hearing Event Emitter
 This script connects to the hearing event emitter and displays
 speech detection events with transcriptions in real-time.
 
+Reads both the emitter's newline-delimited JSON and the conversation
+gateway's length-prefixed frames ([4-byte length][1-byte codec][payload]),
+detected from the first byte like conversation_app's EventClient.
+
 Usage:
     python3 test_stt.py
 """
 
 import socket
+import struct
 import json
 import sys
 import os
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 SOCKET_PATH = os.getenv('SOCKET_PATH', '/tmp/reachy_sockets/hearing.sock')
 
 def main():
@@ -28,24 +38,40 @@ def main():
         print("Connected! Listening for speech events...")
         print("-" * 60)
         
-        buffer = ""
+        buffer = b""
+        framed = None  # Length-prefixed frames start with a 0 byte, JSON lines with '{'
         while True:
             # Receive data
-            data = client.recv(4096).decode('utf-8')
+            data = client.recv(4096)
             if not data:
                 print("Connection closed by server")
                 break
             
-            # Add to buffer and process complete lines
             buffer += data
-            while '\n' in buffer:
-                line, buffer = buffer.split('\n', 1)
-                if line.strip():
+            if framed is None:
+                framed = buffer[:1] == b'\x00'
+            
+            if framed:
+                # Process complete frames
+                while len(buffer) >= 4:
+                    (length,) = struct.unpack(">I", buffer[:4])
+                    if len(buffer) < 4 + length:
+                        break
+                    frame, buffer = buffer[4:4 + length], buffer[4 + length:]
                     try:
-                        event = json.loads(line)
-                        display_event(event)
-                    except json.JSONDecodeError as e:
-                        print(f"Error decoding JSON: {e}")
+                        display_event(decode_frame(frame))
+                    except ValueError as e:
+                        print(f"Error decoding event: {e}")
+            else:
+                # Process complete lines
+                while b'\n' in buffer:
+                    line, buffer = buffer.split(b'\n', 1)
+                    if line.strip():
+                        try:
+                            event = json.loads(line)
+                            display_event(event)
+                        except json.JSONDecodeError as e:
+                            print(f"Error decoding JSON: {e}")
     
     except FileNotFoundError:
         print(f"Error: Socket not found at {SOCKET_PATH}")
@@ -60,6 +86,15 @@ def main():
     finally:
         client.close()
 
+def decode_frame(frame):
+    """Decode one length-prefixed frame (codec byte + payload)"""
+    codec, payload = frame[0], frame[1:]
+    if codec == 1:
+        if msgpack is None:
+            raise ValueError("Received msgpack event but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    return json.loads(payload)
+
 def display_event(event):
     """Display event in a readable format"""
     event_type = event.get('type', 'unknown')
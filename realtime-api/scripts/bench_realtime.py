@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""Load and latency benchmark for the realtime bridge with local stand-in backends.
+
+Starts ``scripts/mock_backends.py`` (deterministic STT / LLM / TTS) and the
+bridge itself (``python -m realtime_api.main``) as subprocesses, then drives
+N simulated WebSocket clients per load level.  Each client streams audio in
+real time, ends its turn (``input_audio_buffer.commit`` in manual mode, or
+trailing silence with ``--vad``), and simulates playback of the reply.
+
+Reported per load level:
+    speech-end → first transcript token, speech-end → first audio,
+    inter-sentence playback gaps (client ran dry), server CPU % per session,
+    and the largest level that still meets the latency SLOs.
+
+Usage:
+    python3 scripts/bench_realtime.py --sessions 1,2,4,8,16 --turns 3
+    python3 scripts/bench_realtime.py --tts-mode whole --server-env TTS_LOOKAHEAD=1
+    python3 scripts/bench_realtime.py --wav speech_24k.wav --vad   # needs torch + silero-vad
+
+Mock backend latencies are passed through (``--stt-ms``, ``--llm-ttft-ms``,
+``--llm-tps``, ``--tts-base-ms``, ``--tts-rtf``, ``--tts-ms-per-char``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+import wave
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import httpx
+import numpy as np
+import websockets
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from realtime_api.audio import resample_pcm16  # noqa: E402
+from realtime_api.protocol import (  # noqa: E402
+    CLIENT_SAMPLE_RATE,
+    FRAME_KIND_INPUT_AUDIO,
+    pack_audio_frame,
+    unpack_audio_frame,
+)
+
+CHUNK_MS = 40
+CHUNK_BYTES = CLIENT_SAMPLE_RATE * CHUNK_MS // 1000 * 2
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+@dataclass
+class TurnMetrics:
+    client: int
+    turn: int
+    status: str = "error"
+    first_token_ms: float | None = None
+    first_audio_ms: float | None = None
+    done_ms: float | None = None
+    audio_s: float = 0.0
+    gaps_ms: list[float] = field(default_factory=list)
+
+
+@dataclass
+class LevelResult:
+    sessions: int
+    turns: int
+    errors: int
+    first_token_p50: float | None
+    first_token_p95: float | None
+    first_audio_p50: float | None
+    first_audio_p95: float | None
+    gap_p95: float
+    gap_max: float
+    cpu_pct_per_session: float | None
+    meets_slo: bool
+
+
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    return float(np.percentile(values, q))
+
+
+def _fmt(v: float | None) -> str:
+    return "-" if v is None else f"{v:.0f}"
+
+
+def _proc_cpu_s(pid: int) -> float | None:
+    """User+system CPU seconds of *pid* from /proc (Linux only)."""
+    try:
+        fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    # Fields after the ")" start at index 3 (state); utime/stime are 14/15
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+# ---------------------------------------------------------------------------
+# Audio input
+# ---------------------------------------------------------------------------
+def load_speech(path: str | None, seconds: float) -> bytes:
+    """PCM16 24kHz mono speech: from a WAV file, or a synthetic voiced burst."""
+    if path:
+        with wave.open(path, "rb") as wf:
+            channels, rate = wf.getnchannels(), wf.getframerate()
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        if channels > 1:
+            samples = samples[::channels]
+        return resample_pcm16(samples.tobytes(), rate, CLIENT_SAMPLE_RATE)
+
+    rng = np.random.default_rng(0)
+    n = int(seconds * CLIENT_SAMPLE_RATE)
+    t = np.arange(n) / CLIENT_SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)  # ~4 syllables/s
+    voiced = np.sin(2 * np.pi * 140 * t) + 0.3 * rng.standard_normal(n)
+    return (voiced * envelope * 6000).astype(np.int16).tobytes()
+
+
+# ---------------------------------------------------------------------------
+# Simulated client
+# ---------------------------------------------------------------------------
+async def run_client(idx: int, url: str, speech: bytes, args: argparse.Namespace) -> list[TurnMetrics]:
+    results: list[TurnMetrics] = []
+    binary = args.audio_transport == "binary"
+    silence = b"\x00" * CHUNK_BYTES
+
+    async with websockets.connect(url, subprotocols=["realtime"], max_size=None) as ws:
+        await ws.recv()  # session.created
+        session = {
+            "tts_mode": args.tts_mode,
+            "audio_transport": args.audio_transport,
+            "turn_detection": (
+                {"type": "server_vad", "silence_duration_ms": args.vad_silence_ms} if args.vad else None
+            ),
+        }
+        await ws.send(json.dumps({"type": "session.update", "session": session}))
+        while json.loads(await ws.recv()).get("type") != "session.updated":
+            pass
+
+        seq = 0
+
+        async def send_audio(pcm: bytes):
+            nonlocal seq
+            seq += 1
+            if binary:
+                await ws.send(pack_audio_frame(FRAME_KIND_INPUT_AUDIO, seq, pcm))
+            else:
+                b64 = base64.b64encode(pcm).decode("ascii")
+                await ws.send(json.dumps({"type": "input_audio_buffer.append", "audio": b64}))
+
+        for turn in range(args.turns):
+            m = TurnMetrics(client=idx, turn=turn)
+
+            # Stream speech at real time
+            t_next = time.monotonic()
+            for off in range(0, len(speech), CHUNK_BYTES):
+                await send_audio(speech[off:off + CHUNK_BYTES])
+                t_next += CHUNK_MS / 1000
+                await asyncio.sleep(max(0.0, t_next - time.monotonic()))
+            speech_end = time.monotonic()
+
+            silence_task = None
+            if args.vad:
+                async def _stream_silence():
+                    t = time.monotonic()
+                    while True:
+                        await send_audio(silence)
+                        t += CHUNK_MS / 1000
+                        await asyncio.sleep(max(0.0, t - time.monotonic()))
+                silence_task = asyncio.create_task(_stream_silence())
+            else:
+                await ws.send(json.dumps({"type": "input_audio_buffer.commit"}))
+
+            play_end: float | None = None
+
+            def on_audio(n_bytes: int):
+                nonlocal play_end
+                now = time.monotonic()
+                if m.first_audio_ms is None:
+                    m.first_audio_ms = (now - speech_end) * 1000
+                elif play_end is not None and now - play_end > args.gap_threshold_ms / 1000:
+                    m.gaps_ms.append((now - play_end) * 1000)
+                dur = n_bytes / 2 / CLIENT_SAMPLE_RATE
+                m.audio_s += dur
+                play_end = max(play_end or now, now) + dur
+
+            try:
+                while True:
+                    msg = await asyncio.wait_for(ws.recv(), timeout=args.turn_timeout)
+                    if isinstance(msg, bytes):
+                        _kind, _seq, pcm = unpack_audio_frame(msg)
+                        on_audio(len(pcm))
+                        continue
+                    event = json.loads(msg)
+                    etype = event.get("type")
+                    if etype == "response.audio_transcript.delta" and m.first_token_ms is None:
+                        m.first_token_ms = (time.monotonic() - speech_end) * 1000
+                    elif etype == "response.audio.delta":
+                        on_audio(len(base64.b64decode(event["delta"])))
+                    elif etype == "response.done":
+                        m.status = event["response"]["status"]
+                        m.done_ms = (time.monotonic() - speech_end) * 1000
+                        break
+                    elif etype == "error":
+                        print(f"  client {idx}: error {event['error'].get('message')}", file=sys.stderr)
+            except asyncio.TimeoutError:
+                m.status = "timeout"
+            finally:
+                if silence_task:
+                    silence_task.cancel()
+
+            results.append(m)
+            # Let the simulated playback finish before the next turn
+            if play_end is not None:
+                await asyncio.sleep(max(0.0, play_end - time.monotonic()))
+            await asyncio.sleep(args.think_ms / 1000)
+
+    return results
+
+
+async def run_level(n: int, url: str, speech: bytes, server_pid: int | None,
+                    args: argparse.Namespace) -> tuple[LevelResult, list[TurnMetrics]]:
+    cpu0 = _proc_cpu_s(server_pid) if server_pid else None
+    t0 = time.monotonic()
+    outcomes = await asyncio.gather(
+        *(run_client(i, url, speech, args) for i in range(n)), return_exceptions=True
+    )
+    wall = time.monotonic() - t0
+    cpu1 = _proc_cpu_s(server_pid) if server_pid else None
+
+    turns: list[TurnMetrics] = []
+    errors = 0
+    for out in outcomes:
+        if isinstance(out, BaseException):
+            print(f"  client failed: {out!r}", file=sys.stderr)
+            errors += args.turns
+            continue
+        turns.extend(out)
+        errors += sum(1 for t in out if t.status != "completed")
+
+    ok = [t for t in turns if t.status == "completed"]
+    first_token = [t.first_token_ms for t in ok if t.first_token_ms is not None]
+    first_audio = [t.first_audio_ms for t in ok if t.first_audio_ms is not None]
+    gaps = [g for t in ok for g in t.gaps_ms] or [0.0]
+    cpu_pct = None
+    if cpu0 is not None and cpu1 is not None and wall > 0:
+        cpu_pct = (cpu1 - cpu0) / wall / n * 100
+
+    fa_p95 = _pct(first_audio, 95)
+    result = LevelResult(
+        sessions=n,
+        turns=len(turns),
+        errors=errors,
+        first_token_p50=_pct(first_token, 50),
+        first_token_p95=_pct(first_token, 95),
+        first_audio_p50=_pct(first_audio, 50),
+        first_audio_p95=fa_p95,
+        gap_p95=_pct(gaps, 95) or 0.0,
+        gap_max=max(gaps),
+        cpu_pct_per_session=cpu_pct,
+        meets_slo=(
+            errors == 0
+            and fa_p95 is not None
+            and fa_p95 <= args.slo_first_audio_ms
+            and (_pct(gaps, 95) or 0.0) <= args.slo_gap_ms
+        ),
+    )
+    return result, turns
+
+
+# ---------------------------------------------------------------------------
+# Process management
+# ---------------------------------------------------------------------------
+async def _wait_healthy(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not healthy after {timeout:.0f}s")
+
+
+def _start_mocks(args: argparse.Namespace) -> subprocess.Popen:
+    cmd = [
+        sys.executable, str(ROOT / "scripts" / "mock_backends.py"),
+        "--port", str(args.mock_port),
+        "--stt-ms", str(args.stt_ms),
+        "--llm-ttft-ms", str(args.llm_ttft_ms),
+        "--llm-tps", str(args.llm_tps),
+        "--tts-base-ms", str(args.tts_base_ms),
+        "--tts-rtf", str(args.tts_rtf),
+        "--tts-ms-per-char", str(args.tts_ms_per_char),
+    ]
+    return subprocess.Popen(cmd)
+
+
+def _start_server(args: argparse.Namespace, mock_url: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(ROOT / "src") + os.pathsep + env.get("PYTHONPATH", ""),
+        "HOST": "127.0.0.1",
+        "PORT": str(args.server_port),
+        "TTS_URL": mock_url,
+        "STT_URL": mock_url,
+        "OPENAI_BASE_URL": mock_url,
+        # Manual mode needs no Silero/torch in the bridge
+        "DEFAULT_TURN_DETECTION": "server_vad" if args.vad else "none",
+    })
+    for item in args.server_env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    log_file = open(args.server_log, "w") if args.server_log else subprocess.DEVNULL
+    return subprocess.Popen([sys.executable, "-m", "realtime_api.main"], env=env,
+                            stdout=log_file, stderr=subprocess.STDOUT)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def print_table(results: list[LevelResult]):
+    header = (f"{'sess':>5} {'turns':>6} {'err':>4} {'tok p50':>8} {'tok p95':>8} "
+              f"{'aud p50':>8} {'aud p95':>8} {'gap p95':>8} {'gap max':>8} {'cpu%/s':>7} {'SLO':>4}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        cpu = "-" if r.cpu_pct_per_session is None else f"{r.cpu_pct_per_session:.1f}"
+        print(f"{r.sessions:>5} {r.turns:>6} {r.errors:>4} {_fmt(r.first_token_p50):>8} "
+              f"{_fmt(r.first_token_p95):>8} {_fmt(r.first_audio_p50):>8} {_fmt(r.first_audio_p95):>8} "
+              f"{r.gap_p95:>8.0f} {r.gap_max:>8.0f} {cpu:>7} {'ok' if r.meets_slo else 'FAIL':>4}")
+    print("(latencies in ms from speech end; gaps = client playback underruns)")
+
+
+async def main_async(args: argparse.Namespace):
+    procs: list[subprocess.Popen] = []
+    try:
+        mock_url = args.mock_url
+        if not mock_url:
+            procs.append(_start_mocks(args))
+            mock_url = f"http://127.0.0.1:{args.mock_port}"
+            await _wait_healthy(mock_url + "/health")
+
+        server_pid = args.server_pid
+        if args.server_url:
+            ws_url = args.server_url
+        else:
+            server = _start_server(args, mock_url)
+            procs.append(server)
+            server_pid = server.pid
+            await _wait_healthy(f"http://127.0.0.1:{args.server_port}/health")
+            ws_url = f"ws://127.0.0.1:{args.server_port}/v1/realtime"
+
+        speech = load_speech(args.wav, args.speech_s)
+        print(f"Bridge {ws_url} | mocks {mock_url} | tts_mode={args.tts_mode} "
+              f"transport={args.audio_transport} vad={args.vad} | speech={len(speech) / 2 / CLIENT_SAMPLE_RATE:.2f}s")
+
+        results: list[LevelResult] = []
+        raw: list[dict] = []
+        for n in args.sessions:
+            print(f"→ {n} session(s) × {args.turns} turn(s)...")
+            result, turns = await run_level(n, ws_url, speech, server_pid, args)
+            results.append(result)
+            raw.extend({"sessions": n, **asdict(t)} for t in turns)
+            if not result.meets_slo and args.stop_on_fail:
+                break
+
+        print()
+        print_table(results)
+        passing = [r.sessions for r in results if r.meets_slo]
+        print(f"\nMax sustainable sessions: {max(passing) if passing else 0} "
+              f"(first-audio p95 ≤ {args.slo_first_audio_ms:.0f}ms, gap p95 ≤ {args.slo_gap_ms:.0f}ms)")
+
+        if args.json:
+            Path(args.json).write_text(json.dumps(
+                {"args": vars(args), "levels": [asdict(r) for r in results], "turns": raw}, indent=2,
+            ))
+            print(f"Wrote {args.json}")
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--sessions", type=lambda s: [int(x) for x in s.split(",")], default=[1, 2, 4, 8],
+                   help="Comma-separated concurrent session counts (load levels)")
+    p.add_argument("--turns", type=int, default=3, help="Turns per session")
+    p.add_argument("--tts-mode", choices=["sentence", "whole"], default="sentence")
+    p.add_argument("--audio-transport", choices=["json", "binary"], default="json")
+    p.add_argument("--vad", action="store_true", help="Use server_vad turn detection (bridge needs torch)")
+    p.add_argument("--vad-silence-ms", type=int, default=600)
+    p.add_argument("--wav", help="Speech WAV to stream (default: synthetic voiced burst)")
+    p.add_argument("--speech-s", type=float, default=1.5, help="Synthetic speech length")
+    p.add_argument("--think-ms", type=float, default=300.0, help="Pause between turns")
+    p.add_argument("--turn-timeout", type=float, default=30.0)
+    p.add_argument("--gap-threshold-ms", type=float, default=20.0, help="Ignore underruns shorter than this")
+    p.add_argument("--slo-first-audio-ms", type=float, default=1500.0)
+    p.add_argument("--slo-gap-ms", type=float, default=150.0)
+    p.add_argument("--stop-on-fail", action="store_true", help="Stop ramping at the first failing level")
+    p.add_argument("--json", help="Write per-level and per-turn results to this file")
+    # Processes
+    p.add_argument("--server-url", help="Benchmark an already running bridge (ws://...)")
+    p.add_argument("--server-pid", type=int, help="PID of --server-url process for CPU accounting")
+    p.add_argument("--server-port", type=int, default=8181)
+    p.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                   help="Extra environment for the launched bridge (repeatable)")
+    p.add_argument("--server-log", help="Write the launched bridge's log to this file")
+    p.add_argument("--mock-url", help="Use already running mock backends")
+    p.add_argument("--mock-port", type=int, default=9100)
+    # Mock backend behaviour
+    p.add_argument("--stt-ms", type=float, default=150.0)
+    p.add_argument("--llm-ttft-ms", type=float, default=200.0)
+    p.add_argument("--llm-tps", type=float, default=60.0)
+    p.add_argument("--tts-base-ms", type=float, default=120.0)
+    p.add_argument("--tts-rtf", type=float, default=0.15)
+    p.add_argument("--tts-ms-per-char", type=float, default=60.0)
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async(parse_args()))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Deterministic stand-ins for Parakeet STT, the vLLM chat API and Magpie TTS.
+
+One FastAPI app serves all three endpoints the bridge calls, with fixed
+latencies and token rates so benchmark runs are repeatable without GPUs:
+
+    POST /v1/audio/transcriptions   → fixed transcript after --stt-ms
+    POST /v1/chat/completions       → SSE stream: first token after --llm-ttft-ms,
+                                      then --llm-tps tokens/s (non-stream: "CONTINUE")
+    POST /v1/audio/synthesize       → PCM16 22050Hz tone, --tts-ms-per-char of audio
+                                      per char, after --tts-base-ms + --tts-rtf × audio
+
+Usage:
+    python3 scripts/mock_backends.py --port 9100
+    # then point the bridge at it:
+    TTS_URL=http://localhost:9100 STT_URL=http://localhost:9100 \\
+        OPENAI_BASE_URL=http://localhost:9100 python -m realtime_api.main
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from urllib.parse import parse_qs
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+TTS_SAMPLE_RATE = 22050
+
+DEFAULT_REPLY = (
+    "Sure, here is a short answer to your question. "
+    "The first part explains the general idea in plain words. "
+    "Then a second sentence adds a little more useful detail. "
+    "Finally, this last sentence wraps everything up nicely."
+)
+
+
+def build_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI(title="realtime-api mock backends")
+    reply_tokens = [w + " " for w in args.reply.split()]
+
+    @app.get("/health")
+    @app.get("/v1/health/ready")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        await request.body()
+        await asyncio.sleep(args.stt_ms / 1000)
+        return {"text": args.transcript}
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request):
+        payload = await request.json()
+        if not payload.get("stream"):
+            await asyncio.sleep(args.llm_ttft_ms / 1000)
+            return JSONResponse({"choices": [{"message": {"role": "assistant", "content": "CONTINUE"}}]})
+
+        async def _events():
+            await asyncio.sleep(args.llm_ttft_ms / 1000)
+            interval = 1.0 / args.llm_tps if args.llm_tps > 0 else 0.0
+            t_next = time.monotonic()
+            for token in reply_tokens:
+                chunk = {"choices": [{"delta": {"content": token}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                t_next += interval
+                delay = t_next - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(_events(), media_type="text/event-stream")
+
+    @app.post("/v1/audio/synthesize")
+    async def synthesize(request: Request):
+        # The bridge posts urlencoded form data; parse it without python-multipart
+        form = parse_qs((await request.body()).decode())
+        text = re.sub(r"<[^>]+>", "", form.get("text", [""])[0])  # strip SSML markup
+        audio_s = len(text) * args.tts_ms_per_char / 1000
+        await asyncio.sleep((args.tts_base_ms / 1000) + args.tts_rtf * audio_s)
+        n = int(audio_s * TTS_SAMPLE_RATE)
+        t = np.arange(n, dtype=np.float32) / TTS_SAMPLE_RATE
+        pcm = (np.sin(2 * np.pi * 220 * t) * 3000).astype(np.int16).tobytes()
+        return Response(content=pcm, media_type="audio/pcm")
+
+    return app
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--stt-ms", type=float, default=150.0, help="STT latency per request")
+    parser.add_argument("--transcript", default="Tell me something interesting.")
+    parser.add_argument("--llm-ttft-ms", type=float, default=200.0, help="LLM time to first token")
+    parser.add_argument("--llm-tps", type=float, default=60.0, help="LLM tokens per second (0 = instant)")
+    parser.add_argument("--reply", default=DEFAULT_REPLY, help="LLM reply text (whitespace-tokenized)")
+    parser.add_argument("--tts-base-ms", type=float, default=120.0, help="TTS fixed latency per request")
+    parser.add_argument("--tts-rtf", type=float, default=0.15, help="TTS real-time factor (synthesis s per audio s)")
+    parser.add_argument("--tts-ms-per-char", type=float, default=60.0, help="Audio produced per input char")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    uvicorn.run(build_app(args), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
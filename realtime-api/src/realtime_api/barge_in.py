@@ -4,8 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import math
+import re
+import time
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from .config import settings
 from .llm_client import quick_decision
 from .protocol import CLIENT_SAMPLE_RATE, BYTES_PER_SAMPLE
@@ -21,18 +26,153 @@ Reply with exactly one word: STOP or CONTINUE.
 """
 
 
+# ---------------------------------------------------------------------------
+# Decision latency metrics
+# ---------------------------------------------------------------------------
+_LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+@dataclass
+class LatencyHistogram:
+    """Fixed-bucket histogram of decision latencies in milliseconds."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(_LATENCY_BUCKETS_MS) + 1))
+    total: int = 0
+    sum_ms: float = 0.0
+
+    def observe(self, ms: float):
+        idx = next((i for i, b in enumerate(_LATENCY_BUCKETS_MS) if ms <= b), len(_LATENCY_BUCKETS_MS))
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}ms" for b in _LATENCY_BUCKETS_MS] + ["gt_2500ms"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 2) if self.total else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+# Process-wide histograms keyed by decision tier: acoustic, lexicon, llm, empty
+_decision_latency: dict[str, LatencyHistogram] = {}
+
+
+def _record_decision(tier: str, decision: str, t0: float):
+    ms = (time.monotonic() - t0) * 1000
+    _decision_latency.setdefault(tier, LatencyHistogram()).observe(ms)
+    log.info("Barge-in decision: %s via %s in %.1fms", decision, tier, ms)
+
+
+def decision_stats() -> dict:
+    """Snapshot of barge-in decision latency histograms per tier."""
+    return {tier: h.to_dict() for tier, h in _decision_latency.items()}
+
+
+# ---------------------------------------------------------------------------
+# Local backchannel classifier
+# ---------------------------------------------------------------------------
+_BACKCHANNEL_PHRASES = frozenset({
+    "uh huh", "uhhuh", "mm hmm", "mmhmm", "mhm", "mm", "hmm", "hm", "mmm",
+    "yeah", "yea", "yep", "yup", "yes", "ok", "okay", "k", "right", "sure",
+    "got it", "i see", "cool", "nice", "great", "wow", "oh", "ah", "aha",
+    "uh", "um", "alright", "all right", "true", "exactly", "totally",
+    "interesting", "go on", "haha", "ha", "oh wow", "oh nice", "oh okay",
+    "oh yeah", "oh really", "really", "indeed", "of course", "makes sense",
+})
+
+_BACKCHANNEL_WORDS = frozenset(w for p in _BACKCHANNEL_PHRASES for w in p.split())
+
+_STOP_CUES = frozenset({
+    "stop", "wait", "hold on", "hang on", "no", "nope", "sorry", "excuse me",
+    "actually", "but", "what", "why", "how", "when", "where", "who",
+    "can you", "could you", "shut up", "enough", "pause", "listen", "hey",
+    "let me", "i mean", "never mind", "nevermind",
+})
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+@dataclass
+class AudioFeatures:
+    duration_ms: float
+    voiced_ms: float  # frames within 25 dB of the peak and above the noise floor
+    peak_dbfs: float
+
+
+def audio_features(pcm16_24khz: bytes, frame_ms: int = 20, floor_dbfs: float = -50.0) -> AudioFeatures:
+    """Cheap energy/duration features for a PCM16 24kHz snippet."""
+    samples = np.frombuffer(pcm16_24khz, dtype=np.int16).astype(np.float32) / 32768.0
+    duration_ms = len(samples) * 1000 / CLIENT_SAMPLE_RATE
+    frame = CLIENT_SAMPLE_RATE * frame_ms // 1000
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return AudioFeatures(duration_ms=duration_ms, voiced_ms=0.0, peak_dbfs=-math.inf)
+
+    frames = samples[: n_frames * frame].reshape(n_frames, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    dbfs = 20 * np.log10(np.maximum(rms, 1e-9))
+    peak = float(dbfs.max())
+    voiced = int(np.count_nonzero((dbfs > floor_dbfs) & (dbfs > peak - 25.0)))
+    return AudioFeatures(duration_ms=duration_ms, voiced_ms=voiced * frame_ms, peak_dbfs=peak)
+
+
+@dataclass
+class BackchannelClassifier:
+    """Rule-based first tier for barge-in decisions.
+
+    Each method returns "STOP", "CONTINUE", or None when it cannot decide
+    confidently, in which case the next (slower) tier is consulted.
+    """
+
+    min_voiced_ms: int = field(default_factory=lambda: settings.barge_in_min_voiced_ms)
+    max_backchannel_ms: int = field(default_factory=lambda: settings.barge_in_max_backchannel_ms)
+    min_peak_dbfs: float = field(default_factory=lambda: settings.barge_in_min_peak_dbfs)
+    max_backchannel_words: int = 4
+
+    def decide_acoustic(self, features: AudioFeatures) -> str | None:
+        """Decide from energy/duration alone (no STT)."""
+        if features.peak_dbfs < self.min_peak_dbfs or features.voiced_ms < self.min_voiced_ms:
+            return "CONTINUE"  # too quiet or too short to be a real turn (cough, click, breath)
+        if features.voiced_ms > self.max_backchannel_ms:
+            return "STOP"  # backchannels are short; this is a real utterance
+        return None
+
+    def decide_lexical(self, transcript: str) -> str | None:
+        """Decide from the (partial) transcript using backchannel/stop lexicons."""
+        text = transcript.lower().replace("-", " ")
+        words = _WORD_RE.findall(text)
+        if not words:
+            return "CONTINUE"
+        joined = " ".join(words)
+        # Cues only count at the start: "how" in "oh wow how cool" is still a backchannel
+        if any(joined == cue or joined.startswith(cue + " ") for cue in _STOP_CUES):
+            return "STOP"
+        if transcript.rstrip().endswith("?"):
+            return "STOP"
+        if len(words) <= self.max_backchannel_words and all(w in _BACKCHANNEL_WORDS for w in words):
+            return "CONTINUE"
+        if len(words) > self.max_backchannel_words:
+            return "STOP"
+        return None
+
+
 @dataclass
 class BargeInEvaluator:
     """Evaluates whether detected speech during response playback is a real
     interruption or just a backchannel acknowledgement.
 
-    Flow:
-    1. Accumulate audio for a short decision window (barge_in_window_ms)
-    2. Quick-transcribe the snippet via Parakeet STT (1-3 words)
+    Flow (tiered — each tier only runs if the previous one is unsure):
+    1. Local acoustic check: energy and voiced duration of the snippet
+    2. Quick-transcribe the snippet via Parakeet STT (1-3 words), then a
+       local backchannel/stop-cue lexicon on the transcript
     3. Fast LLM call to decide STOP or CONTINUE
     """
 
     window_ms: int = field(default_factory=lambda: settings.barge_in_window_ms)
+    local: bool = field(default_factory=lambda: settings.barge_in_local)
+    classifier: BackchannelClassifier = field(default_factory=BackchannelClassifier)
     _buffer: bytearray = field(default_factory=bytearray, init=False)
     _collecting: bool = field(default=False, init=False)
 
@@ -78,14 +218,32 @@ class BargeInEvaluator:
         Returns:
             "STOP" if the user is interrupting, "CONTINUE" if backchanneling.
         """
+        t0 = time.monotonic()
+
+        if self.local:
+            features = audio_features(audio_pcm16_24khz)
+            decision = self.classifier.decide_acoustic(features)
+            log.info("Barge-in features: duration=%.0fms voiced=%.0fms peak=%.1fdBFS → %s",
+                     features.duration_ms, features.voiced_ms, features.peak_dbfs, decision or "unsure")
+            if decision:
+                _record_decision("acoustic", decision, t0)
+                return decision
+
         # Quick-transcribe the snippet
         transcript = await transcribe(audio_pcm16_24khz)
         if not transcript or not any(c.isalnum() for c in transcript):
             log.info("Barge-in: empty transcript, defaulting to CONTINUE")
+            _record_decision("empty", "CONTINUE", t0)
             return "CONTINUE"
 
         log.info("Barge-in transcript: '%s'", transcript)
 
+        if self.local:
+            decision = self.classifier.decide_lexical(transcript)
+            if decision:
+                _record_decision("lexicon", decision, t0)
+                return decision
+
         # Truncate assistant text to last ~50 tokens (~200 chars)
         assistant_context = assistant_last_text[-200:] if assistant_last_text else ""
 
@@ -102,7 +260,9 @@ class BargeInEvaluator:
         # Normalize — accept STOP or CONTINUE, default to STOP for safety
         if "CONTINUE" in decision:
             log.info("Barge-in decision: CONTINUE (backchannel: '%s')", transcript)
+            _record_decision("llm", "CONTINUE", t0)
             return "CONTINUE"
         else:
             log.info("Barge-in decision: STOP (interruption: '%s')", transcript)
+            _record_decision("llm", "STOP", t0)
             return "STOP"
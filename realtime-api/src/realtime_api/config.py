@@ -19,11 +19,14 @@ class Settings(BaseSettings):
     default_voice: str = "Mia.Calm"
     tts_speed: int = 125
     tts_concurrency: int = 1  # max parallel TTS requests (1 = serial)
+    tts_lookahead: int = 3  # sentence mode: TTS chunks synthesized ahead of playback
+    tts_pacing_lead_ms: int = 500  # sentence mode: audio sent ahead of real time
 
     # VAD settings
     vad_threshold: float = 0.5
     vad_silence_ms: int = 600
     vad_prefix_padding_ms: int = 300
+    vad_speculative_silence_ms: int = 0  # start STT+LLM early on this much silence (0 = off)
 
     # Turn detection
     default_turn_detection: str = "server_vad"
@@ -32,6 +35,10 @@ class Settings(BaseSettings):
     # Barge-in settings
     barge_in_window_ms: int = 750
     barge_in_model: str | None = None
+    barge_in_local: bool = True  # local acoustic/lexicon tiers before the LLM
+    barge_in_min_voiced_ms: int = 120  # less voiced audio → CONTINUE without STT
+    barge_in_max_backchannel_ms: int = 1200  # more voiced audio → STOP without STT
+    barge_in_min_peak_dbfs: float = -45.0  # quieter snippets → CONTINUE without STT
 
     # Server
     host: str = "0.0.0.0"
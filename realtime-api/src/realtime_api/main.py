@@ -10,6 +10,7 @@ from fastapi import FastAPI, Query, WebSocket
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
+from .barge_in import decision_stats
 from .config import settings
 from .ws_handler import handle_realtime_ws
 
@@ -45,6 +46,11 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/stats/barge-in")
+async def barge_in_stats():
+    return decision_stats()
+
+
 @app.websocket("/v1/realtime")
 async def realtime_ws(ws: WebSocket, model: str = Query(default=None)):
     await handle_realtime_ws(ws, model=model)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import struct
 import time
 import uuid
 from enum import Enum
@@ -33,6 +34,40 @@ class AECMode(str, Enum):
     AEC = "aec"
 
 
+class AudioTransport(str, Enum):
+    JSON = "json"  # base64 audio inside JSON events (OpenAI-compatible)
+    BINARY = "binary"  # raw PCM16 in binary WebSocket frames
+
+
+# ---------------------------------------------------------------------------
+# Binary audio frames
+# ---------------------------------------------------------------------------
+# Header: magic "RA" | kind (u8) | flags (u8) | sequence (u32 LE),
+# followed by raw PCM16 24kHz mono.  Flags are reserved (0).
+AUDIO_FRAME_MAGIC = b"RA"
+AUDIO_FRAME_HEADER = struct.Struct("<2sBBI")
+FRAME_KIND_INPUT_AUDIO = 1  # client → server, equivalent to input_audio_buffer.append
+FRAME_KIND_OUTPUT_AUDIO = 2  # server → client, equivalent to response.audio.delta
+
+
+def pack_audio_frame(kind: int, seq: int, pcm: bytes) -> bytes:
+    """Build a binary audio frame: header + raw PCM16 payload."""
+    return AUDIO_FRAME_HEADER.pack(AUDIO_FRAME_MAGIC, kind, 0, seq & 0xFFFFFFFF) + pcm
+
+
+def unpack_audio_frame(frame: bytes) -> tuple[int, int, bytes]:
+    """Parse a binary audio frame into ``(kind, seq, pcm)``.
+
+    Raises ValueError if the frame is too short or has the wrong magic.
+    """
+    if len(frame) < AUDIO_FRAME_HEADER.size:
+        raise ValueError(f"audio frame too short ({len(frame)} bytes)")
+    magic, kind, _flags, seq = AUDIO_FRAME_HEADER.unpack_from(frame)
+    if magic != AUDIO_FRAME_MAGIC:
+        raise ValueError(f"bad audio frame magic {magic!r}")
+    return kind, seq, frame[AUDIO_FRAME_HEADER.size:]
+
+
 # ---------------------------------------------------------------------------
 # ID generation
 # ---------------------------------------------------------------------------
@@ -9,13 +9,17 @@ from dataclasses import dataclass, field
 
 from .config import settings
 from .protocol import (
+    FRAME_KIND_OUTPUT_AUDIO,
     AECMode,
     AudioFormat,
+    AudioTransport,
     TurnDetectionType,
     gen_content_part_id,
     gen_item_id,
     gen_session_id,
+    pack_audio_frame,
 )
+from .speculative import SpeculationStats, SpeculativeTurn
 from .vad import ServerVAD, VADConfig
 
 log = logging.getLogger(__name__)
@@ -31,6 +35,7 @@ class TurnDetectionConfig:
     silence_duration_ms: int = 600
     prefix_padding_ms: int = 300
     aec_mode: str = "none"
+    speculative_silence_ms: int = 0
 
     @classmethod
     def from_dict(cls, d: dict) -> TurnDetectionConfig:
@@ -40,6 +45,7 @@ class TurnDetectionConfig:
             silence_duration_ms=d.get("silence_duration_ms", 600),
             prefix_padding_ms=d.get("prefix_padding_ms", 300),
             aec_mode=d.get("aec_mode", "none"),
+            speculative_silence_ms=d.get("speculative_silence_ms", settings.vad_speculative_silence_ms),
         )
 
 
@@ -52,12 +58,14 @@ class SessionConfig:
     output_audio_format: str = AudioFormat.PCM16
     temperature: float = 0.8
     tts_mode: str = "whole"  # "sentence" or "whole"
+    audio_transport: str = AudioTransport.JSON  # "json" or "binary"
     turn_detection: TurnDetectionConfig | None = field(
         default_factory=lambda: TurnDetectionConfig(
             threshold=settings.vad_threshold,
             silence_duration_ms=settings.vad_silence_ms,
             prefix_padding_ms=settings.vad_prefix_padding_ms,
             aec_mode=settings.default_aec_mode,
+            speculative_silence_ms=settings.vad_speculative_silence_ms,
         )
         if settings.default_turn_detection == "server_vad"
         else None
@@ -72,6 +80,7 @@ class SessionConfig:
             "output_audio_format": self.output_audio_format,
             "temperature": self.temperature,
             "tts_mode": self.tts_mode,
+            "audio_transport": self.audio_transport,
         }
         if self.turn_detection:
             d["turn_detection"] = {
@@ -80,6 +89,7 @@ class SessionConfig:
                 "silence_duration_ms": self.turn_detection.silence_duration_ms,
                 "prefix_padding_ms": self.turn_detection.prefix_padding_ms,
                 "aec_mode": self.turn_detection.aec_mode,
+                "speculative_silence_ms": self.turn_detection.speculative_silence_ms,
             }
         else:
             d["turn_detection"] = None
@@ -87,6 +97,10 @@ class SessionConfig:
 
     def update_from_dict(self, d: dict):
         """Update config from a session.update event dict."""
+        transports = [t.value for t in AudioTransport]
+        if "audio_transport" in d and d["audio_transport"] not in transports:
+            # Checked first so a rejected update leaves the config untouched
+            raise ValueError(f"Invalid audio_transport {d['audio_transport']!r}, expected one of {transports}")
         if "modalities" in d:
             self.modalities = d["modalities"]
         if "instructions" in d:
@@ -101,6 +115,8 @@ class SessionConfig:
             self.temperature = d["temperature"]
         if "tts_mode" in d:
             self.tts_mode = d["tts_mode"]
+        if "audio_transport" in d:
+            self.audio_transport = AudioTransport(d["audio_transport"])
         if "turn_detection" in d:
             td = d["turn_detection"]
             if td is None:
@@ -221,13 +237,16 @@ class Session:
         self.config = SessionConfig()
         self.conversation = Conversation()
         self.audio_buffer = AudioBuffer()
-        self.send_queue: asyncio.Queue[dict] = asyncio.Queue()
+        self.send_queue: asyncio.Queue[dict | bytes] = asyncio.Queue()
         self.cancel_event = asyncio.Event()
         self.is_speaking = False
         self.current_response_text = ""  # accumulates assistant text for barge-in context
         self._vad: ServerVAD | None = None
         self._response_task: asyncio.Task | None = None
         self._pipeline_pending = False  # set synchronously in auto_commit before task creation
+        self._audio_frame_seq = 0  # outbound binary audio frame counter
+        self.speculation: SpeculativeTurn | None = None  # held STT+LLM run awaiting turn confirmation
+        self.speculation_stats = SpeculationStats()
 
     @property
     def vad(self) -> ServerVAD | None:
@@ -241,6 +260,7 @@ class Session:
                 threshold=td.threshold,
                 silence_duration_ms=td.silence_duration_ms,
                 prefix_padding_ms=td.prefix_padding_ms,
+                speculative_silence_ms=td.speculative_silence_ms,
             )
             aec = AECMode.AEC if td.aec_mode == "aec" else AECMode.NONE
             self._vad = ServerVAD(config=vad_config, aec_mode=aec)
@@ -257,3 +277,8 @@ class Session:
     async def send(self, event: dict):
         """Queue a server event for sending to the client."""
         await self.send_queue.put(event)
+
+    async def send_audio_frame(self, pcm: bytes):
+        """Queue raw PCM16 as a binary audio frame (binary transport only)."""
+        self._audio_frame_seq += 1
+        await self.send_queue.put(pack_audio_frame(FRAME_KIND_OUTPUT_AUDIO, self._audio_frame_seq, pcm))
@@ -0,0 +1,119 @@
+"""Speculative STT + LLM generation on a provisional end-of-turn."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from .llm_client import stream_sentences
+from .stt_client import transcribe
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeculationStats:
+    """Per-session counters for speculative turns."""
+
+    started: int = 0
+    hits: int = 0
+    misses: int = 0
+    saved_s: float = 0.0  # head start gained by confirmed speculations
+    wasted_s: float = 0.0  # STT+LLM wall time spent on discarded speculations
+    wasted_sentences: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        decided = self.hits + self.misses
+        return self.hits / decided if decided else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"started={self.started} hits={self.hits} misses={self.misses} "
+            f"hit_rate={self.hit_rate:.0%} saved={self.saved_s:.2f}s "
+            f"wasted={self.wasted_s:.2f}s/{self.wasted_sentences} sentences"
+        )
+
+
+class SpeculativeTurn:
+    """STT + LLM run started on a short provisional silence.
+
+    Sentences are held in a queue and nothing is sent to the client until the
+    turn is confirmed by the full ``silence_duration_ms``.  The LLM stream is
+    bound to the turn's own cancel event rather than the session's, which may
+    still be set from an earlier cancelled response; ``cancel()`` stops it.
+    """
+
+    def __init__(
+        self,
+        audio: bytes,
+        history: list[dict],
+        temperature: float,
+    ):
+        self.audio_bytes = len(audio)
+        self.started_at = time.monotonic()
+        self.finished_at: float | None = None
+        self.sentence_count = 0
+        self.llm_completed = False  # LLM stream ran to the end (not cancelled or failed)
+        self._cancel_event = asyncio.Event()
+        self._transcript: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        self._sentences: asyncio.Queue[str | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(audio, history, temperature))
+
+    async def _run(self, audio: bytes, history: list[dict], temperature: float):
+        try:
+            transcript = await transcribe(audio)
+            self._transcript.set_result(transcript)
+            log.info("[SPECULATE] STT done (%.0fms): %s",
+                     (time.monotonic() - self.started_at) * 1000, transcript)
+            if not transcript:
+                return
+
+            messages = history + [{"role": "user", "content": transcript}]
+            async for sentence in stream_sentences(
+                messages,
+                temperature=temperature,
+                cancel_event=self._cancel_event,
+            ):
+                if self._cancel_event.is_set():
+                    break
+                self.sentence_count += 1
+                self._sentences.put_nowait(sentence)
+            self.llm_completed = not self._cancel_event.is_set()
+        except Exception as e:
+            log.error("[SPECULATE] error: %s", e)
+        finally:
+            if not self._transcript.done():
+                self._transcript.set_result(None)
+            self._sentences.put_nowait(None)
+            self.finished_at = time.monotonic()
+
+    @property
+    def failed(self) -> bool:
+        """True once the run has ended without a complete LLM response."""
+        return self.finished_at is not None and not self.llm_completed
+
+    @property
+    def work_s(self) -> float:
+        """Wall time spent on STT + LLM so far."""
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    async def transcript(self) -> str | None:
+        """Speculative transcript, or None if the speculation failed or was cancelled."""
+        return await asyncio.shield(self._transcript)
+
+    async def sentences(self) -> AsyncIterator[str]:
+        """Yield held sentences, then any still being generated."""
+        while True:
+            sentence = await self._sentences.get()
+            if sentence is None:
+                return
+            yield sentence
+
+    def cancel(self):
+        self._cancel_event.set()
+        if not self._task.done():
+            self._task.cancel()
@@ -0,0 +1,162 @@
+"""Look-ahead TTS scheduling and real-time audio pacing for sentence mode."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+async def _race_cancel(aw: Awaitable[Any], cancel_event: asyncio.Event) -> tuple[bool, Any]:
+    """Await *aw* unless *cancel_event* fires first.
+
+    Returns ``(True, result)`` when *aw* completed, ``(False, None)`` when the
+    cancel event won.  *aw* is cancelled if it has not finished on exit.
+    """
+    task = asyncio.ensure_future(aw)
+    if cancel_event.is_set():
+        task.cancel()
+        return False, None
+    waiter = asyncio.create_task(cancel_event.wait())
+    try:
+        done, _ = await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+        if not task.done():
+            task.cancel()
+    if task in done:
+        return True, task.result()
+    return False, None
+
+
+# ---------------------------------------------------------------------------
+# Look-ahead synthesis
+# ---------------------------------------------------------------------------
+@dataclass
+class SynthesisResult:
+    index: int
+    text: str
+    pcm: bytes
+    latency_s: float  # submit → audio ready
+
+
+class LookaheadSynthesizer:
+    """Keeps up to *lookahead* TTS requests in flight, delivered in submission order.
+
+    ``submit()`` waits once *lookahead* chunks are synthesizing or waiting to
+    be picked up, so synthesis never runs more than K chunks ahead of
+    playback.  ``next_result()`` returns chunks strictly in the order they
+    were submitted, regardless of which request finishes first.  Setting the
+    cancel event (or calling ``cancel()``) aborts every outstanding request.
+    """
+
+    def __init__(
+        self,
+        synth: Callable[[str], Awaitable[bytes]],
+        lookahead: int,
+        cancel_event: asyncio.Event,
+    ):
+        self._synth = synth
+        self._cancel_event = cancel_event
+        self._slots = asyncio.Semaphore(max(1, lookahead))
+        self._jobs: asyncio.Queue[tuple[int, str, float, asyncio.Task[bytes]] | None] = asyncio.Queue()
+        self._pending: set[asyncio.Task[bytes]] = set()
+        self._submitted = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def submit(self, text: str) -> bool:
+        """Schedule synthesis of *text*.  Returns False if cancelled while waiting for a slot."""
+        ok, _ = await _race_cancel(self._slots.acquire(), self._cancel_event)
+        if not ok:
+            return False
+        self._submitted += 1
+        task = asyncio.create_task(self._synth(text))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        self._jobs.put_nowait((self._submitted, text, time.monotonic(), task))
+        log.debug("[TTS-LA] submitted #%d (%d chars, in_flight=%d)",
+                  self._submitted, len(text), self.in_flight)
+        return True
+
+    def finish(self):
+        """Signal that no more chunks will be submitted."""
+        self._jobs.put_nowait(None)
+
+    async def next_result(self) -> SynthesisResult | None:
+        """Return the next chunk in order, or None when finished or cancelled."""
+        ok, job = await _race_cancel(self._jobs.get(), self._cancel_event)
+        if not ok or job is None:
+            return None
+        index, text, t_submit, task = job
+        ok, pcm = await _race_cancel(task, self._cancel_event)
+        self._slots.release()
+        if not ok:
+            return None
+        return SynthesisResult(index=index, text=text, pcm=pcm, latency_s=time.monotonic() - t_submit)
+
+    def cancel(self):
+        """Abort all outstanding synthesis requests."""
+        for task in list(self._pending):
+            task.cancel()
+        if self._pending:
+            log.info("[TTS-LA] dropped %d in-flight TTS requests", len(self._pending))
+
+
+# ---------------------------------------------------------------------------
+# Real-time pacing
+# ---------------------------------------------------------------------------
+class AudioPacer:
+    """Sends audio at playback speed, keeping at most *lead_ms* buffered at the client.
+
+    Tracks when the client will finish playing everything sent so far.  When
+    the next segment arrives after that point the client has run dry; the
+    difference is recorded as an inter-sentence gap.
+    """
+
+    def __init__(self, lead_ms: int, cancel_event: asyncio.Event):
+        self._lead_s = max(0, lead_ms) / 1000
+        self._cancel_event = cancel_event
+        self._play_end: float | None = None
+        self.gap_count = 0
+        self.total_gap_s = 0.0
+        self.max_gap_s = 0.0
+
+    def begin_segment(self) -> float:
+        """Mark the start of a new audio segment; returns the playback gap in seconds."""
+        now = time.monotonic()
+        if self._play_end is None or now <= self._play_end:
+            return 0.0
+        gap = now - self._play_end
+        self.gap_count += 1
+        self.total_gap_s += gap
+        self.max_gap_s = max(self.max_gap_s, gap)
+        return gap
+
+    async def wait_turn(self) -> bool:
+        """Wait until the next chunk may be sent.  Returns False if cancelled."""
+        if self._cancel_event.is_set():
+            return False
+        if self._play_end is None:
+            return True
+        delay = self._play_end - time.monotonic() - self._lead_s
+        if delay <= 0:
+            return True
+        try:
+            await asyncio.wait_for(self._cancel_event.wait(), timeout=delay)
+            return False
+        except asyncio.TimeoutError:
+            return True
+
+    def sent(self, duration_s: float):
+        """Record that *duration_s* seconds of audio were sent."""
+        now = time.monotonic()
+        start = now if self._play_end is None else max(self._play_end, now)
+        self._play_end = start + duration_s
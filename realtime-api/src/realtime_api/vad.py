@@ -27,13 +27,15 @@ log = logging.getLogger(__name__)
 class VADEventType(Enum):
     SPEECH_STARTED = auto()
     SPEECH_STOPPED = auto()
+    SPEECH_PAUSED = auto()  # provisional end-of-turn (speculative mode)
+    SPEECH_RESUMED = auto()  # speech returned after SPEECH_PAUSED
 
 
 @dataclass
 class VADEvent:
     type: VADEventType
     audio_ms: int = 0
-    audio_bytes: bytes = b""  # accumulated speech audio (PCM16 24kHz) on SPEECH_STOPPED
+    audio_bytes: bytes = b""  # accumulated speech audio (PCM16 24kHz) on SPEECH_STOPPED / SPEECH_PAUSED
 
 
 # ---------------------------------------------------------------------------
@@ -75,6 +77,7 @@ class VADConfig:
     silence_duration_ms: int = 600
     prefix_padding_ms: int = 300
     start_chunks: int = 3  # consecutive chunks above threshold to trigger
+    speculative_silence_ms: int = 0  # provisional end-of-turn silence (0 = disabled)
 
 
 @dataclass
@@ -98,6 +101,7 @@ class ServerVAD:
         self._silence_ms = 0
         self._audio_cursor_ms = 0
         self._speech_start_ms = 0
+        self._paused = False  # SPEECH_PAUSED emitted for the current silence run
         # Residual buffer for incomplete VAD chunks
         self._residual = b""
 
@@ -109,6 +113,7 @@ class ServerVAD:
         self._speech_buffer = bytearray()
         self._start_count = 0
         self._silence_ms = 0
+        self._paused = False
         self._residual = b""
 
     def process_chunk(self, pcm16_24khz: bytes) -> list[VADEvent]:
@@ -182,8 +187,28 @@ class ServerVAD:
             self._speech_buffer.extend(chunk_24k_bytes)
             if prob >= self.config.threshold * 0.6:  # Use lower threshold for end detection
                 self._silence_ms = 0
+                if self._paused:
+                    self._paused = False
+                    events.append(
+                        VADEvent(type=VADEventType.SPEECH_RESUMED, audio_ms=self._audio_cursor_ms)
+                    )
             else:
                 self._silence_ms += VAD_CHUNK_MS
+                spec_ms = self.config.speculative_silence_ms
+                if (
+                    0 < spec_ms < self.config.silence_duration_ms
+                    and not self._paused
+                    and self._silence_ms >= spec_ms
+                ):
+                    # Provisional end-of-turn — audio so far, speech may still resume
+                    self._paused = True
+                    events.append(
+                        VADEvent(
+                            type=VADEventType.SPEECH_PAUSED,
+                            audio_ms=self._audio_cursor_ms,
+                            audio_bytes=bytes(self._speech_buffer),
+                        )
+                    )
                 if self._silence_ms >= self.config.silence_duration_ms:
                     # Speech stopped — emit with accumulated audio
                     audio_bytes = bytes(self._speech_buffer)
@@ -191,6 +216,7 @@ class ServerVAD:
                     self._state = _State.IDLE
                     self._start_count = 0
                     self._silence_ms = 0
+                    self._paused = False
                     self._vad.reset()
                     events.append(
                         VADEvent(
@@ -6,17 +6,31 @@ import asyncio
 import base64
 import logging
 import time
+from collections.abc import AsyncIterator
 
+import orjson
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from . import events
 from .audio import decode_audio_appendix, resample_pcm16
 from .barge_in import BargeInEvaluator
+from .config import settings
 from .llm_client import stream_sentences
-from .protocol import CLIENT_SAMPLE_RATE, TTS_SAMPLE_RATE, gen_content_part_id, gen_item_id, gen_response_id
+from .protocol import (
+    CLIENT_SAMPLE_RATE,
+    FRAME_KIND_INPUT_AUDIO,
+    TTS_SAMPLE_RATE,
+    AudioTransport,
+    gen_content_part_id,
+    gen_item_id,
+    gen_response_id,
+    unpack_audio_frame,
+)
 from .session import Session
+from .speculative import SpeculativeTurn
 from .stt_client import transcribe
 from .tts_client import synthesize, trailing_pause_ms
+from .tts_scheduler import AudioPacer, LookaheadSynthesizer
 
 log = logging.getLogger(__name__)
 
@@ -43,6 +57,9 @@ async def handle_realtime_ws(ws: WebSocket, model: str | None = None):
         log.error("Session %s error: %s", session.id, e)
     finally:
         session.cancel_event.set()
+        _discard_speculation(session, "session closed")
+        if session.speculation_stats.started:
+            log.info("Session %s speculation: %s", session.id, session.speculation_stats.summary())
         sender_task.cancel()
         if session._response_task and not session._response_task.done():
             session._response_task.cancel()
@@ -54,8 +71,20 @@ async def _sender_loop(ws: WebSocket, session: Session):
     try:
         while True:
             event = await session.send_queue.get()
+            if isinstance(event, bytes):
+                payload = event
+            else:
+                try:
+                    payload = orjson.dumps(event, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+                except orjson.JSONEncodeError as e:
+                    # A bad value in one event must not take down the connection
+                    log.error("Dropping unserializable %s event: %s", event.get("type"), e)
+                    continue
             try:
-                await ws.send_json(event)
+                if isinstance(payload, bytes):
+                    await ws.send_bytes(payload)
+                else:
+                    await ws.send_text(payload)
             except Exception:
                 break
     except asyncio.CancelledError:
@@ -65,7 +94,20 @@ async def _sender_loop(ws: WebSocket, session: Session):
 async def _receiver_loop(ws: WebSocket, session: Session):
     """Receive client events and dispatch."""
     while True:
-        data = await ws.receive_json()
+        message = await ws.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+
+        frame = message.get("bytes")
+        if frame is not None:
+            await _handle_audio_frame(session, frame)
+            continue
+
+        try:
+            data = orjson.loads(message.get("text") or "")
+        except orjson.JSONDecodeError as e:
+            await session.send(events.error_event(f"Invalid JSON: {e}", code="invalid_json"))
+            continue
         event_type = data.get("type", "")
 
         try:
@@ -105,17 +147,34 @@ async def _handle_audio_append(session: Session, data: dict):
     audio_b64 = data.get("audio", "")
     if not audio_b64:
         return
+    await _process_input_audio(session, decode_audio_appendix(audio_b64))
+
+
+async def _handle_audio_frame(session: Session, frame: bytes):
+    """Binary equivalent of input_audio_buffer.append (accepted in either transport mode)."""
+    try:
+        kind, _seq, pcm_bytes = unpack_audio_frame(frame)
+    except ValueError as e:
+        await session.send(events.error_event(str(e), code="invalid_audio_frame"))
+        return
+    if kind != FRAME_KIND_INPUT_AUDIO:
+        await session.send(
+            events.error_event(f"Unexpected audio frame kind: {kind}", code="invalid_audio_frame")
+        )
+        return
+    if pcm_bytes:
+        await _process_input_audio(session, pcm_bytes)
+
 
-    # Append to buffer
-    session.audio_buffer.append(audio_b64)
+async def _process_input_audio(session: Session, pcm_bytes: bytes):
+    """Buffer decoded PCM16 24kHz client audio and feed it to the VAD."""
+    session.audio_buffer.append_raw(pcm_bytes)
 
     # Feed to VAD if enabled
     vad = session.vad
     if vad is None:
         return
 
-    pcm_bytes = decode_audio_appendix(audio_b64)
-
     # Update VAD speaking state
     vad.is_speaking = session.is_speaking
 
@@ -151,6 +210,25 @@ async def _handle_audio_append(session: Session, data: dict):
                 # Normal turn end — auto-commit with the VAD-captured audio
                 await _auto_commit(session, vad_event.audio_bytes)
 
+        elif vad_event.type == VADEventType.SPEECH_PAUSED:
+            # Provisional end-of-turn — start STT+LLM early, hold the output
+            if not session.is_speaking and not _pipeline_active(session):
+                _start_speculation(session, vad_event.audio_bytes)
+
+        elif vad_event.type == VADEventType.SPEECH_RESUMED:
+            _discard_speculation(session, "speech resumed")
+
+
+async def _send_audio_delta(session: Session, response_id: str, item_id: str, chunk: bytes):
+    """Send one PCM16 24kHz chunk as response.audio.delta or a binary frame."""
+    if session.config.audio_transport == AudioTransport.BINARY:
+        await session.send_audio_frame(chunk)
+        return
+    chunk_b64 = base64.b64encode(chunk).decode("ascii")
+    await session.send(
+        events.response_audio_delta(response_id, item_id, 0, 0, chunk_b64)
+    )
+
 
 def _is_aec_mode(session: Session) -> bool:
     td = session.config.turn_detection
@@ -191,6 +269,47 @@ async def _evaluate_barge_in(session: Session, audio_bytes: bytes):
         # Discard the snippet, keep playing
 
 
+def _start_speculation(session: Session, audio_bytes: bytes):
+    """Begin a speculative STT+LLM run on the audio captured so far."""
+    _discard_speculation(session, "superseded")
+    session.speculation = SpeculativeTurn(
+        audio_bytes,
+        history=session.conversation.to_chat_messages(session.config.instructions),
+        temperature=session.config.temperature,
+    )
+    session.speculation_stats.started += 1
+    log.info("[SPECULATE] started on provisional end-of-turn (audio=%d bytes)", len(audio_bytes))
+
+
+def _discard_speculation(session: Session, reason: str):
+    """Cancel and account for a pending speculation that will not be used."""
+    spec = session.speculation
+    if spec is None:
+        return
+    session.speculation = None
+    spec.cancel()
+    stats = session.speculation_stats
+    stats.misses += 1
+    stats.wasted_s += spec.work_s
+    stats.wasted_sentences += spec.sentence_count
+    log.info("[SPECULATE] discarded (%s) after %.0fms, %d sentences — %s",
+             reason, spec.work_s * 1000, spec.sentence_count, stats.summary())
+
+
+def _take_speculation(session: Session) -> SpeculativeTurn | None:
+    """Claim the pending speculation for a confirmed turn."""
+    spec = session.speculation
+    if spec is None:
+        return None
+    session.speculation = None
+    stats = session.speculation_stats
+    stats.hits += 1
+    stats.saved_s += time.monotonic() - spec.started_at
+    log.info("[SPECULATE] confirmed — %.0fms head start, %d sentences held — %s",
+             (time.monotonic() - spec.started_at) * 1000, spec.sentence_count, stats.summary())
+    return spec
+
+
 async def _handle_audio_commit(session: Session):
     if session.audio_buffer.is_empty:
         return
@@ -209,6 +328,7 @@ async def _auto_commit(session: Session, vad_audio: bytes):
         log.info("[GUARD] auto_commit suppressed — pipeline pending=%s task=%s",
                  session._pipeline_pending,
                  "running" if session._response_task and not session._response_task.done() else "none/done")
+        _discard_speculation(session, "pipeline active")
         return
 
     log.info("[PIPELINE] auto_commit → starting pipeline (audio=%d bytes)", len(vad_audio))
@@ -219,10 +339,13 @@ async def _auto_commit(session: Session, vad_audio: bytes):
     await session.send(events.input_audio_buffer_committed(item_id))
     session.audio_buffer.clear()  # Clear the main buffer since we use VAD audio
 
-    asyncio.create_task(_run_pipeline(session, vad_audio, item_id=item_id))
+    asyncio.create_task(
+        _run_pipeline(session, vad_audio, item_id=item_id, speculation=_take_speculation(session))
+    )
 
 
 async def _handle_audio_clear(session: Session):
+    _discard_speculation(session, "buffer cleared")
     session.audio_buffer.clear()
     if session.vad:
         session.vad.reset()
@@ -251,6 +374,7 @@ async def _handle_response_cancel(session: Session):
              session._pipeline_pending)
     session.cancel_event.set()
     session._pipeline_pending = False
+    _discard_speculation(session, "response cancelled")
     if session._response_task and not session._response_task.done():
         session._response_task.cancel()
     session.is_speaking = False
@@ -259,8 +383,17 @@ async def _handle_response_cancel(session: Session):
 # ---------------------------------------------------------------------------
 # Pipeline: STT → LLM → TTS
 # ---------------------------------------------------------------------------
-async def _run_pipeline(session: Session, pcm_data: bytes, item_id: str | None = None):
-    """Full pipeline: transcribe audio, run LLM, stream TTS back."""
+async def _run_pipeline(
+    session: Session,
+    pcm_data: bytes,
+    item_id: str | None = None,
+    speculation: SpeculativeTurn | None = None,
+):
+    """Full pipeline: transcribe audio, run LLM, stream TTS back.
+
+    With a confirmed *speculation*, its transcript and held LLM sentences are
+    used instead of fresh STT and LLM calls.
+    """
     # Cancel any existing response
     if session._response_task and not session._response_task.done():
         log.info("[PIPELINE] cancelling existing pipeline before starting new one")
@@ -276,9 +409,22 @@ async def _run_pipeline(session: Session, pcm_data: bytes, item_id: str | None =
 
     async def _pipeline():
         try:
-            # 1. STT: transcribe
-            log.info("[PIPELINE] STT starting (audio=%d bytes)", len(pcm_data))
-            transcript = await transcribe(pcm_data)
+            # 1. STT: transcribe (or adopt the speculative transcript)
+            transcript = await speculation.transcript() if speculation else None
+            sentences = None
+            if transcript is not None:
+                log.info("[PIPELINE] using speculative transcript")
+                if speculation.failed:
+                    # LLM stream was cancelled or failed: regenerate instead of replaying what it held
+                    log.info("[PIPELINE] speculative response incomplete, generating a fresh one")
+                else:
+                    sentences = speculation.sentences()
+            else:
+                if speculation:
+                    log.info("[PIPELINE] speculation unusable, falling back to STT")
+                    speculation.cancel()
+                log.info("[PIPELINE] STT starting (audio=%d bytes)", len(pcm_data))
+                transcript = await transcribe(pcm_data)
             if not transcript:
                 log.warning("[PIPELINE] empty transcription, skipping response")
                 return
@@ -293,9 +439,11 @@ async def _run_pipeline(session: Session, pcm_data: bytes, item_id: str | None =
             log.info("[PIPELINE] STT done → User: %s", transcript)
 
             # 2. LLM → TTS
-            await _generate_response(session)
+            await _generate_response(session, sentences=sentences)
         finally:
             session._pipeline_pending = False
+            if speculation:
+                speculation.cancel()
 
     session._response_task = asyncio.create_task(_pipeline())
     # Clear pending flag now that the task is created and tracked
@@ -305,6 +453,7 @@ async def _run_pipeline(session: Session, pcm_data: bytes, item_id: str | None =
 
 async def _run_response_pipeline(session: Session):
     """Pipeline without STT — for text-based or re-generate requests."""
+    _discard_speculation(session, "response.create")
     if session._response_task and not session._response_task.done():
         session.cancel_event.set()
         session._response_task.cancel()
@@ -317,8 +466,12 @@ async def _run_response_pipeline(session: Session):
     session._response_task = asyncio.create_task(_generate_response(session))
 
 
-async def _generate_response(session: Session):
-    """Run LLM streaming → sentence splitting → TTS streaming → audio events."""
+async def _generate_response(session: Session, sentences: AsyncIterator[str] | None = None):
+    """Run LLM streaming → sentence splitting → TTS streaming → audio events.
+
+    *sentences* replaces the LLM stream when the text was already generated
+    speculatively.
+    """
     response_id = gen_response_id()
     output_item_id = gen_item_id()
     audio_content_id = gen_content_part_id()
@@ -375,17 +528,22 @@ async def _generate_response(session: Session):
     try:
         messages = session.conversation.to_chat_messages(session.config.instructions)
 
+        def _sentence_stream() -> AsyncIterator[str]:
+            if sentences is not None:
+                return sentences
+            return stream_sentences(
+                messages,
+                temperature=session.config.temperature,
+                cancel_event=session.cancel_event,
+            )
+
         tts_mode = session.config.tts_mode  # "whole" or "sentence"
         log.info("[RESPONSE] tts_mode=%s", tts_mode)
 
         if tts_mode == "whole":
             # ── Whole-response mode: accumulate full text, single TTS call ──
             full_text_for_tts = ""
-            async for sentence in stream_sentences(
-                messages,
-                temperature=session.config.temperature,
-                cancel_event=session.cancel_event,
-            ):
+            async for sentence in _sentence_stream():
                 if session.cancel_event.is_set():
                     cancelled = True
                     break
@@ -426,38 +584,40 @@ async def _generate_response(session: Session):
                             cancelled = True
                             break
                         chunk = resampled[offset:offset + chunk_bytes]
-                        chunk_b64 = base64.b64encode(chunk).decode("ascii")
                         tts_chunk_count += 1
                         now = time.monotonic()
                         if first_audio_send_t is None:
                             first_audio_send_t = now
                         last_audio_send_t = now
-                        await session.send(
-                            events.response_audio_delta(
-                                response_id, output_item_id, 0, 0, chunk_b64,
-                            )
-                        )
+                        await _send_audio_delta(session, response_id, output_item_id, chunk)
                 elif not tts_pcm and not cancelled:
                     log.error("[RESPONSE] TTS returned empty for whole-mode text (%d chars): %s",
                               len(full_text_for_tts), full_text_for_tts[:120])
 
         else:
             # ── Sentence-by-sentence: pipelined LLM → TTS ──
-            # Producer drains the LLM stream into a queue while the
-            # consumer synthesises and sends audio concurrently.  This
-            # keeps the LLM connection alive during long TTS calls and
-            # lets later sentences queue up while earlier ones play.
+            # Producer drains the LLM stream into a queue; the scheduler
+            # groups sentences into TTS chunks and keeps up to
+            # ``tts_lookahead`` of them synthesizing ahead of playback; the
+            # player receives results in sentence order and sends audio at
+            # real-time pace, so chunk N+1 is synthesized while N plays.
             _MIN_TTS_CHARS = 20
             sentence_queue: asyncio.Queue[str | None] = asyncio.Queue()
+            synthesizer = LookaheadSynthesizer(
+                lambda text: synthesize(
+                    text,
+                    voice=session.config.voice,
+                    cancel_event=session.cancel_event,
+                ),
+                lookahead=settings.tts_lookahead,
+                cancel_event=session.cancel_event,
+            )
+            pacer = AudioPacer(settings.tts_pacing_lead_ms, session.cancel_event)
 
             async def _llm_producer():
                 nonlocal full_transcript, sentence_count, cancelled
                 try:
-                    async for sentence in stream_sentences(
-                        messages,
-                        temperature=session.config.temperature,
-                        cancel_event=session.cancel_event,
-                    ):
+                    async for sentence in _sentence_stream():
                         if session.cancel_event.is_set():
                             cancelled = True
                             break
@@ -479,125 +639,117 @@ async def _generate_response(session: Session):
                     await sentence_queue.put(None)  # sentinel
                     log.info("[RESPONSE] producer done — %d sentences queued", sentence_count)
 
-            async def _tts_consumer():
+            async def _tts_scheduler():
+                nonlocal cancelled
+                tts_buffer = ""
+
+                try:
+                    while True:
+                        sentence = await sentence_queue.get()
+                        if sentence is None:
+                            log.info("[RESPONSE] scheduler: sentinel received, done")
+                            break
+                        if session.cancel_event.is_set():
+                            log.info("[RESPONSE] scheduler: cancelled, discarding queued sentences")
+                            cancelled = True
+                            break
+                        if not has_audio:
+                            continue
+
+                        tts_buffer = (tts_buffer + " " + sentence).strip() if tts_buffer else sentence
+
+                        # Keep buffering until we have enough text for a good TTS call
+                        if len(tts_buffer) < _MIN_TTS_CHARS:
+                            log.debug("[RESPONSE] buffering short sentence (%d chars): %s",
+                                      len(tts_buffer), tts_buffer[:60])
+                            continue
+
+                        log.info("[RESPONSE] scheduler: TTS chunk (%d chars, in_flight=%d, qsize=%d): %s",
+                                 len(tts_buffer), synthesizer.in_flight, sentence_queue.qsize(),
+                                 tts_buffer[:80])
+                        if not await synthesizer.submit(tts_buffer):
+                            cancelled = True
+                            break
+                        tts_buffer = ""
+
+                    # Flush remaining buffered text
+                    if tts_buffer and has_audio and not cancelled:
+                        log.info("[RESPONSE] flushing TTS buffer (%d chars): %s",
+                                 len(tts_buffer), tts_buffer[:80])
+                        await synthesizer.submit(tts_buffer)
+                finally:
+                    synthesizer.finish()
+
+            async def _tts_player():
                 nonlocal tts_chunk_count, total_tts_bytes_raw, total_tts_bytes_resampled
                 nonlocal first_audio_send_t, last_audio_send_t, cancelled
-                tts_buffer = ""
+                chunk_bytes = CLIENT_SAMPLE_RATE // 10 * 2  # 100ms of PCM16
 
-                consumer_idx = 0
                 while True:
-                    sentence = await sentence_queue.get()
-                    if sentence is None:
-                        log.info("[RESPONSE] consumer: sentinel received, done")
-                        break
-                    if session.cancel_event.is_set():
-                        log.info("[RESPONSE] consumer: cancelled, discarding queued sentences")
-                        cancelled = True
+                    result = await synthesizer.next_result()
+                    if result is None:
+                        if session.cancel_event.is_set():
+                            log.info("[RESPONSE] player: cancelled")
+                            cancelled = True
                         break
-                    if not has_audio:
-                        continue
-
-                    consumer_idx += 1
-                    tts_buffer = (tts_buffer + " " + sentence).strip() if tts_buffer else sentence
 
-                    # Keep buffering until we have enough text for a good TTS call
-                    if len(tts_buffer) < _MIN_TTS_CHARS:
-                        log.debug("[RESPONSE] buffering short sentence (%d chars): %s",
-                                  len(tts_buffer), tts_buffer[:60])
-                        continue
-
-                    log.info("[RESPONSE] consumer: TTS chunk #%d (%d chars, qsize=%d): %s",
-                             consumer_idx, len(tts_buffer), sentence_queue.qsize(),
-                             tts_buffer[:80])
-                    tts_pcm = await synthesize(
-                        tts_buffer,
-                        voice=session.config.voice,
-                        cancel_event=session.cancel_event,
-                    )
-                    tts_text_for_pause = tts_buffer
-                    tts_buffer = ""
+                    tts_pcm = result.pcm
                     if not tts_pcm:
-                        log.warning("[RESPONSE] consumer: TTS returned EMPTY for chunk #%d: %s",
-                                    consumer_idx, tts_text_for_pause[:80])
+                        log.warning("[RESPONSE] player: TTS returned EMPTY for chunk #%d: %s",
+                                    result.index, result.text[:80])
                         continue
 
                     audio_dur = len(tts_pcm) / 2 / TTS_SAMPLE_RATE
-                    log.info("[RESPONSE] consumer: chunk #%d → %d bytes (%.2fs audio): %s",
-                             consumer_idx, len(tts_pcm), audio_dur, tts_text_for_pause[:80])
+                    log.info("[RESPONSE] player: chunk #%d → %d bytes (%.2fs audio, ready in %.2fs): %s",
+                             result.index, len(tts_pcm), audio_dur, result.latency_s, result.text[:80])
 
                     # Append inter-sentence silence based on trailing punctuation
-                    pause_ms = trailing_pause_ms(tts_text_for_pause)
+                    pause_ms = trailing_pause_ms(result.text)
                     if pause_ms > 0:
                         silence_samples = int(TTS_SAMPLE_RATE * pause_ms / 1000)
                         tts_pcm += b'\x00' * (silence_samples * 2)
                         log.debug("[RESPONSE] appended %dms silence for: %s",
-                                  pause_ms, tts_text_for_pause[-20:])
+                                  pause_ms, result.text[-20:])
 
                     total_tts_bytes_raw += len(tts_pcm)
 
                     resampled = resample_pcm16(tts_pcm, TTS_SAMPLE_RATE, CLIENT_SAMPLE_RATE)
                     total_tts_bytes_resampled += len(resampled)
 
-                    chunk_bytes = CLIENT_SAMPLE_RATE // 10 * 2  # 100ms of PCM16
+                    gap = pacer.begin_segment()
+                    if gap > 0:
+                        log.info("[RESPONSE] player: %.0fms playback gap before chunk #%d",
+                                 gap * 1000, result.index)
+
                     for offset in range(0, len(resampled), chunk_bytes):
+                        if not await pacer.wait_turn():
+                            cancelled = True
+                            break
                         chunk = resampled[offset:offset + chunk_bytes]
-                        chunk_b64 = base64.b64encode(chunk).decode("ascii")
                         tts_chunk_count += 1
                         now = time.monotonic()
                         if first_audio_send_t is None:
                             first_audio_send_t = now
                         last_audio_send_t = now
-                        await session.send(
-                            events.response_audio_delta(
-                                response_id, output_item_id, 0, 0, chunk_b64,
-                            )
-                        )
+                        await _send_audio_delta(session, response_id, output_item_id, chunk)
+                        pacer.sent(len(chunk) / 2 / CLIENT_SAMPLE_RATE)
 
-                    if session.cancel_event.is_set():
-                        cancelled = True
+                    if cancelled:
                         break
 
-                # Flush remaining buffered text
-                if tts_buffer and has_audio and not cancelled:
-                    log.info("[RESPONSE] flushing TTS buffer (%d chars): %s",
-                             len(tts_buffer), tts_buffer[:80])
-                    tts_pcm = await synthesize(
-                        tts_buffer,
-                        voice=session.config.voice,
-                        cancel_event=session.cancel_event,
-                    )
-                    if tts_pcm:
-                        pause_ms = trailing_pause_ms(tts_buffer)
-                        if pause_ms > 0:
-                            silence_samples = int(TTS_SAMPLE_RATE * pause_ms / 1000)
-                            tts_pcm += b'\x00' * (silence_samples * 2)
-                        total_tts_bytes_raw += len(tts_pcm)
-                        resampled = resample_pcm16(tts_pcm, TTS_SAMPLE_RATE, CLIENT_SAMPLE_RATE)
-                        total_tts_bytes_resampled += len(resampled)
-                        chunk_bytes = CLIENT_SAMPLE_RATE // 10 * 2
-                        for offset in range(0, len(resampled), chunk_bytes):
-                            chunk = resampled[offset:offset + chunk_bytes]
-                            chunk_b64 = base64.b64encode(chunk).decode("ascii")
-                            tts_chunk_count += 1
-                            now = time.monotonic()
-                            if first_audio_send_t is None:
-                                first_audio_send_t = now
-                            last_audio_send_t = now
-                            await session.send(
-                                events.response_audio_delta(
-                                    response_id, output_item_id, 0, 0, chunk_b64,
-                                )
-                            )
-
-            # Run LLM producer and TTS consumer concurrently
+            # Run LLM producer, TTS scheduler and audio player concurrently
             producer = asyncio.create_task(_llm_producer())
-            consumer = asyncio.create_task(_tts_consumer())
+            scheduler = asyncio.create_task(_tts_scheduler())
+            player = asyncio.create_task(_tts_player())
             try:
-                await asyncio.gather(producer, consumer)
+                await asyncio.gather(producer, scheduler, player)
             finally:
-                for task in (producer, consumer):
+                synthesizer.cancel()
+                for task in (producer, scheduler, player):
                     if not task.done():
                         task.cancel()
+            log.info("[RESPONSE] playback gaps: %d (total %.0fms, max %.0fms)",
+                     pacer.gap_count, pacer.total_gap_s * 1000, pacer.max_gap_s * 1000)
 
     except asyncio.CancelledError:
         cancelled = True
@@ -0,0 +1,48 @@
+"""Barge-in lexical classifier tests (no services needed).
+
+Usage:
+    python3 -m pytest tests/test_barge_in.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+# Allow running from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from realtime_api.barge_in import BackchannelClassifier
+
+
+@pytest.mark.parametrize("transcript", [
+    "mm hmm",
+    "yeah",
+    "oh wow",
+    "oh wow how cool",
+    "oh really, when",
+    "uh huh, why not",
+])
+def test_backchannels_continue(transcript):
+    assert BackchannelClassifier().decide_lexical(transcript) != "STOP"
+
+
+@pytest.mark.parametrize("transcript", [
+    "stop",
+    "wait",
+    "hold on a second",
+    "what",
+    "how do I do that",
+    "no, I meant the other one",
+    "actually let me ask something else",
+    "is it raining?",
+])
+def test_interruptions_stop(transcript):
+    assert BackchannelClassifier().decide_lexical(transcript) == "STOP"
+
+
+def test_pure_backchannel_is_continue():
+    assert BackchannelClassifier().decide_lexical("oh wow cool") == "CONTINUE"
+    assert BackchannelClassifier().decide_lexical("") == "CONTINUE"
@@ -0,0 +1,132 @@
+"""Speculative turn tests with stubbed STT and LLM (no services needed).
+
+Usage:
+    python3 -m pytest tests/test_speculative.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+# Allow running from the repo root
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from realtime_api import speculative, ws_handler
+from realtime_api.session import Session
+
+
+def fake_stt(transcript: str):
+    async def transcribe(audio: bytes) -> str:
+        return transcript
+    return transcribe
+
+
+def fake_llm(sentences: list[str], fail: bool = False, hold_open: bool = False):
+    async def stream_sentences(messages, temperature=0.8, cancel_event=None):
+        for sentence in sentences:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield sentence
+            await asyncio.sleep(0)
+        if fail:
+            raise RuntimeError("LLM unavailable")
+        if hold_open:
+            # Keep the stream running until the turn is cancelled
+            await cancel_event.wait()
+    return stream_sentences
+
+
+async def collect(sentences) -> list[str]:
+    return [sentence async for sentence in sentences]
+
+
+def test_speculation_ignores_stale_session_cancel(monkeypatch):
+    """A cancel left set by an earlier response.cancel must not empty the speculation."""
+    monkeypatch.setattr(speculative, "transcribe", fake_stt("what time is it"))
+    monkeypatch.setattr(speculative, "stream_sentences", fake_llm(["It is noon.", "Anything else?"]))
+
+    async def run():
+        session = Session()
+        session.cancel_event.set()  # response.cancel / barge-in STOP, no pipeline since
+        ws_handler._start_speculation(session, b"\x00" * 4800)
+        spec = ws_handler._take_speculation(session)
+        assert await spec.transcript() == "what time is it"
+        assert await collect(spec.sentences()) == ["It is noon.", "Anything else?"]
+        assert not spec.failed
+
+    asyncio.run(run())
+
+
+def test_discard_cancels_speculation(monkeypatch):
+    monkeypatch.setattr(speculative, "transcribe", fake_stt("tell me a story"))
+    monkeypatch.setattr(speculative, "stream_sentences", fake_llm(["Once upon a time."], hold_open=True))
+
+    async def run():
+        session = Session()
+        ws_handler._start_speculation(session, b"\x00" * 4800)
+        spec = session.speculation
+        await spec.transcript()
+        await asyncio.sleep(0.01)
+        ws_handler._discard_speculation(session, "speech resumed")
+        await asyncio.sleep(0.01)
+        assert session.speculation is None
+        assert spec.failed
+        assert not session.cancel_event.is_set()
+
+    asyncio.run(run())
+
+
+def test_pipeline_regenerates_when_speculative_llm_failed(monkeypatch):
+    """A transcript with an incomplete LLM stream falls back to a fresh response."""
+    monkeypatch.setattr(speculative, "transcribe", fake_stt("what time is it"))
+    monkeypatch.setattr(speculative, "stream_sentences", fake_llm([], fail=True))
+
+    async def no_stt(audio: bytes) -> str:
+        raise AssertionError("speculative transcript should be reused")
+
+    calls = []
+
+    async def generate_response(session, sentences=None):
+        calls.append(sentences)
+
+    monkeypatch.setattr(ws_handler, "transcribe", no_stt)
+    monkeypatch.setattr(ws_handler, "_generate_response", generate_response)
+
+    async def run():
+        session = Session()
+        ws_handler._start_speculation(session, b"\x00" * 4800)
+        spec = ws_handler._take_speculation(session)
+        await spec.transcript()
+        await asyncio.sleep(0.01)
+        assert spec.failed
+
+        await ws_handler._run_pipeline(session, b"\x00" * 4800, speculation=spec)
+        await session._response_task
+        assert calls == [None]
+        assert session.conversation.to_chat_messages("")[-1]["content"] == "what time is it"
+
+    asyncio.run(run())
+
+
+def test_pipeline_uses_completed_speculation(monkeypatch):
+    monkeypatch.setattr(speculative, "transcribe", fake_stt("what time is it"))
+    monkeypatch.setattr(speculative, "stream_sentences", fake_llm(["It is noon."]))
+
+    calls = []
+
+    async def generate_response(session, sentences=None):
+        calls.append(await collect(sentences))
+
+    monkeypatch.setattr(ws_handler, "_generate_response", generate_response)
+
+    async def run():
+        session = Session()
+        ws_handler._start_speculation(session, b"\x00" * 4800)
+        spec = ws_handler._take_speculation(session)
+        await ws_handler._run_pipeline(session, b"\x00" * 4800, speculation=spec)
+        await session._response_task
+        assert calls == [["It is noon."]]
+
+    asyncio.run(run())